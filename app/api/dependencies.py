@@ -0,0 +1,31 @@
+import secrets
+
+from fastapi import HTTPException, Request
+
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+# Empty disables every admin-only feature.
+ADMIN_TOKEN = settings.get("ADMIN", "token", fallback="")
+
+
+def is_admin(request):
+    """
+    Check the `X-Admin-Token` header against the configured admin token.
+
+    Args:
+        request (Request): Incoming request.
+
+    Returns:
+        bool: True if admin features may be used.
+    """
+    token = request.headers.get("x-admin-token", "")
+    return bool(ADMIN_TOKEN) and secrets.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+async def require_admin(request: Request):
+    """FastAPI dependency rejecting requests without a valid admin token."""
+    if not is_admin(request):
+        # Indistinguishable from a missing route for anyone without the token.
+        raise HTTPException(status_code=404, detail="Not Found")
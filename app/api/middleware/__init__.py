@@ -0,0 +1,3 @@
+__all__ = ["CompressionMiddleware"]
+
+from app.api.middleware.compression import CompressionMiddleware
@@ -0,0 +1,229 @@
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from config import load_config
+
+try:
+    import brotli
+except ImportError:  # optional: brotli-python
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: zstandard
+    zstandard = None
+
+settings = load_config("api_config.cfg", required=False)
+
+MINIMUM_SIZE = settings.getint("COMPRESSION", "minimum_size", fallback=1024)
+OFFLOAD_SIZE = settings.getint("COMPRESSION", "offload_size", fallback=256 * 1024)
+GZIP_LEVEL = settings.getint("COMPRESSION", "gzip_level", fallback=5)
+BROTLI_QUALITY = settings.getint("COMPRESSION", "brotli_quality", fallback=4)
+ZSTD_LEVEL = settings.getint("COMPRESSION", "zstd_level", fallback=3)
+PREFERENCE = [
+    encoding.strip()
+    for encoding in settings.get("COMPRESSION", "preference", fallback="zstd, br, gzip").split(",")
+]
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class _Gzip:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encoders():
+    """
+    Return the encoders usable in this process, in preference order.
+
+    Returns:
+        dict: Content-coding name mapped to a factory of streaming compressors.
+    """
+    encoders = {"gzip": lambda: _Gzip(GZIP_LEVEL)}
+    if brotli is not None:
+        encoders["br"] = lambda: _Brotli(BROTLI_QUALITY)
+    if zstandard is not None:
+        encoders["zstd"] = lambda: _Zstd(ZSTD_LEVEL)
+    return {name: encoders[name] for name in PREFERENCE if name in encoders}
+
+
+def negotiate(accept_encoding, encoders):
+    """
+    Pick the preferred content-coding acceptable to the client.
+
+    Args:
+        accept_encoding (str): Raw Accept-Encoding header.
+        encoders (dict): Output of `available_encoders`.
+
+    Returns:
+        str | None: Chosen content-coding, or None to send the body as is.
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for name in encoders:
+        if name in accepted or "*" in accepted:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression for JSON payloads.
+
+    Unlike Starlette's GZipMiddleware this negotiates zstd and brotli when they are
+    installed, handles streaming responses chunk by chunk, and moves the compression
+    of large bodies to the threadpool so the event loop keeps serving other requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.encoders = available_encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate(headers.get("accept-encoding", ""), self.encoders)
+        responder = _CompressedResponder(send, encoding, self.encoders.get(encoding), headers.get("if-none-match"))
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponder:
+    def __init__(self, send, encoding, encoder_factory, if_none_match=None):
+        self._send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.if_none_match = if_none_match
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk tells us whether to compress.
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if self.start_message["status"] == 304:
+                # A 304 carries no body to size up: it keeps the ETag of the copy
+                # being revalidated, encoded only if the 200 was sent encoded.
+                if self._revalidates_encoded(headers):
+                    self._tag_etag(headers)
+                headers.add_vary_header("Accept-Encoding")
+            elif self._is_compressible(headers):
+                # Identity responses vary too, or a shared cache would serve them to everyone.
+                headers.add_vary_header("Accept-Encoding")
+            if not self._should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.compressor = self.encoder_factory()
+            headers["Content-Encoding"] = self.encoding
+            self._tag_etag(headers)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed = await self._compress(body, final=True)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(self.start_message)
+
+        compressed = await self._compress(body, final=not more_body)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _is_compressible(self, headers):
+        if self.start_message["status"] < 200 or self.start_message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+    def _should_compress(self, headers, body, more_body):
+        if self.encoding is None or not self._is_compressible(headers):
+            return False
+        # A streamed body's total size is unknown up front; compress it regardless.
+        return more_body or len(body) >= MINIMUM_SIZE
+
+    def _tag_etag(self, headers):
+        # A strong validator must differ between the identity and the encoded
+        # representation; http_cache.etag_matches strips the suffix again.
+        etag = headers.get("etag")
+        if self.encoding and etag and etag.endswith('"'):
+            headers["ETag"] = f'{etag[:-1]}-{self.encoding}"'
+
+    def _revalidates_encoded(self, headers):
+        etag = headers.get("etag")
+        if not (self.encoding and self.if_none_match and etag and etag.endswith('"')):
+            return False
+        tagged = f'{etag.removeprefix("W/")[:-1]}-{self.encoding}"'
+        return tagged in (tag.strip().removeprefix("W/") for tag in self.if_none_match.split(","))
+
+    async def _compress(self, body, final):
+        if len(body) >= OFFLOAD_SIZE:
+            return await run_in_threadpool(self._compress_sync, body, final)
+        return self._compress_sync(body, final)
+
+    def _compress_sync(self, body, final):
+        compressed = self.compressor.compress(body)
+        # Flushing each streamed chunk lets the client decode it as it arrives.
+        compressed += self.compressor.finish() if final else self.compressor.flush()
+        return compressed
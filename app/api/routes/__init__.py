@@ -1,5 +1,11 @@
-__all__ = ["data_router", "indicators_router", "documentation_router"]
+__all__ = ["data_router", "indicators_router", "documentation_router", "metrics_router", "admin_router", "health_router", "backtest_router", "correlation_router", "exports_router"]
 
 from app.api.routes.data_api import router as data_router
 from app.api.routes.indicators_api import router as indicators_router
-from app.api.routes.documentation_api import router as documentation_router
\ No newline at end of file
+from app.api.routes.documentation_api import router as documentation_router
+from app.api.routes.metrics_api import router as metrics_router
+from app.api.routes.admin_api import router as admin_router
+from app.api.routes.health_api import router as health_router
+from app.api.routes.backtest_api import router as backtest_router
+from app.api.routes.correlation_api import router as correlation_router
+from app.api.routes.exports_api import router as exports_router
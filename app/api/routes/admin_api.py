@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api.dependencies import require_admin
+from app.services import profiling
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+    include_in_schema=False,
+)
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    List the most recently captured request profiles, newest first.
+    """
+    return {"profiles": profiling.store.list()}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = Query(default=None)):
+    """
+    Download a captured profile.
+
+    cProfile captures download as pstats (`python -m pstats <file>`, snakeviz) or,
+    with `format=text`, as a cumulative-time report. Sampling captures download as
+    a speedscope document (https://www.speedscope.app).
+    """
+    profile = profiling.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+
+    if profile.mode == "sampling":
+        return JSONResponse(
+            content=profile.data,
+            headers={"Content-Disposition": f'attachment; filename="{profile.id}.speedscope.json"'},
+        )
+    if format == "text":
+        return PlainTextResponse(profile.text_report())
+    return Response(
+        content=profile.pstats_bytes(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile.id}.pstats"'},
+    )
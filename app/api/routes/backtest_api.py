@@ -0,0 +1,101 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app import services
+from app.services import http_cache, indicator_registry, metrics
+from app.services.enrichment import enrich_candles
+from app.services.rules import Rule
+from app.utils import Columns, encode_json, parse_time
+
+router = APIRouter(
+    prefix="/backtest",
+    tags=["backtest"]
+)
+
+RESULTS = ("timestamps", "stats")
+
+
+@router.get("/btcusdt")
+@router.get("/ethusdt")
+@router.get("/bnbusdt")
+async def backtest(
+    request: Request,
+    start: str,
+    end: str,
+    rule: str,
+    exit_rule: Optional[str] = Query(default=None, alias="exit"),
+    result: str = Query(default="timestamps"),
+    fee_bps: float = Query(default=0.0, ge=0),
+):
+    """
+    Evaluate a rule over candles and indicators without downloading the series.
+
+    The rule is an expression such as `RSI_14 < 30 and Close > SMA_200`; the
+    indicators it names are computed on the server (with their warm-up history).
+    `result=timestamps` returns the open times where the rule holds, `result=stats`
+    the performance of being long while it holds, or from `rule` until `exit`.
+    """
+    try:
+        start_time = parse_time(start)
+        end_time = parse_time(end)
+    except ValueError:
+        return JSONResponse(
+            status_code=422,
+            content={"error": "Invalid date format. Provide 'YY-MM-DD' or an ISO-8601 timestamp."},
+        )
+    if result not in RESULTS:
+        return JSONResponse(status_code=422, content={"error": f"Invalid result. Provide one of: {', '.join(RESULTS)}."})
+
+    # Rules and the indicators they name are validated before any query runs.
+    try:
+        entry = Rule(rule)
+        exit = Rule(exit_rule) if exit_rule else None
+        names = entry.names | (exit.names if exit else set())
+        candle_columns = [col.value for col in Columns if col.value in names]
+        calls, unknown = indicator_registry.resolve_columns(names - set(candle_columns))
+    except ValueError as exc:
+        return JSONResponse(status_code=422, content={"error": str(exc)})
+    if unknown:
+        return JSONResponse(
+            status_code=422,
+            content={"error": f"Unknown columns in rule: {', '.join(unknown)}. Use candle columns or indicator outputs such as RSI_14."},
+        )
+
+    symbol = request.url.path.rsplit("/", 1)[-1]
+    key = ("backtest", symbol, start_time.isoformat(), end_time.isoformat(), rule, exit_rule, result, fee_bps)
+    immutable = http_cache.is_immutable(end_time)
+    if immutable:
+        headers = http_cache.cache_headers(http_cache.make_etag(key, end_time), end_time, immutable)
+        if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    output_columns = [Columns.OPEN_TIME.value, Columns.CLOSE.value, *candle_columns]
+    try:
+        body, latest_candle, timer = await run_in_threadpool(
+            _evaluate, symbol, start_time, end_time, calls, output_columns, entry, exit, result, fee_bps
+        )
+    except ValueError as exc:
+        return JSONResponse(status_code=422, content={"error": str(exc)})
+
+    if not immutable:
+        headers = http_cache.cache_headers(http_cache.make_etag(key, latest_candle), latest_candle, immutable)
+        if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    if metrics.SERVER_TIMING:
+        headers["Server-Timing"] = timer.server_timing()
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _evaluate(symbol, start, end, calls, output_columns, entry, exit, result, fee_bps):
+    timer = metrics.StageTimer()
+    # NaN rather than 0 where an indicator has no value, so it never matches a rule.
+    rows, _, _, _ = enrich_candles(symbol, start, end, calls, output_columns, timer, fill_value=None)
+    latest_candle = rows[-1][Columns.OPEN_TIME.value] if rows else None
+    with timer.stage("rules"):
+        content = services.evaluate_rules(rows, entry, exit, result, fee_bps)
+    with timer.stage("json"):
+        body = encode_json(content)
+    return body, latest_candle, timer
@@ -0,0 +1,104 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.services import http_cache, metrics
+from app.services.enrichment import fetch_rows
+from app.utils import SYMBOLS, Columns, encode_json, parse_time
+
+router = APIRouter(
+    prefix="/correlation",
+    tags=["correlation"]
+)
+
+METRICS = ("corr", "beta", "ratio", "zscore")
+MAX_WINDOWS = 8
+MAX_WINDOW = 100_000
+
+
+@router.get("")
+async def correlation(
+    request: Request,
+    start: str,
+    end: str,
+    symbols: List[str] = Query(default=list(SYMBOLS)),
+    base: Optional[str] = Query(default=None),
+    windows: List[int] = Query(default=[60]),
+    metrics_: List[str] = Query(default=list(METRICS), alias="metrics"),
+):
+    """
+    Rolling co-movement of symbols against a base symbol, aligned on Open_time.
+
+    Candles are matched on the open times every symbol has. For every other
+    symbol and window: `corr` and `beta` of its log returns against the base's,
+    `ratio` of the closes and `zscore` of the log spread. Windows count aligned
+    candles and are warmed up with the candles before `start`.
+    """
+    try:
+        start_time = parse_time(start)
+        end_time = parse_time(end)
+    except ValueError:
+        return JSONResponse(
+            status_code=422,
+            content={"error": "Invalid date format. Provide 'YY-MM-DD' or an ISO-8601 timestamp."},
+        )
+
+    symbols = list(dict.fromkeys(symbol.lower() for symbol in symbols))
+    base = (base or symbols[0]).lower()
+    error = None
+    if any(symbol not in SYMBOLS for symbol in symbols) or len(symbols) < 2:
+        error = f"Provide at least two symbols among: {', '.join(SYMBOLS)}."
+    elif base not in symbols:
+        error = "The base symbol must be one of the symbols."
+    elif any(metric not in METRICS for metric in metrics_):
+        error = f"Invalid metric. Provide any of: {', '.join(METRICS)}."
+    elif not 1 <= len(windows) <= MAX_WINDOWS or any(not 2 <= window <= MAX_WINDOW for window in windows):
+        error = f"Provide 1 to {MAX_WINDOWS} windows between 2 and {MAX_WINDOW} candles."
+    if error:
+        return JSONResponse(status_code=422, content={"error": error})
+    windows = sorted(set(windows))
+
+    key = ("correlation", tuple(symbols), base, start_time.isoformat(), end_time.isoformat(), tuple(windows),
+           tuple(sorted(set(metrics_))))
+    immutable = http_cache.is_immutable(end_time)
+    if immutable:
+        headers = http_cache.cache_headers(http_cache.make_etag(key, end_time), end_time, immutable)
+        if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    timer = metrics.StageTimer()
+    # The symbols are fetched concurrently, each with one candle more than the
+    # longest window: returns need the close before the window.
+    columns = [Columns.OPEN_TIME.value, Columns.CLOSE.value]
+    fetched = await asyncio.gather(*(
+        run_in_threadpool(fetch_rows, symbol, start_time, end_time, columns, windows[-1] + 1, timer)
+        for symbol in symbols
+    ))
+    body, latest_candle = await run_in_threadpool(
+        _compute, dict(zip(symbols, (rows for rows, _ in fetched))), symbols, base, windows, metrics_, start_time, timer
+    )
+
+    if not immutable:
+        headers = http_cache.cache_headers(http_cache.make_etag(key, latest_candle), latest_candle, immutable)
+        if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    if metrics.SERVER_TIMING:
+        headers["Server-Timing"] = timer.server_timing()
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _compute(series, symbols, base, windows, metrics_, start, timer):
+    from app.services import cross_asset
+
+    with timer.stage("align"):
+        times, closes = cross_asset.align(series)
+    with timer.stage("cross_asset"):
+        columns = cross_asset.cross_asset(times, closes, symbols, base, windows, metrics_)
+        rows = cross_asset.to_rows(times, columns, start)
+    latest_candle = rows[-1][Columns.OPEN_TIME.value] if rows else None
+    with timer.stage("json"):
+        body = encode_json({"base": base, "symbols": symbols, "data": rows})
+    return body, latest_candle
@@ -1,27 +1,36 @@
+import base64
+import contextlib
+import json
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 from typing import Optional, List
 
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from google.cloud import bigquery
-from config import load_config
 
-from app.services import rowsAdapter, CalculateIndicators
-from app.utils import Columns
+from app.api.dependencies import is_admin
+from app import services
+from app.services import SingleFlight, http_cache, indicator_engines, indicator_registry, metrics, profiling
+from app.services.enrichment import enrich_candles
+from app.utils import Columns, encode_json, naive_utc, parse_time
 
 router = APIRouter(
   prefix="/data",
   tags=["data"]
   )
 
-config = load_config("database_config.cfg")
-client = bigquery.Client()
+ENCODINGS = ("rows", "compact")
+MAX_DECIMALS = 12
+
+data_flight = SingleFlight("data")
+admission_control = services.admission.create_admission_controller()
 
 @router.get("/btcusdt")
 @router.get("/ethusdt")
 @router.get("/bnbusdt")
 async def get_data(
+  request: Request,
   start: str,
   end: str,
 
@@ -52,7 +61,35 @@ async def get_data(
 
   drop_columns: Optional[List[Columns]] = Query(default=None),
   only_columns: Optional[List[Columns]] = Query(default=None),
+
+  # Return null instead of 0 for values that cannot be computed (e.g. at the very
+  # start of the history, where an indicator has no warm-up candles).
+  nulls: bool = Query(default=False),
+
+  # Keyset pagination: at most `limit` candles per response, continued by passing
+  # the returned `next_cursor` back with otherwise identical parameters. The cursor
+  # carries the running totals (OBV, A/D Line, VWAP), so pages join up exactly.
+  limit: Optional[int] = Query(default=None, ge=1),
+  cursor: Optional[str] = Query(default=None),
+
+  # Downsample the computed series to at most this many points for charting.
+  max_points: Optional[int] = Query(default=None, ge=3),
+
+  # Indicator engine ("pandas", "numpy" or "numba"); the configured one by default.
+  engine: Optional[str] = Query(default=None),
+
+  # "compact": column arrays with the open times as start, interval and gaps
+  # instead of one object per candle; "rows" by default.
+  encoding: str = Query(default="rows"),
+  # Decimal places per column, e.g. "Close:2" or "Taker_Buy_Quote_Asset_Volume:0";
+  # a bare number applies to every other float column.
+  decimals: Optional[List[str]] = Query(default=None),
+
+  # Admin-only: capture a "cprofile" or "sampling" profile of this request.
+  profile: Optional[str] = Query(default=None, include_in_schema=False),
   ):
+  # Indicator query values, keyed like the registry.
+  arguments = {name: value for name, value in locals().items() if name in indicator_registry.registry}
 
   if drop_columns and only_columns:
     return JSONResponse(
@@ -60,79 +97,211 @@ async def get_data(
       content={"error": "You can only provide either drop_columns or only_columns, not both."},
     )
 
-  query = f"""
-    SELECT *
-    FROM `{config['DATABASE']['project_id']}.{config['DATABASE']['dataset']}.{config['DATABASE']['table']}`
-    WHERE TIMESTAMP(Open_time) BETWEEN TIMESTAMP('{datetime.strptime(start, "%y-%m-%d")}') AND TIMESTAMP('{datetime.strptime(end, "%y-%m-%d")}')
-    ORDER BY TIMESTAMP(Open_time) ASC
-    """
-
-  results = client.query_and_wait(query)
-  rows = rowsAdapter(results)
-
-  calculate_indicators = CalculateIndicators()
-
-  # Periodic indicators mapping
-  periodic_indicators = {
-    "ema": ema,
-    "sma": sma,
-    "roc": roc,
-    "rsi": rsi,
-    "wil": wil,
-    "atr": atr,
-    "mom": mom,
-    "so": so,
-    "bb": bb,
-    "cmo": cmo,
-    "dc": dc,
-    "cmf": cmf,
-    "cci": cci,
-    "adx": adx,
-    "kc": kc,
-  }
-
-  # Non-periodic indicators mapping
-  non_periodic_indicators = {
-    "al": al,
-    "tr": tr,
-    "obv": obv,
-    "ic": ic,
-    "pp": pp,
-    "vwap": vwap,
-  }
-
-  for indicator_name, periods in periodic_indicators.items():
-    if periods:
-      func = getattr(calculate_indicators, indicator_name)
-      for period in periods:
-        rows = func(period, rows)
-
-  if macd:
-    for period in macd:
-      try:
-        short_period, long_period, signal_period = map(int, period.split(','))
-      except ValueError:
-        return JSONResponse(
-          status_code=422,
-          content={"error": "Invalid format for MACD. Provide 'short,long,signal'."},
+  try:
+    start_time = parse_time(start)
+    end_time = parse_time(end)
+  except ValueError:
+    return JSONResponse(
+      status_code=422,
+      content={"error": "Invalid date format. Provide 'YY-MM-DD' or an ISO-8601 timestamp."},
+    )
+
+  state = None
+  if cursor:
+    try:
+      start_time, state = _decode_cursor(cursor)
+    except ValueError:
+      return JSONResponse(status_code=422, content={"error": "Invalid cursor."})
+
+  profile = profile or request.headers.get("x-profile")
+  if profile:
+    if not is_admin(request):
+      return JSONResponse(status_code=403, content={"error": "Profiling requires a valid X-Admin-Token."})
+    if profile not in profiling.MODES:
+      return JSONResponse(
+        status_code=422,
+        content={"error": f"Invalid profile mode. Provide one of: {', '.join(profiling.MODES)}."},
+      )
+
+  try:
+    calls = indicator_registry.parse_requested(arguments)
+    engine = engine or indicator_engines.default_engine()
+    indicator_engines.check_engine(engine)
+  except ValueError as exc:
+    return JSONResponse(status_code=422, content={"error": str(exc)})
+
+  # Base columns of the response; the fetch adds whatever the indicators read.
+  output_columns = [
+    col.value for col in Columns
+    if (col in only_columns if only_columns else col not in (drop_columns or []))
+  ]
+
+  if encoding not in ENCODINGS:
+    return JSONResponse(
+      status_code=422,
+      content={"error": f"Invalid encoding. Provide one of: {', '.join(ENCODINGS)}."},
+    )
+  try:
+    decimals = _parse_decimals(decimals, output_columns, calls)
+  except ValueError as exc:
+    return JSONResponse(status_code=422, content={"error": str(exc)})
+
+  symbol = request.url.path.rsplit("/", 1)[-1]
+
+  # Normalized request identity: identical concurrent requests share one computation.
+  key = (
+    symbol,
+    start_time.isoformat(),
+    end_time.isoformat(),
+    tuple((indicator.key, args) for indicator, args in calls),
+    tuple(output_columns),
+    nulls,
+    limit,
+    max_points,
+    engine,
+    encoding,
+    tuple(sorted(decimals.items())),
+    json.dumps(state, sort_keys=True),
+  )
+
+  # Settled history never changes: its ETag depends on the request alone, so a
+  # revalidation is answered before any query or indicator work happens.
+  immutable = http_cache.is_immutable(end_time)
+  if immutable:
+    headers = http_cache.cache_headers(http_cache.make_etag(key, end_time), end_time, immutable)
+    if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+      return Response(status_code=304, headers=headers)
+
+  load_args = (
+    symbol, start_time, end_time, calls, output_columns, nulls, limit, max_points, engine, encoding, decimals, state
+  )
+  # Joining an identical computation in flight costs nothing more: not admitted again.
+  if admission_control is not None and (profile or not data_flight.running(key)):
+    cost = services.admission.estimate_cost(start_time, end_time, calls, limit)
+    admission = admission_control.admit(
+      admission_control.client(request), cost, admission_control.priority(cost, request.headers.get("x-priority"))
+    )
+  else:
+    admission = contextlib.nullcontext()
+
+  try:
+    async with admission:
+      if profile:
+        # Profiled requests run on their own so the capture covers the whole computation.
+        (body, latest_candle, timer), profile_id = await run_in_threadpool(
+          profiling.capture, profile, str(request.url), _load_data, *load_args
         )
-      rows = calculate_indicators.macd(short_period, long_period, signal_period, rows)
+      else:
+        body, latest_candle, timer = await data_flight.do(key, lambda: run_in_threadpool(_load_data, *load_args))
+  except services.admission.Rejected as exc:
+    retry = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(status_code=exc.status_code, content={"error": exc.message}, headers=retry)
+
+  if not immutable:
+    headers = http_cache.cache_headers(http_cache.make_etag(key, latest_candle), latest_candle, immutable)
+    if http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+      return Response(status_code=304, headers=headers)
+
+  if metrics.SERVER_TIMING:
+    headers["Server-Timing"] = timer.server_timing()
+  if profile:
+    headers["X-Profile-Id"] = profile_id
+  return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _load_data(symbol, start, end, calls, output_columns, nulls, limit, max_points, engine, encoding, decimals, state):
+  """
+  Query the candles for the range and enrich them with the requested indicators.
+
+  See `enrich_candles`. Downsampling for `max_points` happens last, so the
+  indicators see the full-resolution series. The "compact" encoding and the
+  `decimals` rounding apply to the final rows, see `encode_compact`.
+
+  Runs in a worker thread: the BigQuery call, the pandas work and the JSON encoding
+  are all blocking, and the encoded body is shared by coalesced requests.
+
+  Returns:
+    tuple: The encoded response body, the open time of the newest candle (None if
+    empty) and the StageTimer of the computation.
+  """
+  timer = metrics.StageTimer()
+  rows, latest_candle, next_candle, state = enrich_candles(
+    symbol, start, end, calls, output_columns, timer, None if nulls else 0, limit, engine, state
+  )
+  next_cursor = _encode_cursor(next_candle, state) if next_candle is not None else None
+
+  if max_points and len(rows) > max_points:
+    with timer.stage("downsample"):
+      rows = services.downsample(rows, max_points)
+
+  if encoding == "compact":
+    from app.services.compact_encoding import encode_compact
+
+    with timer.stage("compact"):
+      content = {"encoding": encoding, **encode_compact(rows, decimals)}
+  else:
+    if decimals:
+      from app.services.compact_encoding import round_rows
+
+      with timer.stage("round"):
+        rows = round_rows(rows, decimals)
+    elif nulls:
+      # NaN is not valid JSON.
+      rows = [{column: None if value != value else value for column, value in row.items()} for row in rows]
+    content = {"data": rows}
+  if limit:
+    content["next_cursor"] = next_cursor
+
+  with timer.stage("json"):
+    body = encode_json(content)
+
+  return body, latest_candle, timer
+
+
+def _parse_decimals(values, output_columns, calls):
+  """
+  Map the `decimals` query values to decimal places per column.
 
-  for indicator_name, enabled in non_periodic_indicators.items():
-    if enabled:
-      func = getattr(calculate_indicators, indicator_name)
-      rows = func(rows)
+  Raises:
+    ValueError: If a value is malformed or names a column the response does not have.
+  """
+  columns = set(output_columns) - {Columns.OPEN_TIME.value, Columns.CLOSE_TIME.value}
+  for indicator, args in calls:
+    columns.update(indicator.outputs(*args))
+  decimals = {}
+  for value in values or []:
+    name, _, digits = value.rpartition(":")
+    if not digits.isdigit() or int(digits) > MAX_DECIMALS:
+      raise ValueError(f"Invalid decimals {value!r}. Provide 'column:places' or 'places', up to {MAX_DECIMALS} places.")
+    if name and name not in columns:
+      raise ValueError(f"Cannot round {name!r}: not a numeric column of the response.")
+    # A bare number applies to every column not named on its own.
+    decimals[name or "*"] = int(digits)
+  return decimals
 
 
-# Filter columns
-  if drop_columns:
-    rows = calculate_indicators.drop_column(drop_columns, rows)
+def _encode_cursor(open_time, state=None):
+  """Opaque cursor of the page starting at `open_time`, with the running totals before it."""
+  open_time = naive_utc(open_time)
+  value = json.dumps({"t": open_time.isoformat(), "s": state}) if state else open_time.isoformat()
+  return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
 
-  if only_columns:
-    columns_to_drop = [col.value for col in Columns if col not in only_columns]
-    rows = calculate_indicators.drop_column(columns_to_drop, rows)
 
-  return {"data": rows}
+def _decode_cursor(cursor):
+  """Return the open time and running totals a cursor holds, raising ValueError if malformed."""
+  try:
+    value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    if not value.startswith("{"):
+      # Cursors without running totals hold the bare open time.
+      return datetime.fromisoformat(value), None
+    value = json.loads(value)
+    state = {
+      str(key): {str(name): float(total) for name, total in totals.items()}
+      for key, totals in (value["s"] or {}).items()
+    }
+    return datetime.fromisoformat(value["t"]), state
+  except (ValueError, UnicodeDecodeError, KeyError, TypeError, AttributeError):
+    raise ValueError(f"Invalid cursor {cursor!r}.")
 
 
 # <google.cloud.bigquery.table.RowIterator object at 0x169b01b90>
@@ -1,92 +1,96 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+
+from app.services.http_cache import PrerenderedJSON
+from app.services.indicator_registry import INDICATORS
 
 router = APIRouter(
     prefix="/documentation",
     tags=["documentation"],
 )
 
+# Rendered once at import: the documentation only changes with a deploy.
+documentation = PrerenderedJSON({
+    "documentation": {
+        "title": "Crypto Indicators API Documentation",
+        "description": (
+            "This API allows users to fetch historical cryptocurrency data "
+            "and calculate various financial indicators."
+        ),
+        "available_data": ["BTCUSDT", "ETHUSDT", "BNBUSDT"],
+        "endpoints": {
+            "/": "Welcome message.",
+            "/data": "Fetch historical data with optional indicator calculations. Parameters: start, end, timeframe, and multiple indicators (e.g., ema, sma, roc).",
+            "/indicators": "List all available indicators with their descriptions and usage.",
+            "/indicators/{indicator}": (
+                "Detailed information about a specific indicator, including formula, usage, and example."
+            ),
+            "/backtest": (
+                "Evaluate a rule such as 'RSI_14 < 30 and Close > SMA_200' on the server. "
+                "Parameters: start, end, rule, exit, result (timestamps or stats) and fee_bps."
+            ),
+            "/correlation": (
+                "Rolling correlation, beta, close ratio and spread z-score of symbols against a base symbol, "
+                "on the open times they share. Parameters: start, end, symbols, base (the first symbol by "
+                "default), windows (in candles) and metrics (corr, beta, ratio, zscore)."
+            ),
+            "/exports": (
+                "POST: queue a background export of candles and indicators to a Parquet or CSV file. "
+                "JSON body: symbols, start, end, indicators (like the /data parameters, e.g. "
+                "{\"sma\": [20], \"vwap\": true}), columns and format (parquet or csv). Answers 202 with the "
+                "export's id. GET: list the known exports, newest first."
+            ),
+            "/exports/{id}": (
+                "GET: status and progress of an export. DELETE: cancel it, or delete the file of a finished one."
+            ),
+            "/exports/{id}/download": "GET: download the file of a succeeded export (409 while it is not).",
+            "/documentation": "API documentation (this endpoint).",
+        },
+        "indicators": {
+            "available_indicators": [
+                f"{indicator.abbreviation} - {indicator.full_name}" for indicator in INDICATORS
+            ],
+            "indicator_usage": (
+                "Each indicator can be calculated by providing its parameters. "
+                "For example, to calculate SMA for a specific period, pass `sma=20` "
+                "as a query parameter in the /data endpoint."
+            ),
+        },
+        "implementation_details": {
+            "data_source": "Historical cryptocurrency data from BigQuery.",
+            "data_format": (
+                "JSON-like structure, each row representing a candlestick "
+                "with fields like Open, High, Low, Close, Volume, etc."
+            ),
+            "indicator_calculations": (
+                "Indicators are calculated dynamically using pandas for efficient processing."
+            ),
+            "filtering": {
+                "only_columns": (
+                    "Optional parameter to filter data by specific columns. "
+                    "Example: only_columns=['Open', 'Close', 'Volume']."
+                ),
+                "drop_columns": (
+                    "Optional parameter to exclude specific columns. "
+                    "Example: drop_columns=['Quote_Asset_Volume', 'Number_of_Trades']."
+                ),
+            },
+        },
+        "examples": {
+            "fetch_data_with_ema": (
+                "/data?start=2024-01-01&end=2024-01-10&ema=21&sma=50"
+            ),
+            "list_indicators": "/indicators",
+            "get_indicator_details": "/indicators/sma",
+        },
+    }
+})
+
 @router.get("/")
-async def root():
+async def root(request: Request):
     """
     API Documentation Endpoint.
 
     Returns:
         dict: API documentation details including available data and implementation.
     """
-    return {
-        "documentation": {
-            "title": "Crypto Indicators API Documentation",
-            "description": (
-                "This API allows users to fetch historical cryptocurrency data "
-                "and calculate various financial indicators."
-            ),
-            "available_data": ["BTCUSDT", "ETHUSDT", "BNBUSDT"],
-            "endpoints": {
-                "/": "Welcome message.",
-                "/data": "Fetch historical data with optional indicator calculations. Parameters: start, end, timeframe, and multiple indicators (e.g., ema, sma, roc).",
-                "/indicators": "List all available indicators with their descriptions and usage.",
-                "/indicators/{indicator}": (
-                    "Detailed information about a specific indicator, including formula, usage, and example."
-                ),
-                "/documentation": "API documentation (this endpoint).",
-            },
-            "indicators": {
-                "available_indicators": [
-                    "SMA - Simple Moving Average",
-                    "EMA - Exponential Moving Average",
-                    "ROC - Rate of Change",
-                    "RSI - Relative Strength Index",
-                    "WIL - Williams %R",
-                    "ATR - Average True Range",
-                    "MOM - Momentum",
-                    "SO - Stochastic Oscillator",
-                    "TR - True Range",
-                    "MACD - Moving Average Convergence Divergence",
-                    "BB - Bollinger Bands",
-                    "CMO - Chande Momentum Oscillator",
-                    "OBV - On-Balance Volume",
-                    "DC - Donchian Channels",
-                    "A/D Line - Accumulation/Distribution Line",
-                    "CMF - Chaikin Money Flow",
-                    "IC - Ichimoku Cloud",
-                    "PP - Pivot Points",
-                    "CCI - Commodity Channel Index",
-                    "ADX - Average Directional Index",
-                    "KC - Keltner Channels",
-                    "VWAP - Volume-Weighted Average Price",
-                ],
-                "indicator_usage": (
-                    "Each indicator can be calculated by providing its parameters. "
-                    "For example, to calculate SMA for a specific period, pass `sma=20` "
-                    "as a query parameter in the /data endpoint."
-                ),
-            },
-            "implementation_details": {
-                "data_source": "Historical cryptocurrency data from BigQuery.",
-                "data_format": (
-                    "JSON-like structure, each row representing a candlestick "
-                    "with fields like Open, High, Low, Close, Volume, etc."
-                ),
-                "indicator_calculations": (
-                    "Indicators are calculated dynamically using pandas for efficient processing."
-                ),
-                "filtering": {
-                    "only_columns": (
-                        "Optional parameter to filter data by specific columns. "
-                        "Example: only_columns=['Open', 'Close', 'Volume']."
-                    ),
-                    "drop_columns": (
-                        "Optional parameter to exclude specific columns. "
-                        "Example: drop_columns=['Quote_Asset_Volume', 'Number_of_Trades']."
-                    ),
-                },
-            },
-            "examples": {
-                "fetch_data_with_ema": (
-                    "/data?start=2024-01-01&end=2024-01-10&ema=21&sma=50"
-                ),
-                "list_indicators": "/indicators",
-                "get_indicator_details": "/indicators/sma",
-            },
-        }
-    }
+    return documentation.response(request)
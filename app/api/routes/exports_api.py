@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel
+
+from app.services import exports, indicator_registry
+from app.utils import SYMBOLS, Columns, parse_time
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"]
+)
+
+MEDIA_TYPES = {"parquet": "application/vnd.apache.parquet", "csv": "text/csv"}
+
+export_manager = exports.create_export_manager()
+
+
+class ExportRequest(BaseModel):
+    symbols: List[str]
+    start: str
+    end: str
+    # Like the /data query: {"sma": [20, 200], "macd": ["12,26,9"], "vwap": true}.
+    indicators: Dict[str, Union[bool, List[Union[int, str]]]] = {}
+    # Candle columns to keep, all by default.
+    columns: Optional[List[Columns]] = None
+    format: str = "parquet"
+
+
+@router.post("", status_code=202)
+async def submit_export(export: ExportRequest, response: Response):
+    """
+    Queue an export of candles and indicators to a Parquet or CSV file.
+
+    Poll `/exports/{id}` for its status and progress, then download the file
+    from `/exports/{id}/download`. `DELETE /exports/{id}` cancels it, or deletes
+    the file of a finished export.
+    """
+    try:
+        start_time = parse_time(export.start)
+        end_time = parse_time(export.end)
+    except ValueError:
+        return JSONResponse(
+            status_code=422,
+            content={"error": "Invalid date format. Provide 'YY-MM-DD' or an ISO-8601 timestamp."},
+        )
+
+    symbols = list(dict.fromkeys(symbol.lower() for symbol in export.symbols))
+    unknown = [key for key in export.indicators if key not in indicator_registry.registry]
+    error = None
+    if not symbols or any(symbol not in SYMBOLS for symbol in symbols):
+        error = f"Provide symbols among: {', '.join(SYMBOLS)}."
+    elif export.format not in exports.FORMATS:
+        error = f"Invalid format. Provide one of: {', '.join(exports.FORMATS)}."
+    elif end_time < start_time:
+        error = "The end of the range precedes its start."
+    elif unknown:
+        error = f"Unknown indicators: {', '.join(unknown)}."
+    if error:
+        return JSONResponse(status_code=422, content={"error": error})
+    try:
+        calls = indicator_registry.parse_requested(export.indicators)
+    except ValueError as exc:
+        return JSONResponse(status_code=422, content={"error": str(exc)})
+
+    output_columns = [col.value for col in (export.columns or Columns)]
+    if Columns.OPEN_TIME.value not in output_columns:
+        output_columns.insert(0, Columns.OPEN_TIME.value)
+    try:
+        job = export_manager.submit(symbols, start_time, end_time, calls, output_columns, export.format)
+    except OverflowError as exc:
+        return JSONResponse(status_code=503, content={"error": str(exc)}, headers={"Retry-After": "60"})
+
+    response.headers["Location"] = f"{router.prefix}/{job.id}"
+    return job.summary()
+
+
+@router.get("")
+async def list_exports():
+    """List the known exports, newest first."""
+    return {"exports": export_manager.list()}
+
+
+@router.get("/{job_id}")
+async def get_export(job_id: str):
+    """Status and progress of an export."""
+    return _job(job_id).summary()
+
+
+@router.get("/{job_id}/download")
+async def download_export(job_id: str):
+    """Download the file of a succeeded export."""
+    job = _job(job_id)
+    if job.status != exports.SUCCEEDED:
+        return JSONResponse(status_code=409, content={"error": f"The export is {job.status}.", "export": job.summary()})
+    return FileResponse(
+        job.path,
+        media_type=MEDIA_TYPES[job.format],
+        filename=f"{'-'.join(job.symbols)}-{job.start:%Y%m%d}-{job.end:%Y%m%d}.{job.format}",
+    )
+
+
+@router.delete("/{job_id}")
+async def cancel_export(job_id: str):
+    """Cancel an export, or delete the file of a finished one."""
+    job = export_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found.")
+    return job.summary()
+
+
+def _job(job_id):
+    job = export_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found.")
+    return job
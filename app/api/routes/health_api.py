@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services import resources
+
+router = APIRouter(
+    tags=["health"]
+)
+
+@router.get("/ready")
+async def get_readiness():
+    """
+    Readiness probe: 200 once the candle client and numeric libraries are warm,
+    503 while the background warm-up is still running (or failed).
+    """
+    status = resources.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
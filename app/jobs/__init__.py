@@ -0,0 +1,3 @@
+"""
+Offline jobs, run as `python -m app.jobs.<name>` outside the API process.
+"""
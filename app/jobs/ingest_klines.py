@@ -0,0 +1,285 @@
+"""
+Bulk-load Binance kline archives into the candle table or local Parquet files.
+
+Takes the CSV or ZIP files of https://data.binance.vision (one symbol and
+interval per file, no header, millisecond or microsecond open times; files with
+a header row are accepted too), parses them in parallel with pyarrow's
+streaming CSV reader, checks the order, duplicates and gaps of every symbol's
+candles, and writes them:
+
+  --to bigquery  one load job per symbol into the table of database_config.cfg
+                 (created partitioned by month if missing); candles between the
+                 table's first and last one are assumed present and skipped.
+  --to parquet   <directory>/<symbol>.parquet/year=YYYY/month=M/part.parquet,
+                 merged with the months already there; the layout
+                 `[LOCAL_CANDLES] source = <directory>` replays.
+
+The symbol is read from the file names (BTCUSDT-1m-2024-01.zip) unless given.
+
+Usage:
+    python -m app.jobs.ingest_klines FILE [FILE ...] [--to parquet] [--directory candles]
+                                     [--symbol btcusdt] [--interval-seconds 60] [--workers 4] [--strict]
+"""
+import argparse
+import glob
+import os
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow.csv
+import pyarrow.parquet
+
+from app import debug_logger
+from app.services.candle_clients import BINANCE_KLINE_COLUMNS
+from app.utils import Columns, naive_utc
+
+OPEN_TIME = Columns.OPEN_TIME.value
+CLOSE_TIME = Columns.CLOSE_TIME.value
+TRADES = Columns.NUMBER_OF_TRADES.value
+
+# Open times at or above this are microseconds (Binance spot files since 2025), below it milliseconds.
+MICROSECONDS_FROM = 10 ** 14
+BLOCK_SIZE = 16 << 20
+
+
+def parse_klines(path):
+    """
+    Parse one kline file.
+
+    Args:
+        path (str): A .csv file, or a .zip holding one.
+
+    Returns:
+        pandas.DataFrame: The `Columns`, in file order, with naive UTC
+        datetime64[ns] times, int64 trade counts and float64 values.
+    """
+    with _open(path) as file:
+        header = file.readline()
+    skip = 0 if header[:1].isdigit() else 1
+
+    convert = pyarrow.csv.ConvertOptions(
+        column_types={name: pyarrow.int64() if name in (OPEN_TIME, CLOSE_TIME, TRADES) else pyarrow.float64()
+                      for name in BINANCE_KLINE_COLUMNS[:-1]},
+        include_columns=BINANCE_KLINE_COLUMNS[:-1],
+    )
+    read = pyarrow.csv.ReadOptions(column_names=BINANCE_KLINE_COLUMNS, skip_rows=skip, block_size=BLOCK_SIZE)
+    chunks = defaultdict(list)
+    with _open(path) as file:
+        # Streamed block by block: memory stays bounded by the block size plus the parsed columns.
+        for batch in pyarrow.csv.open_csv(file, read_options=read, convert_options=convert):
+            for name, column in zip(batch.schema.names, batch.columns):
+                chunks[name].append(column.to_numpy())
+
+    columns = {name: np.concatenate(parts) for name, parts in chunks.items()}
+    if not columns:
+        return pd.DataFrame(columns=[col.value for col in Columns])
+    for name in (OPEN_TIME, CLOSE_TIME):
+        values = columns[name]
+        unit = "us" if len(values) and values.max() >= MICROSECONDS_FROM else "ms"
+        columns[name] = values.astype(f"datetime64[{unit}]").astype("datetime64[ns]")
+    return pd.DataFrame({col.value: columns[col.value] for col in Columns})
+
+
+def check_candles(frame, interval):
+    """
+    Sort a symbol's candles, drop duplicates and measure the gaps.
+
+    Args:
+        frame (pandas.DataFrame): Parsed candles, possibly from many files.
+        interval (timedelta): Expected distance between open times.
+
+    Returns:
+        tuple: The sorted, deduplicated frame and a report: rows, out_of_order
+        (candles earlier than the one before them), duplicates (open times seen
+        twice), gaps (missing runs), missing (candles missing in them),
+        largest_gap and misaligned (steps that are not a multiple of `interval`).
+    """
+    times = frame[OPEN_TIME].to_numpy()
+    out_of_order = int(np.count_nonzero(times[1:] < times[:-1]))
+    if out_of_order:
+        frame = frame.sort_values(OPEN_TIME, kind="stable", ignore_index=True)
+    before = len(frame)
+    frame = frame.drop_duplicates(OPEN_TIME, keep="last", ignore_index=True)
+
+    steps = np.diff(frame[OPEN_TIME].to_numpy())
+    step = np.timedelta64(interval)
+    gaps = steps[steps > step]
+    report = {
+        "rows": len(frame),
+        "out_of_order": out_of_order,
+        "duplicates": before - len(frame),
+        "gaps": len(gaps),
+        "missing": int(np.sum(gaps // step - 1)) if len(gaps) else 0,
+        "largest_gap": str(pd.Timedelta(gaps.max())) if len(gaps) else None,
+        "misaligned": int(np.count_nonzero(steps % step)),
+    }
+    return frame, report
+
+
+def write_parquet(frame, directory, symbol):
+    """
+    Write candles to month partitions, merged with the candles already there.
+
+    Returns:
+        int: Number of partitions written.
+    """
+    root = os.path.join(directory, f"{symbol}.parquet")
+    times = frame[OPEN_TIME].dt
+    written = 0
+    for (year, month), part in frame.groupby([times.year, times.month], sort=True):
+        path = os.path.join(root, f"year={year}", f"month={month}", "part.parquet")
+        if os.path.exists(path):
+            part = pd.concat([pyarrow.parquet.read_table(path).to_pandas(), part], ignore_index=True)
+            part = part.drop_duplicates(OPEN_TIME, keep="last").sort_values(OPEN_TIME, ignore_index=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pyarrow.parquet.write_table(pyarrow.Table.from_pandas(part, preserve_index=False), path + ".tmp")
+        os.replace(path + ".tmp", path)
+        written += 1
+    return written
+
+
+def load_bigquery(frame, client, symbol):
+    """
+    Append candles to a symbol's table with a load job.
+
+    Candles between the first and last one of the table are skipped: backfills
+    add history before it, refreshes candles after it.
+
+    Args:
+        client (BigQueryCandleClient): Client of the candle tables.
+
+    Returns:
+        int: Number of candles loaded.
+    """
+    from google.api_core.exceptions import NotFound
+    from google.cloud import bigquery
+
+    table = client.table(symbol)
+    try:
+        client.client.get_table(table)
+    except NotFound:
+        pass
+    else:
+        row = next(iter(client.client.query_and_wait(
+            f"SELECT MIN(Open_time) AS first, MAX(Open_time) AS last FROM `{table}`"
+        )))
+        if row["first"] is not None:
+            first, last = naive_utc(row["first"]), naive_utc(row["last"])
+            frame = frame[(frame[OPEN_TIME] < first) | (frame[OPEN_TIME] > last)]
+    if frame.empty:
+        return 0
+
+    schema = [
+        bigquery.SchemaField(col.value, "TIMESTAMP" if col.value in (OPEN_TIME, CLOSE_TIME)
+                             else "INTEGER" if col.value == TRADES else "FLOAT")
+        for col in Columns
+    ]
+    job_config = bigquery.LoadJobConfig(
+        schema=schema,
+        write_disposition="WRITE_APPEND",
+        time_partitioning=bigquery.TimePartitioning(type_=bigquery.TimePartitioningType.MONTH, field=OPEN_TIME),
+    )
+    client.client.load_table_from_dataframe(frame, table, job_config=job_config).result()
+    return len(frame)
+
+
+def ingest(paths, to="parquet", directory="candles", symbol=None, interval=timedelta(minutes=1), workers=None,
+           strict=False):
+    """
+    Parse, check and write kline files.
+
+    Returns:
+        dict: Per symbol, the check report plus the rows written, and the
+        parse, check and write durations.
+
+    Raises:
+        ValueError: With `strict`, if a symbol has duplicates, gaps or misaligned candles.
+    """
+    by_symbol = defaultdict(list)
+    for path in paths:
+        by_symbol[symbol or os.path.basename(path).split("-")[0].lower()].append(path)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        parsed = dict(zip(paths, pool.map(parse_klines, paths)))
+    parse_seconds = time.perf_counter() - started
+
+    client = None
+    if to == "bigquery":
+        from app.services.candle_clients import BigQueryCandleClient
+
+        client = BigQueryCandleClient()
+
+    reports = {}
+    for name, files in by_symbol.items():
+        started = time.perf_counter()
+        frame, report = check_candles(pd.concat([parsed[path] for path in files], ignore_index=True), interval)
+        report["check_seconds"] = time.perf_counter() - started
+        report["parse_seconds"] = parse_seconds
+        if strict and (report["duplicates"] or report["gaps"] or report["misaligned"]):
+            raise ValueError(f"{name}: {report}")
+
+        started = time.perf_counter()
+        if to == "bigquery":
+            report["written"] = load_bigquery(frame, client, name)
+        else:
+            write_parquet(frame, directory, name)
+            report["written"] = len(frame)
+        report["write_seconds"] = time.perf_counter() - started
+        debug_logger.info(f"Ingested {name}: {report}")
+        reports[name] = report
+
+    if client is not None:
+        client.close()
+    return reports
+
+
+def _open(path):
+    if path.endswith(".zip"):
+        # The member keeps the archive's file open until it is closed itself.
+        with zipfile.ZipFile(path) as archive:
+            return archive.open(next(name for name in archive.namelist() if name.endswith(".csv")))
+    return open(path, "rb")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", help="CSV/ZIP files or glob patterns.")
+    parser.add_argument("--to", choices=("parquet", "bigquery"), default="parquet")
+    parser.add_argument("--directory", default="candles", help="Root of the Parquet output.")
+    parser.add_argument("--symbol", help="Symbol of every file, instead of reading it from the names.")
+    parser.add_argument("--interval-seconds", type=int, default=60)
+    parser.add_argument("--workers", type=int, help="Files parsed in parallel (one process each).")
+    parser.add_argument("--strict", action="store_true", help="Fail on duplicates, gaps or misaligned candles.")
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.files for path in glob.glob(pattern) or [pattern]})
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"No such file: {', '.join(missing)}")
+
+    started = time.perf_counter()
+    try:
+        reports = ingest(paths, args.to, args.directory, args.symbol and args.symbol.lower(),
+                         timedelta(seconds=args.interval_seconds), args.workers, args.strict)
+    except ValueError as exc:
+        parser.error(str(exc))
+    seconds = time.perf_counter() - started
+
+    rows = sum(report["rows"] for report in reports.values())
+    for name, report in reports.items():
+        print(
+            f"{name}: {report['rows']} candles, {report['written']} written; "
+            f"{report['duplicates']} duplicates, {report['out_of_order']} out of order, "
+            f"{report['gaps']} gaps ({report['missing']} candles missing, largest {report['largest_gap']})"
+        )
+    print(f"{rows} candles from {len(paths)} files in {seconds:.1f}s ({rows / seconds:,.0f} candles/s)")
+
+
+if __name__ == "__main__":
+    main()
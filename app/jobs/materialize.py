@@ -0,0 +1,115 @@
+"""
+Materialize the indicators of `[MATERIALIZATION] indicators` into the indicator store.
+
+Run it on a schedule to keep the store up to date: every run only computes the
+candles opened after the last stored one, fetching the warm-up history they need.
+The first run of a symbol (or one with --rebuild) starts at --since. Candles
+within `[CANDLE_CACHE] settle_seconds` of the newest one may still be missing at
+the source; they are left for the next run.
+
+Usage:
+    python -m app.jobs.materialize [--symbols btcusdt ethusdt] [--since 2017-08-17]
+                                   [--until 2024-01-01] [--rebuild] [--chunk-days 30]
+"""
+import argparse
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from app import debug_logger
+from app.services import create_candle_client, create_indicator_store, indicator_engines, indicator_registry, rowsAdapter
+from app.services.candle_cache import settled_until
+from app.services.candle_clients import settle_margin
+from app.services.indicator_store import materialized_calls
+from app.utils import SYMBOLS, Columns
+
+OPEN_TIME = Columns.OPEN_TIME.value
+
+
+def materialize(
+    symbol, client, store, calls, since=None, until=None, chunk=timedelta(days=30), settle_margin=timedelta(minutes=2)
+):
+    """
+    Compute the calls for the candles not stored yet and append them to the store.
+
+    Args:
+        symbol (str): Lower-case pair name.
+        client (CandleClient): Source of the candles.
+        store (IndicatorStore): Destination of the indicator columns.
+        calls (list): (Indicator, args) pairs, see `materialized_calls`.
+        since (datetime, optional): First open time when nothing is stored yet.
+        until (datetime, optional): Last open time to materialize, now by default.
+        chunk (timedelta): Range computed per candle query.
+        settle_margin (timedelta): Time before the newest candle of the source
+            within which candles may still be missing: those are not stored, as
+            the store only ever grows at its end (see `settled_until`).
+
+    Returns:
+        int: Number of rows appended.
+    """
+    _, last = store.bounds(symbol)
+    if last is None and since is None:
+        raise ValueError(f"Nothing is stored for {symbol} yet; provide --since.")
+    start = since if last is None else last + timedelta(microseconds=1)
+    until = until or datetime.utcnow()
+
+    columns = [OPEN_TIME] + sorted(col.value for col in indicator_registry.required_columns(calls))
+    outputs = [column for indicator, args in calls for column in indicator.outputs(*args)]
+    lookback = indicator_registry.max_lookback(calls)
+    # NaN, not 0, where history is too short: /data applies each request's fill value.
+    calculate_indicators = indicator_engines.create_calculator(fill_value=None)
+
+    appended = 0
+    while start <= until:
+        end = min(start + chunk, until)
+        fetch_end = end + settle_margin
+        rows = rowsAdapter(client.fetch_candles(symbol, start, fetch_end, columns, lookback), columns)
+        for indicator, args in calls if rows else ():
+            rows = indicator.apply(calculate_indicators, args, rows)
+        frame = pd.DataFrame(rows, columns=[OPEN_TIME, *outputs])
+        frame[OPEN_TIME] = pd.to_datetime(frame[OPEN_TIME], utc=True).dt.tz_convert(None)
+        complete_until = settled_until(frame[OPEN_TIME].to_numpy(), end, settle_margin)
+        if complete_until is None:
+            # Nothing up to the margin past `end`: a gap in the history, or nothing yet.
+            complete_until = end if end < until else start - timedelta(microseconds=1)
+        frame = frame[(frame[OPEN_TIME] >= start) & (frame[OPEN_TIME] <= complete_until)]
+        store.append(symbol, frame)
+        appended += len(frame)
+        debug_logger.info(f"Materialized {symbol} up to {complete_until}: {len(frame)} rows.")
+        if complete_until < end:
+            return appended
+        start = end + timedelta(microseconds=1)
+    return appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", nargs="+", default=SYMBOLS)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="First open time of an empty store.")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Last open time, now by default.")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the stored columns and start over at --since.")
+    parser.add_argument("--chunk-days", type=float, default=30)
+    args = parser.parse_args()
+
+    store = create_indicator_store()
+    if store is None:
+        parser.error("Materialization is disabled: set [MATERIALIZATION] store in api_config.cfg.")
+    if args.rebuild and args.since is None:
+        parser.error("--rebuild needs --since.")
+    calls = materialized_calls()
+    client = create_candle_client(cache=False)
+
+    for symbol in args.symbols:
+        if args.rebuild:
+            store.clear(symbol)
+        try:
+            appended = materialize(
+                symbol, client, store, calls, args.since, args.until, timedelta(days=args.chunk_days), settle_margin()
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(f"{symbol}: {appended} rows appended")
+
+
+if __name__ == "__main__":
+    main()
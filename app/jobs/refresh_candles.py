@@ -0,0 +1,99 @@
+"""
+Keep the shared candle files of `[CANDLE_CACHE] shared_directory` up to date.
+
+The single writer of the files the API workers map: it appends the candles
+opened since its previous pass, with their range index, and with --every keeps
+doing so. The first pass of a symbol starts at --since.
+
+Usage:
+    python -m app.jobs.refresh_candles [--symbols btcusdt ethusdt] [--since 2017-08-17]
+                                       [--history-start] [--every 60] [--chunk-days 7]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app import debug_logger
+from app.services import create_candle_client
+from app.services.candle_clients import settings, settle_margin
+from app.services.shared_candles import SharedCandleWriter
+from app.utils import SYMBOLS
+
+
+def refresh(symbol, client, writer, since=None, history_start=False, chunk=timedelta(days=7)):
+    """
+    Append the candles opened since the last refresh to a symbol's shared files.
+
+    Args:
+        symbol (str): Lower-case pair name.
+        client (CandleClient): Source of the candles.
+        writer (SharedCandleWriter): Writer of the symbol's files.
+        since (datetime, optional): First open time when the files are empty.
+        history_start (bool): Whether `since` precedes the symbol's first candle.
+        chunk (timedelta): Range fetched per candle query.
+
+    Returns:
+        int: Number of candles appended.
+    """
+    start = writer.complete_until()
+    if start is None:
+        if since is None:
+            raise ValueError(f"No shared candles for {symbol} yet; provide --since.")
+        start = since
+
+    appended = 0
+    until = datetime.utcnow()
+    while True:
+        end = min(start + chunk, until)
+        # Fetched a settle margin past `end`: the newest candle fetched, not the
+        # clock, tells how far the source is complete (see `settled_until`).
+        fetch_end = end + writer.settle_margin
+        appended += writer.append(client.fetch_candles(symbol, start, fetch_end), fetch_end, history_start)
+        debug_logger.info(f"Refreshed {symbol} up to {writer.complete_until()}: {writer.count} candles.")
+        if end >= until:
+            return appended
+        start = end
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", nargs="+", default=SYMBOLS)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="First open time of empty files.")
+    parser.add_argument(
+        "--history-start", action="store_true",
+        help="--since precedes the first candle: requests reaching before it are served from the files.",
+    )
+    parser.add_argument("--every", type=float, default=0, help="Refresh again every this many seconds.")
+    parser.add_argument("--chunk-days", type=float, default=7)
+    args = parser.parse_args()
+
+    directory = settings.get("CANDLE_CACHE", "shared_directory", fallback="")
+    if not directory:
+        parser.error("No shared cache: set [CANDLE_CACHE] shared_directory in api_config.cfg.")
+    max_window = settings.getint("CANDLE_CACHE", "max_window", fallback=512)
+    client = create_candle_client(cache=False)
+    try:
+        writers = {
+            symbol: SharedCandleWriter(directory, symbol, max_window, settle_margin=settle_margin())
+            for symbol in args.symbols
+        }
+    except RuntimeError as exc:
+        parser.error(str(exc))
+
+    while True:
+        for symbol, writer in writers.items():
+            try:
+                appended = refresh(symbol, client, writer, args.since, args.history_start, timedelta(days=args.chunk_days))
+            except ValueError as exc:
+                parser.error(str(exc))
+            print(f"{symbol}: {appended} candles appended")
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+    for writer in writers.values():
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import data_router, indicators_router, documentation_router
+from app.api.middleware import CompressionMiddleware
+from app.api.routes import data_router, indicators_router, documentation_router, metrics_router, admin_router, health_router, backtest_router, correlation_router, exports_router
+from app.api.routes.exports_api import export_manager
+from app.services import resources
+
+# Startup event
+@asynccontextmanager
+async def lifespan(app):
+    print("HELLO WORLD 🌍")
+    # Warm up in the background: the server starts accepting requests right away,
+    # and /ready reports when the candle client and pandas are loaded.
+    warm_up = asyncio.create_task(run_in_threadpool(resources.warm_up))
+    yield
+    await warm_up
+    # Running exports stop at their next chunk; their partial files are removed.
+    await run_in_threadpool(export_manager.close)
+    await run_in_threadpool(resources.close)
+    print("BY WORLD 🌍")
 
 app = FastAPI(
     root_path="/api",
     title="Data API",
     description="An API for fetching data about cryptocurrencies and calculating technical indicators.",
     version="0.0.1",
+    lifespan=lifespan,
 )
 
 app.include_router(data_router)
 app.include_router(indicators_router)
 app.include_router(documentation_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(health_router)
+app.include_router(backtest_router)
+app.include_router(correlation_router)
+app.include_router(exports_router)
+
+# Negotiated gzip/brotli/zstd compression; /data payloads are large, repetitive numeric JSON.
+app.add_middleware(CompressionMiddleware)
 
 # For future implementation:
 # Adds CORS middleware to control which origins, methods, and headers can interact with the API.
@@ -20,16 +51,10 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["GET"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
 )
 
-# Startup event
-async def lifespan():
-    print("HELLO WORLD 🌍")
-    yield
-    print("BY WORLD 🌍")
-
 # Default root endpoint
 @app.get("/")
 async def root():
@@ -1,4 +1,66 @@
-__all__ = ["rowsAdapter", "CalculateIndicators"]
+__all__ = [
+    "rowsAdapter",
+    "CalculateIndicators",
+    "ArrayIndicators",
+    "NumbaIndicators",
+    "SingleFlight",
+    "CandleClient",
+    "BigQueryCandleClient",
+    "LocalCandleClient",
+    "create_candle_client",
+    "CandleCache",
+    "SharedCandleCache",
+    "IndicatorStore",
+    "LocalIndicatorStore",
+    "BigQueryIndicatorStore",
+    "create_indicator_store",
+    "downsample",
+    "evaluate_rules",
+    "resources",
+    "admission",
+    "http_cache",
+    "indicator_engines",
+    "indicator_registry",
+    "metrics",
+    "profiling",
+]
+
+import importlib
 
 from app.services.rows_adapter import transform_query_job as rowsAdapter
-from app.services.calculators import CalculateIndicators
+from app.services.single_flight import SingleFlight
+from app.services.resources import resources
+from app.services import admission
+from app.services import http_cache
+from app.services import indicator_engines
+from app.services import indicator_registry
+from app.services import metrics
+from app.services import profiling
+
+# Names backed by pandas/numpy are imported on first access so that importing the
+# app stays cheap; `resources.warm_up` loads them after startup.
+_LAZY = {
+    "CalculateIndicators": "app.services.calculators",
+    "ArrayIndicators": "app.services.array_indicators",
+    "NumbaIndicators": "app.services.array_indicators",
+    "CandleClient": "app.services.candle_clients",
+    "BigQueryCandleClient": "app.services.candle_clients",
+    "LocalCandleClient": "app.services.candle_clients",
+    "create_candle_client": "app.services.candle_clients",
+    "CandleCache": "app.services.candle_cache",
+    "SharedCandleCache": "app.services.shared_candles",
+    "IndicatorStore": "app.services.indicator_store",
+    "LocalIndicatorStore": "app.services.indicator_store",
+    "BigQueryIndicatorStore": "app.services.indicator_store",
+    "create_indicator_store": "app.services.indicator_store",
+    "downsample": "app.services.downsampling",
+    "evaluate_rules": "app.services.backtesting",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
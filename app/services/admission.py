@@ -0,0 +1,220 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import Counter as Tally
+from contextlib import asynccontextmanager
+
+from app.services import indicator_registry
+from app.services.metrics import ADMISSION_DECISIONS, ADMITTED_COST, QUEUE_SECONDS
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+INTERACTIVE, BULK = "interactive", "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+
+
+def estimate_cost(start, end, calls, limit=None, interval_seconds=60):
+    """
+    Estimate the cost of a /data computation before running it.
+
+    Args:
+        start (datetime): First open time.
+        end (datetime): Last open time.
+        calls (list): (Indicator, args) pairs.
+        limit (int, optional): Page size, which caps the candles computed.
+        interval_seconds (int): Candle width.
+
+    Returns:
+        float: Candles (warm-up included) times one plus the indicators' relative
+        kernel costs: 1 unit is one candle fetched and encoded.
+    """
+    rows = max(int((end - start).total_seconds() // interval_seconds) + 1, 0)
+    if limit:
+        rows = min(rows, limit)
+    rows += indicator_registry.max_lookback(calls)
+    return rows * (1 + sum(indicator.cost for indicator, _ in calls))
+
+
+class Rejected(Exception):
+    """A request refused by the admission controller."""
+
+    def __init__(self, status_code, message, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Cost budget and priority queue in front of the /data computations.
+
+    Requests run while the estimated cost of everything running stays within
+    `capacity`; bulk requests only get `bulk_share` of it, so interactive ones
+    always find room. A request that does not fit waits in a queue (interactive
+    first, then arrival order) for at most `queue_timeout` seconds. Each client
+    has at most `client_limit` requests running or queued.
+
+    Rejections carry their status: 429 for a client over its limit, 503 for a full
+    queue or a timed-out wait, 422 for a request costlier than `max_cost` (which no
+    retry would change), with a Retry-After estimated from the recent throughput.
+    Not thread-safe: used from the event loop only.
+    """
+
+    def __init__(
+        self, capacity, max_cost, client_limit, bulk_share, interactive_cost, queue_timeout, max_queue, client_header=""
+    ):
+        self.client_header = client_header.lower()
+        self.capacity = capacity
+        self.max_cost = max_cost
+        self.client_limit = client_limit
+        self.bulk_share = bulk_share
+        self.interactive_cost = interactive_cost
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.running_cost = 0.0
+        self.clients = Tally()
+        self._queue = []
+        self._order = itertools.count()
+        # Cost units completed per second, smoothed; seeds the Retry-After estimate.
+        self.throughput = capacity
+
+    def client(self, request):
+        """Identity a request is limited under: the configured header, else the peer address."""
+        if self.client_header and request.headers.get(self.client_header):
+            return request.headers[self.client_header]
+        return request.client.host if request.client else ""
+
+    def priority(self, cost, requested=None):
+        """Class of a request: bulk if costly or asked for, interactive otherwise."""
+        if requested == BULK or cost > self.interactive_cost:
+            return BULK
+        return INTERACTIVE
+
+    @asynccontextmanager
+    async def admit(self, client, cost, priority):
+        """
+        Hold a share of the budget for the duration of the block.
+
+        Raises:
+            Rejected: If the request is refused, before or after queueing.
+        """
+        if cost > self.max_cost:
+            self._decide(priority, "too_expensive")
+            raise Rejected(
+                422,
+                f"Request too expensive ({cost:.0f} units, at most {self.max_cost:.0f}): "
+                "narrow the range, request fewer indicators or page with `limit`.",
+            )
+        if self.clients[client] >= self.client_limit:
+            self._decide(priority, "client_limit")
+            raise Rejected(429, "Too many concurrent requests from this client.", self._retry_after(cost))
+
+        self.clients[client] += 1
+        try:
+            waited = await self._acquire(cost, priority)
+            QUEUE_SECONDS.labels(priority).observe(waited)
+            self._decide(priority, "admitted")
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._release(cost, time.perf_counter() - started)
+        finally:
+            self.clients[client] -= 1
+            if not self.clients[client]:
+                del self.clients[client]
+
+    async def _acquire(self, cost, priority):
+        if self._fits(cost, priority) and not self._waiting_before(priority):
+            self._take(cost)
+            return 0.0
+        if len(self._queue) >= self.max_queue:
+            self._decide(priority, "queue_full")
+            raise Rejected(503, "Server busy: the request queue is full.", self._retry_after(cost))
+
+        started = time.perf_counter()
+        entry = [PRIORITIES.index(priority), next(self._order), cost, priority, asyncio.get_running_loop().create_future()]
+        heapq.heappush(self._queue, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(entry[4]), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if entry[4].done():
+                # Admitted just as the wait ran out: keep the slot.
+                return time.perf_counter() - started
+            entry[4].cancel()
+            self._decide(priority, "timeout")
+            raise Rejected(503, "Server busy: the request waited too long in the queue.", self._retry_after(cost))
+        except asyncio.CancelledError:
+            # The client went away; give the slot back if it was granted.
+            if entry[4].done() and not entry[4].cancelled():
+                self._release(cost, None)
+            entry[4].cancel()
+            raise
+        return time.perf_counter() - started
+
+    def _fits(self, cost, priority):
+        limit = self.capacity if priority == INTERACTIVE else self.capacity * self.bulk_share
+        # Alone, any admissible request runs, even one larger than the budget.
+        return self.running_cost == 0 or self.running_cost + cost <= limit
+
+    def _waiting_before(self, priority):
+        rank = PRIORITIES.index(priority)
+        return any(entry[0] <= rank and not entry[4].done() for entry in self._queue)
+
+    def _take(self, cost):
+        self.running_cost += cost
+        ADMITTED_COST.set(self.running_cost)
+
+    def _release(self, cost, seconds):
+        self.running_cost = max(self.running_cost - cost, 0.0)
+        ADMITTED_COST.set(self.running_cost)
+        if seconds:
+            self.throughput = 0.8 * self.throughput + 0.2 * (cost / seconds)
+        self._wake()
+
+    def _wake(self):
+        # Strictly in queue order: a large request at the head is not overtaken
+        # by smaller ones of the same or a lower class.
+        while self._queue:
+            entry = self._queue[0]
+            if entry[4].done():
+                heapq.heappop(self._queue)
+                continue
+            if not self._fits(entry[2], entry[3]):
+                return
+            heapq.heappop(self._queue)
+            self._take(entry[2])
+            entry[4].set_result(None)
+
+    def _retry_after(self, cost):
+        queued = sum(entry[2] for entry in self._queue if not entry[4].done())
+        return max(1, math.ceil((self.running_cost + queued + cost) / max(self.throughput, 1.0)))
+
+    @staticmethod
+    def _decide(priority, outcome):
+        ADMISSION_DECISIONS.labels(priority, outcome).inc()
+
+
+def create_admission_controller():
+    """
+    Build the controller configured under `[ADMISSION]` in api_config.cfg.
+
+    Returns:
+        AdmissionController: The controller, None when admission control is off.
+    """
+    if not settings.getboolean("ADMISSION", "enabled", fallback=False):
+        return None
+    return AdmissionController(
+        capacity=settings.getfloat("ADMISSION", "capacity", fallback=50_000_000),
+        max_cost=settings.getfloat("ADMISSION", "max_cost", fallback=200_000_000),
+        client_limit=settings.getint("ADMISSION", "client_limit", fallback=4),
+        bulk_share=settings.getfloat("ADMISSION", "bulk_share", fallback=0.5),
+        interactive_cost=settings.getfloat("ADMISSION", "interactive_cost", fallback=2_000_000),
+        queue_timeout=settings.getfloat("ADMISSION", "queue_timeout_seconds", fallback=10),
+        max_queue=settings.getint("ADMISSION", "max_queue", fallback=64),
+        client_header=settings.get("ADMISSION", "client_header", fallback=""),
+    )
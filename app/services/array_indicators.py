@@ -0,0 +1,539 @@
+import functools
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.calculators import CalculateIndicators
+
+try:
+    import numba
+except ImportError:  # optional: numba
+    numba = None
+
+# Windows are reduced in chunks of about this many values to bound memory.
+_CHUNK_VALUES = 1 << 22
+# Longer windows are summed from a cumulative sum instead of window by window.
+_WINDOWED_SUM_MAX = 128
+
+
+class NumpyKernels:
+    """
+    Rolling and exponential primitives on float arrays, with pandas' semantics.
+
+    A window containing NaN gives NaN (pandas' `min_periods=window`); windows are
+    reduced directly, so a window of equal values gives exactly what pandas gives.
+    """
+
+    def rolling_sum(self, values, window):
+        if window > _WINDOWED_SUM_MAX:
+            return self._cumulative_sum(values, window)
+        return _windowed(values, window, lambda windows: windows.sum(axis=1))
+
+    def rolling_mean(self, values, window):
+        return self.rolling_sum(values, window) / window
+
+    def rolling_std(self, values, window):
+        if window < 2:
+            return np.full(len(values), np.nan)
+        return _windowed(values, window, lambda windows: windows.std(axis=1, ddof=1))
+
+    def rolling_max(self, values, window):
+        return _windowed(values, window, lambda windows: windows.max(axis=1))
+
+    def rolling_min(self, values, window):
+        return _windowed(values, window, lambda windows: windows.min(axis=1))
+
+    def rolling_mad(self, values, window):
+        """Mean absolute deviation from the window mean."""
+        return _windowed(
+            values, window, lambda windows: np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+        )
+
+    def ewm(self, values, alpha, adjust):
+        """`Series.ewm(alpha=alpha, adjust=adjust).mean()` for values without NaN."""
+        decay = 1 - alpha
+        if adjust:
+            weights = np.ones(len(values))
+            return _linear_recursion(values, decay) / _linear_recursion(weights, decay)
+        inputs = alpha * values
+        inputs[:1] = values[:1]
+        return _linear_recursion(inputs, decay)
+
+    @staticmethod
+    def _cumulative_sum(values, window):
+        result = np.full(len(values), np.nan)
+        if window > len(values):
+            return result
+        missing = np.isnan(values)
+        # Relative to the first value, the running total stays close to the window sums.
+        base = values[~missing][0] if (~missing).any() else 0.0
+        totals = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values - base))))
+        gaps = np.concatenate(([0], np.cumsum(missing)))
+        sums = totals[window:] - totals[:-window] + window * base
+        result[window - 1:] = np.where(gaps[window:] > gaps[:-window], np.nan, sums)
+        return result
+
+
+class NumbaKernels(NumpyKernels):
+    """
+    NumpyKernels with the rolling and exponential loops compiled by numba.
+
+    Sums, extremes and exponential averages run in O(n). Standard and mean
+    absolute deviations take two passes over every window, O(n·w), which keeps
+    them exact on windows of equal values where running sums leave a residue.
+    """
+
+    def __init__(self):
+        if numba is None:
+            raise ValueError("The numba engine is not available: its package is not installed.")
+        compile = functools.partial(numba.njit, cache=True, nogil=True)
+        self._sum = compile(_rolling_sum_loop)
+        self._std = compile(_rolling_std_loop)
+        self._extreme = compile(_rolling_extreme_loop)
+        self._mad = compile(_rolling_mad_loop)
+        self._ewm = compile(_ewm_loop)
+        # Compile now (warm-up) rather than during the first request.
+        sample = np.arange(4, dtype=np.float64)
+        self._sum(sample, 2), self._std(sample, 2), self._extreme(sample, 2, 1.0), self._mad(sample, 2)
+        self._ewm(sample, 0.5, True)
+
+    def rolling_sum(self, values, window):
+        return self._sum(values, window)
+
+    def rolling_std(self, values, window):
+        return self._std(values, window)
+
+    def rolling_max(self, values, window):
+        return self._extreme(values, window, 1.0)
+
+    def rolling_min(self, values, window):
+        return self._extreme(values, window, -1.0)
+
+    def rolling_mad(self, values, window):
+        return self._mad(values, window)
+
+    def ewm(self, values, alpha, adjust):
+        return self._ewm(values, alpha, adjust)
+
+
+def _windowed(values, window, reduce):
+    result = np.full(len(values), np.nan)
+    if window > len(values):
+        return result
+    windows = sliding_window_view(values, window)
+    step = max(_CHUNK_VALUES // window, 1)
+    for begin in range(0, len(windows), step):
+        chunk = windows[begin:begin + step]
+        result[window - 1 + begin:window - 1 + begin + len(chunk)] = reduce(chunk)
+    return result
+
+
+def _linear_recursion(inputs, decay):
+    """Solve z[t] = decay * z[t - 1] + inputs[t] (z[-1] = 0) without a Python loop per value."""
+    if decay == 0:
+        return inputs.copy()
+    result = np.empty(len(inputs))
+    # Within a block, z[t] = decay**t * cumsum(inputs / decay**t): blocks stay short
+    # enough for decay**-t to remain finite.
+    block = int(min(max(100 / -np.log10(decay), 1), max(len(inputs), 1)))
+    scales = decay ** -np.arange(block, dtype=np.float64)
+    carry = 0.0
+    for begin in range(0, len(inputs), block):
+        chunk = inputs[begin:begin + block]
+        count = len(chunk)
+        result[begin:begin + count] = (decay * carry + np.cumsum(chunk * scales[:count])) / scales[:count]
+        carry = result[begin + count - 1]
+    return result
+
+
+# Loops compiled by NumbaKernels; plain Python otherwise.
+
+def _rolling_sum_loop(values, window):
+    result = np.full(len(values), np.nan)
+    total = 0.0
+    compensation = 0.0
+    missing = 0
+    nonzero = 0
+    for i in range(len(values)):
+        for value, sign in ((values[i], 1.0), (values[i - window] if i >= window else 0.0, -1.0)):
+            if np.isnan(value):
+                missing += int(sign)
+            elif value != 0:
+                nonzero += int(sign)
+                # Kahan summation, as pandas' rolling sum.
+                term = sign * value - compensation
+                updated = total + term
+                compensation = (updated - total) - term
+                total = updated
+        if i >= window - 1 and missing == 0:
+            # A window of zeros sums to exactly zero, whatever the rounding left.
+            result[i] = total if nonzero else 0.0
+    return result
+
+
+def _rolling_std_loop(values, window):
+    result = np.full(len(values), np.nan)
+    if window < 2:
+        return result
+    for i in range(window - 1, len(values)):
+        mean = 0.0
+        for j in range(i - window + 1, i + 1):
+            mean += values[j]
+        mean /= window
+        squares = 0.0
+        for j in range(i - window + 1, i + 1):
+            squares += (values[j] - mean) ** 2
+        result[i] = np.sqrt(squares / (window - 1))
+    return result
+
+
+def _rolling_extreme_loop(values, window, sign):
+    # Monotonic queue of positions: the front holds the extreme of the window.
+    result = np.full(len(values), np.nan)
+    queue = np.empty(len(values), np.int64)
+    head = 0
+    tail = 0
+    last_missing = -1
+    for i in range(len(values)):
+        if np.isnan(values[i]):
+            last_missing = i
+        else:
+            while tail > head and sign * values[queue[tail - 1]] <= sign * values[i]:
+                tail -= 1
+            queue[tail] = i
+            tail += 1
+        while tail > head and queue[head] <= i - window:
+            head += 1
+        if i >= window - 1 and last_missing <= i - window:
+            result[i] = values[queue[head]]
+    return result
+
+
+def _rolling_mad_loop(values, window):
+    result = np.full(len(values), np.nan)
+    for i in range(window - 1, len(values)):
+        mean = 0.0
+        for j in range(i - window + 1, i + 1):
+            mean += values[j]
+        mean /= window
+        deviation = 0.0
+        for j in range(i - window + 1, i + 1):
+            deviation += abs(values[j] - mean)
+        result[i] = deviation / window
+    return result
+
+
+def _ewm_loop(values, alpha, adjust):
+    result = np.empty(len(values))
+    decay = 1 - alpha
+    if adjust:
+        numerator = 0.0
+        denominator = 0.0
+        for i in range(len(values)):
+            numerator = decay * numerator + values[i]
+            denominator = decay * denominator + 1.0
+            result[i] = numerator / denominator
+    elif len(values):
+        result[0] = values[0]
+        for i in range(1, len(values)):
+            result[i] = decay * result[i - 1] + alpha * values[i]
+    return result
+
+
+def _shift(values, periods):
+    result = np.full(len(values), np.nan)
+    if abs(periods) >= len(values):
+        return result
+    if periods >= 0:
+        result[periods:] = values[:len(values) - periods]
+    else:
+        result[:periods] = values[-periods:]
+    return result
+
+
+def _diff(values):
+    return values - _shift(values, 1)
+
+
+def _gains_losses(close):
+    delta = _diff(close)
+    return np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0)
+
+
+def _same_row_range(c):
+    # CalculateIndicators' ATR, ADX and KC take the range against the candle's own close.
+    high, low, close = c["High"], c["Low"], c["Close"]
+    return np.maximum.reduce([high - low, np.abs(high - close), np.abs(low - close)])
+
+
+def _money_flow_volume(c):
+    high, low, close = c["High"], c["Low"], c["Close"]
+    return ((close - low) - (high - close)) / (high - low) * c["Volume"]
+
+
+# Array versions of the CalculateIndicators methods: (kernels, columns, *args) ->
+# {column: values}, columns in the order the pandas methods add them.
+
+def _sma(k, c, period):
+    return {f"SMA_{period}": k.rolling_mean(c["Close"], period)}
+
+
+def _ema(k, c, period):
+    return {f"EMA_{period}": k.ewm(c["Close"], 2 / (period + 1), adjust=True)}
+
+
+def _roc(k, c, period):
+    close = c["Close"]
+    return {f"ROC_{period}": (close / _shift(close, period) - 1) * 100}
+
+
+def _rsi(k, c, period):
+    gain, loss = _gains_losses(c["Close"])
+    relative_strength = k.rolling_mean(gain, period) / k.rolling_mean(loss, period)
+    return {f"RSI_{period}": 100 - (100 / (1 + relative_strength))}
+
+
+def _wil(k, c, period):
+    high, low = k.rolling_max(c["High"], period), k.rolling_min(c["Low"], period)
+    return {f"WIL_{period}": ((high - c["Close"]) / (high - low)) * -100}
+
+
+def _atr(k, c, period):
+    true_range = _same_row_range(c)
+    return {"TR": true_range, f"ATR_{period}": k.rolling_mean(true_range, period)}
+
+
+def _mom(k, c, period):
+    close = c["Close"]
+    return {f"MOM_{period}": close - _shift(close, period)}
+
+
+def _so(k, c, period):
+    low, high = k.rolling_min(c["Low"], period), k.rolling_max(c["High"], period)
+    return {f"SO_%K_{period}": ((c["Close"] - low) / (high - low)) * 100}
+
+
+def _tr(k, c):
+    high, low, previous = c["High"], c["Low"], _shift(c["Close"], 1)
+    # fmax skips the missing previous close of the first candle, as max() does.
+    return {"TR": np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))}
+
+
+def _macd(k, c, short_period, long_period, signal_period):
+    close = c["Close"]
+    line = k.ewm(close, 2 / (short_period + 1), adjust=False) - k.ewm(close, 2 / (long_period + 1), adjust=False)
+    return {
+        f"MACD_Line_{short_period}_{long_period}": line,
+        f"Signal_Line_{signal_period}": k.ewm(line, 2 / (signal_period + 1), adjust=False),
+    }
+
+
+def _bb(k, c, period):
+    middle = k.rolling_mean(c["Close"], period)
+    deviation = k.rolling_std(c["Close"], period)
+    return {
+        f"Middle_Band_{period}": middle,
+        f"Upper_Band_{period}": middle + (2 * deviation),
+        f"Lower_Band_{period}": middle - (2 * deviation),
+    }
+
+
+def _cmo(k, c, period):
+    gain, loss = _gains_losses(c["Close"])
+    sum_gain, sum_loss = k.rolling_sum(gain, period), k.rolling_sum(loss, period)
+    return {f"CMO_{period}": ((sum_gain - sum_loss) / (sum_gain + sum_loss)) * 100}
+
+
+def _obv(k, c):
+    delta, volume = _diff(c["Close"]), c["Volume"]
+    return {"OBV": np.cumsum(np.where(delta > 0, volume, np.where(delta < 0, -volume, 0.0)))}
+
+
+def _dc(k, c, period):
+    upper, lower = k.rolling_max(c["High"], period), k.rolling_min(c["Low"], period)
+    return {
+        f"Donchian_Upper_{period}": upper,
+        f"Donchian_Lower_{period}": lower,
+        f"Donchian_Mid_{period}": (upper + lower) / 2,
+    }
+
+
+def _al(k, c):
+    money_flow = _money_flow_volume(c)
+    missing = np.isnan(money_flow)
+    # Like Series.cumsum: missing values stay missing and are skipped.
+    line = np.cumsum(np.where(missing, 0.0, money_flow))
+    line[missing] = np.nan
+    return {"AD_Line": line}
+
+
+def _cmf(k, c, period):
+    return {f"CMF_{period}": k.rolling_sum(_money_flow_volume(c), period) / k.rolling_sum(c["Volume"], period)}
+
+
+def _ic(k, c):
+    high, low = c["High"], c["Low"]
+
+    def midpoint(window):
+        return (k.rolling_max(high, window) + k.rolling_min(low, window)) / 2
+
+    tenkan, kijun = midpoint(9), midpoint(26)
+    return {
+        "Tenkan_sen": tenkan,
+        "Kijun_sen": kijun,
+        "Senkou_Span_A": _shift((tenkan + kijun) / 2, 26),
+        "Senkou_Span_B": midpoint(52),
+        "Chikou_Span": _shift(c["Close"], -26),
+    }
+
+
+def _pp(k, c):
+    high, low = c["High"], c["Low"]
+    pivot = (high + low + c["Close"]) / 3
+    return {
+        "Pivot": pivot,
+        "Support_1": 2 * pivot - high,
+        "Resistance_1": 2 * pivot - low,
+        "Support_2": pivot - (high - low),
+        "Resistance_2": pivot + (high - low),
+    }
+
+
+def _cci(k, c, period):
+    typical = (c["High"] + c["Low"] + c["Close"]) / 3
+    average = k.rolling_mean(typical, period)
+    deviation = k.rolling_mad(typical, period)
+    return {
+        "Typical_Price": typical,
+        "SMA_TP": average,
+        "Mean_Deviation": deviation,
+        f"CCI_{period}": (typical - average) / (0.015 * deviation),
+    }
+
+
+def _adx(k, c, period):
+    true_range = k.rolling_mean(_same_row_range(c), period)
+    high_change, low_change = _diff(c["High"]), _diff(c["Low"])
+    plus_dm = np.where((high_change > low_change) & (high_change > 0), high_change, 0.0)
+    minus_dm = -np.where((low_change > high_change) & (low_change > 0), low_change, 0.0)
+    plus_di = 100 * (k.rolling_mean(plus_dm, period) / true_range)
+    minus_di = 100 * (k.rolling_mean(minus_dm, period) / true_range)
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return {f"ADX_{period}": k.rolling_mean(dx, period)}
+
+
+def _kc(k, c, period):
+    middle = k.rolling_mean(c["Close"], period)
+    average_range = k.rolling_mean(_same_row_range(c), period)
+    return {
+        "Middle_Band": middle,
+        "ATR": average_range,
+        "Upper_Band": middle + (2 * average_range),
+        "Lower_Band": middle - (2 * average_range),
+    }
+
+
+def _vwap(k, c):
+    typical = (c["High"] + c["Low"] + c["Close"]) / 3
+    tp_volume = np.cumsum(typical * c["Volume"])
+    volume = np.cumsum(c["Volume"])
+    return {
+        "Typical_Price": typical,
+        "Cumulative_TP_Volume": tp_volume,
+        "Cumulative_Volume": volume,
+        "VWAP": tp_volume / volume,
+    }
+
+
+INDICATORS = {
+    "sma": _sma,
+    "ema": _ema,
+    "roc": _roc,
+    "rsi": _rsi,
+    "wil": _wil,
+    "atr": _atr,
+    "mom": _mom,
+    "so": _so,
+    "tr": _tr,
+    "macd": _macd,
+    "bb": _bb,
+    "cmo": _cmo,
+    "obv": _obv,
+    "dc": _dc,
+    "al": _al,
+    "cmf": _cmf,
+    "ic": _ic,
+    "pp": _pp,
+    "cci": _cci,
+    "adx": _adx,
+    "kc": _kc,
+    "vwap": _vwap,
+}
+
+
+class _Columns:
+    """Candle columns of the rows as float arrays, read on first use."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.arrays = {}
+
+    def __getitem__(self, name):
+        if name not in self.arrays:
+            self.arrays[name] = np.fromiter((row[name] for row in self.rows), dtype=np.float64, count=len(self.rows))
+        return self.arrays[name]
+
+
+class ArrayIndicators(CalculateIndicators):
+    """
+    CalculateIndicators computing on NumPy arrays instead of DataFrames.
+
+    Every method reads the candle columns it needs into arrays and writes its
+    output columns back into the rows, which are updated in place and returned:
+    no DataFrame is built per call. Outputs match the pandas methods up to
+    floating-point rounding (`benchmarks.engine_conformance` checks it).
+    """
+
+    kernels = NumpyKernels()
+
+    def drop_column(self, columns, data):
+        columns = set(columns)
+        return [{name: value for name, value in row.items() if name not in columns} for row in data]
+
+    def _apply(self, key, args, data):
+        if not data:
+            return data
+        with np.errstate(divide="ignore", invalid="ignore"):
+            outputs = INDICATORS[key](self.kernels, _Columns(data), *args)
+        for name, values in outputs.items():
+            values = np.where(np.isinf(values), np.nan, values)
+            if self.fill_value is not None:
+                values = np.where(np.isnan(values), self.fill_value, values)
+            for row, value in zip(data, values.tolist()):
+                row[name] = value
+        return data
+
+
+class NumbaIndicators(ArrayIndicators):
+    """ArrayIndicators with the rolling windows and EWMs compiled by numba."""
+
+    def __init__(self, fill_value=0):
+        super().__init__(fill_value=fill_value)
+        self.kernels = _numba_kernels()
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels():
+    return NumbaKernels()
+
+
+def _method(key):
+    @functools.wraps(getattr(CalculateIndicators, key))
+    def method(self, *args):
+        return self._apply(key, args[:-1], args[-1])
+
+    return method
+
+
+for _key in INDICATORS:
+    setattr(ArrayIndicators, _key, _method(_key))
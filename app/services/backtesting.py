@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from app.utils import Columns
+
+
+def evaluate_rules(rows, entry, exit=None, result="timestamps", fee_bps=0.0):
+    """
+    Evaluate trading rules on enriched candles.
+
+    Args:
+        rows (list): Candle rows with every column the rules use, sorted by `Open_time`.
+        entry (Rule): Condition to be in the market (or to enter, with `exit`).
+        exit (Rule, optional): Condition to leave the market. Without it the
+            position is held exactly while `entry` holds.
+        result (str): "timestamps" for the open times where `entry` holds, "stats"
+            for the performance of trading the rules.
+        fee_bps (float): Cost of every entry and exit, in basis points.
+
+    Returns:
+        dict: The response body.
+    """
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        # No candles: the columns the rules and the stats read, without rows.
+        names = [Columns.OPEN_TIME.value, Columns.CLOSE.value, *entry.names, *(exit.names if exit else ())]
+        frame = pd.DataFrame(columns=list(dict.fromkeys(names)))
+    signals = entry.evaluate(frame)
+
+    if result == "timestamps":
+        return {
+            "rule": entry.expression,
+            "candles": len(frame),
+            "count": int(signals.sum()),
+            "matches": frame.loc[signals, Columns.OPEN_TIME.value].tolist(),
+        }
+    return {
+        "rule": entry.expression,
+        "exit": exit.expression if exit else None,
+        "stats": _trade_stats(frame[Columns.CLOSE.value].astype(float), signals, exit.evaluate(frame) if exit else None, fee_bps),
+    }
+
+
+def _trade_stats(close, entry, exit, fee_bps):
+    """
+    Long-only performance of trading the signals at the close of each candle.
+
+    A signal on a candle changes the position at its close, so it earns from the
+    next candle on: no look-ahead.
+    """
+    if exit is None:
+        position = entry.astype(float)
+    else:
+        position = pd.Series(np.where(entry, 1.0, np.where(exit, 0.0, np.nan)), index=close.index).ffill().fillna(0.0)
+
+    held = position.shift(1, fill_value=0.0)
+    returns = close.pct_change().fillna(0.0)
+    changes = position.diff().fillna(position).abs()
+    strategy = held * returns - changes * fee_bps / 10_000
+    equity = (1 + strategy).cumprod()
+
+    # Candles of one trade share the number of entries seen before them.
+    entries = (position.diff().fillna(position) > 0).cumsum().shift(1, fill_value=0)
+    trades = (1 + strategy[held > 0]).groupby(entries[held > 0]).prod() - 1
+
+    candles = len(close)
+    return {
+        "candles": candles,
+        "trades": len(trades),
+        "win_rate": _number(trades.gt(0).mean()) if len(trades) else None,
+        "average_trade_return": _number(trades.mean()) if len(trades) else None,
+        "best_trade_return": _number(trades.max()) if len(trades) else None,
+        "worst_trade_return": _number(trades.min()) if len(trades) else None,
+        "total_return": _number(equity.iloc[-1] - 1) if candles else 0.0,
+        "buy_and_hold_return": _number(close.iloc[-1] / close.iloc[0] - 1) if candles else 0.0,
+        "max_drawdown": _number((equity / equity.cummax() - 1).min()) if candles else 0.0,
+        "exposure": _number(held.mean()) if candles else 0.0,
+    }
+
+
+def _number(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
@@ -5,10 +5,19 @@ class CalculateIndicators:
     A utility class for calculating various financial indicators.
     """
 
+    def __init__(self, fill_value=0):
+        """
+        Args:
+            fill_value: Value of cells that cannot be computed (e.g. before an
+                indicator's warm-up period); None keeps them as NaN.
+        """
+        self.fill_value = fill_value
+
     def _finalize_dataframe(self, df):
         """Replace invalid values and return JSON-like data."""
         df.replace([float('inf'), float('-inf')], float('nan'), inplace=True)
-        df.fillna(0, inplace=True)
+        if self.fill_value is not None:
+            df.fillna(self.fill_value, inplace=True)
         return df.to_dict(orient="records")
 
     def drop_column(self, columns, data):
@@ -210,8 +219,6 @@ class CalculateIndicators:
         df[f"MACD_Line_{short_period}_{long_period}"] = df['MACD_Line']
         df[f"Signal_Line_{signal_period}"] = df['Signal_Line']
         df.drop(['MACD_Line', 'Signal_Line'], axis=1, inplace=True)
-        df.replace([float('inf'), float('-inf')], float('nan'), inplace=True)
-        df.fillna(0, inplace=True)
         return self._finalize_dataframe(df)
 
 
@@ -267,7 +274,7 @@ class CalculateIndicators:
             list: Data enriched with OBV values.
         """
         df = pd.DataFrame(data)
-        df['OBV'] = 0  # Initialize OBV column
+        df['OBV'] = 0.0  # Initialize OBV column (float: volumes are fractional)
         for i in range(1, len(df)):
             if df.loc[i, 'Close'] > df.loc[i - 1, 'Close']:
                 df.loc[i, 'OBV'] = df.loc[i - 1, 'OBV'] + df.loc[i, 'Volume']
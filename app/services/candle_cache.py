@@ -0,0 +1,294 @@
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.services.candle_clients import CandleClient, CandleResult
+from app.services.range_index import Growable, RangeIndex
+from app.utils import Columns
+
+OPEN_TIME = Columns.OPEN_TIME.value
+DTYPES = {
+    Columns.OPEN_TIME.value: "datetime64[ns]",
+    Columns.CLOSE_TIME.value: "datetime64[ns]",
+    Columns.NUMBER_OF_TRADES.value: "int64",
+}
+
+
+class CandleCache(CandleClient):
+    """
+    In-process cache of candles in front of another candle client.
+
+    Every symbol keeps one contiguous run of candles as column arrays, together
+    with a RangeIndex over them. The run is known to hold every candle from its
+    first one up to `complete_until`, so requests inside it are answered without a
+    query, requests running past it only fetch the newer candles (appended to the
+    arrays and the index), and requests starting before it fetch the older
+    candles up to the run and merge them with what is cached.
+
+    The source may still be receiving the candles just before its newest one:
+    `complete_until` stays `settle_margin` behind the newest candle fetched, and
+    only the candles up to it are held. Newer ones fetched are served to the
+    request that fetched them (without the index) and fetched again next time.
+    Fetches reach `settle_margin` past their end, so ranges in the past come out
+    complete. Held candles are assumed final.
+
+    Results carry `index_span`: the index snapshot and the position of their first
+    row, which lets `enrich_candles` answer window indicators from the index.
+    """
+
+    def __init__(self, client, max_rows=1_000_000, max_window=512, settle_margin=timedelta(minutes=2)):
+        """
+        Args:
+            client (CandleClient): Source of the candles.
+            max_rows (int): Candles kept per symbol; the oldest are dropped first.
+            max_window (int): Longest window the sparse tables answer.
+            settle_margin (timedelta): Time before the newest candle fetched from
+                which candles may still be missing in the source.
+        """
+        self.client = client
+        self.max_rows = max_rows
+        self.max_window = max_window
+        self.settle_margin = settle_margin
+        self._runs = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        # Misses and extensions of a symbol are serialized: concurrent requests for
+        # the same new candles wait for one fetch instead of each running their own.
+        with self._lock(symbol):
+            run = self._runs.get(symbol)
+            fetched = 0
+            fetch_end = None
+            unsettled = None
+            if run is None or not run.serves(start, lookback):
+                fetch_end = end
+                if run is not None and run.first() is not None and start <= run.first() <= end:
+                    # The run holds the rest of the range: fetch up to its first candle only.
+                    fetch_end = run.first()
+                results = self.client.fetch_candles(
+                    symbol, start, fetch_end + self.settle_margin, None, lookback, limit
+                )
+                fetched = getattr(results, "total_bytes_processed", None) or 0
+                run, unsettled = self._merge(symbol, run, results, start, fetch_end + self.settle_margin, lookback)
+            if fetch_end != end and end > run.complete_until:
+                held = run.count_from(start)
+                if not limit or held < limit:
+                    # One more than needed: the candle at `complete_until` may be held already.
+                    missing = limit - held + 1 if limit else None
+                    results = self.client.fetch_candles(
+                        symbol, run.complete_until, end + self.settle_margin, limit=missing
+                    )
+                    fetched = getattr(results, "total_bytes_processed", None) or 0
+                    unsettled = run.append(results, end + self.settle_margin)
+            self._trim(run, start, lookback)
+            snapshot = run.snapshot()
+            if unsettled is not None:
+                unsettled = unsettled.after(run.complete_until)
+
+        if unsettled is not None and unsettled.times.size:
+            result = snapshot.followed_by(unsettled, start, lookback).read(start, end, columns, lookback, limit)
+        else:
+            result = snapshot.read(start, end, columns, lookback, limit)
+        result.total_bytes_processed = fetched
+        return result
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+    def _lock(self, symbol):
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _merge(self, symbol, run, results, start, end, lookback):
+        fresh = _Run(self.max_window, self.settle_margin)
+        unsettled = fresh.append(results, end)
+        # Fewer warm-up candles than asked for: the history starts here.
+        fresh.history_start = fresh.position(start) + unsettled.position(start) < lookback
+
+        if run is not None and run.first() is not None and fresh.complete_until >= run.first():
+            # The cached run continues the fresh one: keep its newer candles.
+            fresh.append_run(run, fresh.complete_until)
+            fresh.complete_until = max(fresh.complete_until, run.complete_until)
+        self._runs[symbol] = fresh
+        return fresh, unsettled
+
+    def _trim(self, run, start, lookback):
+        # Candles read by the current request are kept even past `max_rows`.
+        excess = min(run.times.size - self.max_rows, run.position(start) - lookback)
+        if excess > 0:
+            run.drop_front(excess)
+
+
+def settled_until(times, end, settle_margin):
+    """
+    Open time up to which a fetch ending at `end` holds every candle of the source.
+
+    Candles may still be missing just before the newest one of the source, so
+    only those `settle_margin` older than the newest candle fetched count, not
+    the present: a source lagging behind it leaves no gap. None without candles.
+    """
+    if not len(times):
+        return None
+    return min(end, pd.Timestamp(times[-1]).to_pydatetime() - settle_margin)
+
+
+class _Run:
+    def __init__(self, max_window, settle_margin):
+        self.settle_margin = settle_margin
+        self.times = Growable(dtype="datetime64[ns]")
+        self.columns = {
+            col.value: Growable(dtype=DTYPES.get(col.value, "float64")) for col in Columns if col != Columns.OPEN_TIME
+        }
+        self.index = RangeIndex(max_window)
+        self.complete_until = datetime.min
+        self.history_start = False
+
+    def first(self):
+        return pd.Timestamp(self.times.data[0]).to_pydatetime() if self.times.size else None
+
+    def last(self):
+        return pd.Timestamp(self.times.data[self.times.size - 1]).to_pydatetime()
+
+    def position(self, time):
+        """Position of the first candle opened at or after `time`."""
+        return int(np.searchsorted(self.times.view(), np.datetime64(time, "ns"), side="left"))
+
+    def count_from(self, time):
+        return self.times.size - self.position(time)
+
+    def serves(self, start, lookback):
+        """Whether `start` and `lookback` candles before it are all cached."""
+        first = self.first()
+        if first is None or start > self.complete_until:
+            return False
+        if self.history_start:
+            return True
+        return first <= start and self.position(start) >= lookback
+
+    def append(self, results, end):
+        """
+        Append the settled candles of a client result fetched up to `end`.
+
+        Candles already held are skipped, and so are those past the new
+        `complete_until` (see `settled_until`), which are returned instead.
+
+        Returns:
+            CandleSnapshot: The fetched candles opened after `complete_until`.
+        """
+        times, columns = candle_arrays(results)
+        complete_until = settled_until(times, end, self.settle_margin)
+        if complete_until is None:
+            return CandleSnapshot(times, columns)
+        self.complete_until = max(self.complete_until, complete_until)
+        settled = times <= np.datetime64(self.complete_until, "ns")
+        keep = settled & (times > self.times.data[self.times.size - 1]) if self.times.size else settled
+        self._append_arrays(times[keep], {name: values[keep] for name, values in columns.items()})
+        return CandleSnapshot(times[~settled], {name: values[~settled] for name, values in columns.items()})
+
+    def append_run(self, other, after):
+        """Append the candles of another run opened after `after`."""
+        times = other.times.view()
+        keep = times > np.datetime64(after, "ns")
+        if self.times.size:
+            keep &= times > self.times.data[self.times.size - 1]
+        self._append_arrays(times[keep], {name: column.view()[keep] for name, column in other.columns.items()})
+
+    def _append_arrays(self, times, columns):
+        self.times.append(times)
+        for name, values in columns.items():
+            self.columns[name].append(values)
+        self.index.extend(
+            columns[Columns.HIGH.value], columns[Columns.LOW.value],
+            columns[Columns.CLOSE.value], columns[Columns.VOLUME.value],
+        )
+
+    def drop_front(self, count):
+        self.times.drop_front(count)
+        for column in self.columns.values():
+            column.drop_front(count)
+        self.index.drop_front(count)
+        self.history_start = False
+
+    def snapshot(self):
+        return CandleSnapshot(
+            self.times.view(), {name: column.view() for name, column in self.columns.items()}, self.index.view()
+        )
+
+
+class CandleSnapshot:
+    """Candle column arrays (and their RangeIndexView, if any) answering fetches."""
+
+    def __init__(self, times, columns, index=None):
+        self.times = times
+        self.columns = columns
+        self.index = index
+
+    def position(self, time):
+        """Position of the first candle opened at or after `time`."""
+        return int(np.searchsorted(self.times, np.datetime64(time, "ns"), side="left"))
+
+    def after(self, time):
+        """The candles opened after `time`."""
+        keep = self.times > np.datetime64(time, "ns")
+        return CandleSnapshot(self.times[keep], {name: values[keep] for name, values in self.columns.items()})
+
+    def followed_by(self, newer, start, lookback):
+        """
+        These candles from `lookback` before `start` on, then the `newer` ones.
+
+        The result has no index: it does not cover the newer candles.
+        """
+        lower = max(self.position(start) - lookback, 0)
+        return CandleSnapshot(
+            np.concatenate((self.times[lower:], newer.times)),
+            {name: np.concatenate((values[lower:], newer.columns[name])) for name, values in self.columns.items()},
+        )
+
+    def read(self, start, end, columns, lookback, limit):
+        """Rows like `CandleClient.fetch_candles` returns, as naive UTC times."""
+        lower = np.searchsorted(self.times, np.datetime64(start, "ns"), side="left")
+        upper = np.searchsorted(self.times, np.datetime64(end, "ns"), side="right")
+        if limit:
+            upper = min(upper, lower + limit)
+        lower = max(lower - lookback, 0)
+
+        names = [col.value for col in Columns if not columns or col.value in columns or col == Columns.OPEN_TIME]
+        values = [
+            _python(self.times[lower:upper] if name == OPEN_TIME else self.columns[name][lower:upper])
+            for name in names
+        ]
+        result = CandleResult(dict(zip(names, row)) for row in zip(*values))
+        if self.index is not None:
+            result.index_span = (self.index, int(lower))
+        return result
+
+
+def candle_arrays(results):
+    """
+    Convert client rows to column arrays.
+
+    Returns:
+        tuple: Open times (naive UTC datetime64[ns]) and a dict of the other
+        `Columns`, with the dtypes of `DTYPES` (float64 otherwise).
+    """
+    frame = pd.DataFrame([dict(row) for row in results], columns=[col.value for col in Columns])
+    arrays = {}
+    for col in Columns:
+        dtype = np.dtype(DTYPES.get(col.value, "float64"))
+        if np.issubdtype(dtype, np.datetime64):
+            arrays[col.value] = pd.to_datetime(frame[col.value], utc=True).dt.tz_convert(None).to_numpy()
+        else:
+            arrays[col.value] = frame[col.value].to_numpy(dtype=dtype)
+    return arrays.pop(OPEN_TIME), arrays
+
+
+def _python(values):
+    # datetime64[ns] turns into integers with tolist(); microseconds give datetimes.
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[us]")
+    return values.tolist()
@@ -0,0 +1,429 @@
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.services import metrics
+from app.utils import Columns
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+# Binance kline CSV layout; the trailing "Ignore" field is dropped.
+BINANCE_KLINE_COLUMNS = [col.value for col in Columns] + ["Ignore"]
+
+
+class CandleResult(list):
+    """
+    Candle rows returned by a local client.
+
+    Mirrors the parts of BigQuery's RowIterator the API relies on: iterating gives
+    mappings keyed by the `Columns` values, and the scan size is reported.
+    """
+
+    total_bytes_processed = 0
+
+
+class CandleClient(ABC):
+    """
+    Source of candles for a symbol and time range.
+
+    Implementations return an iterable of row mappings (the `rowsAdapter` input)
+    ordered by `Open_time`, exposing `total_bytes_processed`.
+    """
+
+    @abstractmethod
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        """
+        Fetch the candles opened between `start` and `end` (inclusive).
+
+        Args:
+            symbol (str): Lower-case pair name, e.g. "btcusdt".
+            start (datetime): First open time (UTC).
+            end (datetime): Last open time (UTC).
+            columns (list[str], optional): Columns to read, all `Columns` by default.
+                Rows may carry more; BigQuery bills only the selected ones.
+            lookback (int): Number of candles opened before `start` to include as
+                well (fewer if the history is shorter), for indicator warm-up.
+            limit (int, optional): Return only the first `limit` candles of the
+                range (warm-up candles not counted).
+
+        Returns:
+            Iterable: Row mappings ordered by `Open_time`.
+        """
+
+
+class BigQueryCandleClient(CandleClient):
+    """
+    Candles stored in a BigQuery table described by `database_config.cfg`.
+
+    The transport is tuned by `[BIGQUERY]` in api_config.cfg: a keep-alive
+    connection pool sized for concurrent queries, a deadline per query, retries
+    with jittered exponential back-off, and optionally hedged queries (see
+    `Hedger`). Results are downloaded within the deadline and the hedge.
+    """
+
+    def __init__(self):
+        from google.cloud import bigquery
+        from google.cloud.bigquery.retry import DEFAULT_JOB_RETRY
+
+        self.config = load_config("database_config.cfg")
+        self.client = bigquery.Client(_http=_pooled_session(bigquery.Client.SCOPE))
+        self.interval = timedelta(seconds=self.config["DATABASE"].getint("interval_seconds", fallback=60))
+
+        timeout = settings.getfloat("BIGQUERY", "timeout_seconds", fallback=60)
+        self.timeout = timeout or None
+        # api_core draws every back-off uniformly below the exponential bound (full jitter).
+        self.retry = bigquery.DEFAULT_RETRY.with_delay(
+            initial=settings.getfloat("BIGQUERY", "retry_initial_seconds", fallback=0.5),
+            maximum=settings.getfloat("BIGQUERY", "retry_maximum_seconds", fallback=8),
+            multiplier=2,
+        ).with_timeout(self.timeout)
+        self.job_retry = DEFAULT_JOB_RETRY.with_timeout(self.timeout)
+        self.job_config = bigquery.QueryJobConfig(job_timeout_ms=int(timeout * 1000) if timeout else None)
+
+        self.hedger = None
+        if settings.getboolean("BIGQUERY", "hedge", fallback=False):
+            from app.services.hedging import Hedger
+
+            self.hedger = Hedger(
+                "bigquery",
+                quantile=settings.getfloat("BIGQUERY", "hedge_quantile", fallback=0.95),
+                min_delay=settings.getfloat("BIGQUERY", "hedge_min_delay_seconds", fallback=0.25),
+                initial_delay=settings.getfloat("BIGQUERY", "hedge_initial_delay_seconds", fallback=2),
+                max_workers=settings.getint("BIGQUERY", "pool_maxsize", fallback=32),
+            )
+
+    def table(self, symbol):
+        """Return the table of a symbol: `table_<symbol>` if configured, else `table`."""
+        database = self.config["DATABASE"]
+        table = database.get(f"table_{symbol}", database["table"])
+        return f"{database['project_id']}.{database['dataset']}.{table}"
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        selected = ", ".join(columns) if columns else "*"
+        order = "ORDER BY TIMESTAMP(Open_time) ASC"
+        query = f"""
+          SELECT {selected}
+          FROM `{self.table(symbol)}`
+          WHERE TIMESTAMP(Open_time) BETWEEN TIMESTAMP('{start}') AND TIMESTAMP('{end}')
+          {order}
+          {f"LIMIT {int(limit)}" if limit else ""}
+          """
+        if lookback:
+            # The last `lookback` candles before the range. The scan is bounded to
+            # twice their nominal span so it stays small even with gaps in the data.
+            floor = start - 2 * lookback * self.interval
+            query = f"""
+          ({query})
+          UNION ALL
+          (
+            SELECT {selected}
+            FROM `{self.table(symbol)}`
+            WHERE TIMESTAMP(Open_time) >= TIMESTAMP('{floor}') AND TIMESTAMP(Open_time) < TIMESTAMP('{start}')
+            ORDER BY TIMESTAMP(Open_time) DESC
+            LIMIT {int(lookback)}
+          )
+          {order}
+          """
+        if self.hedger is not None:
+            return self.hedger.call(self._query, query)
+        started = time.perf_counter()
+        try:
+            return self._query(query)
+        finally:
+            metrics.BIGQUERY_QUERY_SECONDS.labels("bigquery").observe(time.perf_counter() - started)
+
+    def close(self):
+        if self.hedger is not None:
+            self.hedger.shutdown()
+        self.client.close()
+
+    def _query(self, query):
+        rows = self.client.query_and_wait(
+            query,
+            job_config=self.job_config,
+            api_timeout=self.timeout,
+            wait_timeout=self.timeout,
+            retry=self.retry,
+            job_retry=self.job_retry,
+        )
+        result = CandleResult(rows)
+        result.total_bytes_processed = rows.total_bytes_processed or 0
+        return result
+
+
+def _pooled_session(scopes):
+    """
+    Authorized HTTP session of the BigQuery client, with the pool of `[BIGQUERY]`.
+
+    Connections are kept alive between queries; `pool_maxsize` bounds the ones
+    open at once, which concurrent shards and hedges draw from.
+    """
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+
+    credentials, _ = google.auth.default(scopes=scopes)
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(
+        pool_connections=settings.getint("BIGQUERY", "pool_connections", fallback=4),
+        pool_maxsize=settings.getint("BIGQUERY", "pool_maxsize", fallback=32),
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+class LocalCandleClient(CandleClient):
+    """
+    Offline stand-in for BigQuery, for development boxes and load-test rigs.
+
+    Candles are either synthesized deterministically (the same symbol and open time
+    always produce the same candle, whatever range is asked for) or replayed from
+    `<symbol>.csv` / `<symbol>.parquet` files in a directory. CSV files may be raw
+    Binance kline exports or have a header with the `Columns` names.
+    """
+
+    def __init__(
+        self, source="synthetic", interval=timedelta(minutes=1), rows=0, latency=0.0, jitter=0.0, seed=0, row_latency=0.0
+    ):
+        """
+        Args:
+            source (str): "synthetic" or a directory of candle files.
+            interval (timedelta): Candle width of synthesized data.
+            rows (int): If set, every query returns exactly this many candles from
+                `start` on (synthetic) or at most this many (files).
+            latency (float): Seconds of delay injected into every query.
+            jitter (float): Extra uniformly random delay, in seconds.
+            seed (int): Seed of the synthetic price process.
+            row_latency (float): Seconds of delay per returned candle, like the
+                scan and download time of a BigQuery query.
+        """
+        self.source = source
+        self.interval = interval
+        self.rows = rows
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.row_latency = row_latency
+        self.queries = 0
+        self._frames = {}
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        self.queries += 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self.source == "synthetic":
+            first = -(-(start - datetime.min) // self.interval)
+            if self.rows:
+                count = self.rows
+            else:
+                count = max((end - datetime.min) // self.interval - first + 1, 0)
+            if limit:
+                count = min(count, limit)
+            first, count = first - lookback, count + lookback
+            result = CandleResult(synthesize_candles(symbol, first, count, self.interval, self.seed))
+        else:
+            frame = self._frame(symbol)
+            times = frame[Columns.OPEN_TIME.value]
+            lower = times.searchsorted(pd.Timestamp(start), side="left")
+            upper = times.searchsorted(pd.Timestamp(end), side="right")
+            if self.rows:
+                upper = min(upper, lower + self.rows)
+            if limit:
+                upper = min(upper, lower + limit)
+            lower = max(lower - lookback, 0)
+            if columns:
+                frame = frame[columns]
+            result = CandleResult(frame.iloc[lower:upper].to_dict(orient="records"))
+
+        if self.row_latency:
+            time.sleep(len(result) * self.row_latency)
+        result.total_bytes_processed = len(result) * len(columns or Columns) * 8
+        return result
+
+    def _frame(self, symbol):
+        if symbol not in self._frames:
+            self._frames[symbol] = read_candle_file(self.source, symbol)
+        return self._frames[symbol]
+
+
+def read_candle_file(directory, symbol):
+    """
+    Load the candles of a symbol from `<directory>/<symbol>.parquet` or `.csv`.
+
+    Args:
+        directory (str): Directory holding the candle files.
+        symbol (str): Lower-case pair name.
+
+    Returns:
+        pandas.DataFrame: Candles with the `Columns` names, sorted by `Open_time`.
+    """
+    parquet_path = os.path.join(directory, f"{symbol}.parquet")
+    csv_path = os.path.join(directory, f"{symbol}.csv")
+    if os.path.exists(parquet_path):
+        frame = pd.read_parquet(parquet_path)
+    elif os.path.exists(csv_path):
+        with open(csv_path) as file:
+            has_header = file.readline().startswith(Columns.OPEN_TIME.value)
+        if has_header:
+            frame = pd.read_csv(csv_path, parse_dates=[Columns.OPEN_TIME.value, Columns.CLOSE_TIME.value])
+        else:
+            frame = pd.read_csv(csv_path, header=None, names=BINANCE_KLINE_COLUMNS)
+            for column in (Columns.OPEN_TIME.value, Columns.CLOSE_TIME.value):
+                frame[column] = pd.to_datetime(frame[column], unit="ms")
+    else:
+        raise FileNotFoundError(f"No candle file for {symbol} in {directory}.")
+
+    frame = frame[[col.value for col in Columns]]
+    return frame.sort_values(Columns.OPEN_TIME.value, ignore_index=True)
+
+
+def _uniform(index, stream, seed):
+    # splitmix64 of (seed, stream, index): counter based, so any candle can be
+    # generated on its own without replaying the ones before it.
+    offset = ((seed * 0x9E37 + stream) * 0x9E3779B97F4A7C15) % (1 << 64)
+    x = index.astype(np.uint64) + np.uint64(offset)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _log_price(index, seed):
+    # Slow cycles give trends that indicators can follow, hashed noise gives ticks.
+    cycles = (
+        0.30 * np.sin(index / 43_200.0 + seed)
+        + 0.08 * np.sin(index / 4_320.0 + 2 * seed)
+        + 0.02 * np.sin(index / 360.0 + 3 * seed)
+    )
+    return np.log(30_000.0) + cycles + 0.002 * (_uniform(index, 0, seed) - 0.5)
+
+
+def synthesize_candles(symbol, first, count, interval=timedelta(minutes=1), seed=0):
+    """
+    Generate deterministic candles on a fixed time grid.
+
+    Args:
+        symbol (str): Pair name; each symbol gets its own price process.
+        first (int): Grid index of the first candle (multiples of `interval` since
+            `datetime.min`).
+        count (int): Number of candles.
+        interval (timedelta): Candle width.
+        seed (int): Seed of the price process.
+
+    Returns:
+        list: Row dictionaries shaped like the `rowsAdapter` output.
+    """
+    seed = seed + sum(symbol.encode())
+    index = np.arange(first, first + count, dtype=np.int64)
+    open_ = np.exp(_log_price(index - 1, seed))
+    close = np.exp(_log_price(index, seed))
+    high = np.maximum(open_, close) * (1 + 0.001 * _uniform(index, 1, seed))
+    low = np.minimum(open_, close) * (1 - 0.001 * _uniform(index, 2, seed))
+    volume = 1 + 20 * _uniform(index, 3, seed)
+    trades = (100 + 500 * _uniform(index, 4, seed)).astype(np.int64)
+    taker_share = 0.3 + 0.4 * _uniform(index, 5, seed)
+
+    origin = np.datetime64(datetime.min + first * interval, "us")
+    opens = origin + np.arange(count) * np.timedelta64(interval, "us")
+    closes = opens + np.timedelta64(interval - timedelta(milliseconds=1), "us")
+    columns = (
+        opens.tolist(),
+        open_.tolist(),
+        high.tolist(),
+        low.tolist(),
+        close.tolist(),
+        volume.tolist(),
+        closes.tolist(),
+        (volume * close).tolist(),
+        trades.tolist(),
+        (volume * taker_share).tolist(),
+        (volume * taker_share * close).tolist(),
+    )
+    names = [col.value for col in Columns]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def create_candle_client(cache=True):
+    """
+    Build the candle client selected by `[CANDLES] backend` in api_config.cfg.
+
+    Args:
+        cache (bool): Put the client behind the cache of `[CANDLE_CACHE]`, if enabled.
+            Jobs filling caches or stores read the source directly.
+
+    Returns:
+        CandleClient: BigQuery by default, the local stand-in with `backend = local`,
+        split into concurrent monthly queries past `shard_threshold_days`, and
+        behind a CandleCache (or the SharedCandleCache of `shared_directory`) when
+        `[CANDLE_CACHE] enabled` is set.
+    """
+    backend = settings.get("CANDLES", "backend", fallback="bigquery")
+    if backend == "bigquery":
+        client = BigQueryCandleClient()
+    elif backend == "local":
+        client = LocalCandleClient(
+            source=settings.get("LOCAL_CANDLES", "source", fallback="synthetic"),
+            interval=candle_interval(),
+            rows=settings.getint("LOCAL_CANDLES", "rows", fallback=0),
+            latency=settings.getfloat("LOCAL_CANDLES", "latency_ms", fallback=0) / 1000,
+            jitter=settings.getfloat("LOCAL_CANDLES", "jitter_ms", fallback=0) / 1000,
+            seed=settings.getint("LOCAL_CANDLES", "seed", fallback=0),
+            row_latency=settings.getfloat("LOCAL_CANDLES", "row_latency_us", fallback=0) / 1_000_000,
+        )
+    else:
+        raise ValueError(f"Unknown candle backend {backend!r}, expected 'bigquery' or 'local'.")
+
+    shard_threshold = settings.getfloat("CANDLES", "shard_threshold_days", fallback=0)
+    if shard_threshold:
+        from app.services.sharded_fetch import ShardedCandleClient
+
+        client = ShardedCandleClient(
+            client,
+            threshold=timedelta(days=shard_threshold),
+            parallelism=settings.getint("CANDLES", "shard_parallelism", fallback=8),
+        )
+
+    if not cache or not settings.getboolean("CANDLE_CACHE", "enabled", fallback=False):
+        return client
+    shared_directory = settings.get("CANDLE_CACHE", "shared_directory", fallback="")
+    if shared_directory:
+        from app.services.shared_candles import SharedCandleCache
+
+        return SharedCandleCache(
+            client,
+            shared_directory,
+            max_staleness=timedelta(seconds=settings.getfloat("CANDLE_CACHE", "max_staleness_seconds", fallback=60)),
+            settle_margin=settle_margin(),
+        )
+
+    from app.services.candle_cache import CandleCache
+
+    return CandleCache(
+        client,
+        max_rows=settings.getint("CANDLE_CACHE", "max_rows", fallback=1_000_000),
+        max_window=settings.getint("CANDLE_CACHE", "max_window", fallback=512),
+        settle_margin=settle_margin(),
+    )
+
+
+def candle_interval():
+    """Width of the candles of the configured backend."""
+    if settings.get("CANDLES", "backend", fallback="bigquery") == "local":
+        return timedelta(seconds=settings.getint("LOCAL_CANDLES", "interval_seconds", fallback=60))
+    database = load_config("database_config.cfg", required=False)
+    return timedelta(seconds=database.getint("DATABASE", "interval_seconds", fallback=60))
+
+
+def settle_margin():
+    """Time before the newest candle of the source within which candles may still be missing."""
+    return timedelta(seconds=settings.getfloat("CANDLE_CACHE", "settle_seconds", fallback=120))
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from app.utils import Columns, naive_utc
+
+OPEN_TIME = Columns.OPEN_TIME.value
+CLOSE_TIME = Columns.CLOSE_TIME.value
+
+# `decimals` key applying to every column not named on its own.
+ALL_COLUMNS = "*"
+
+
+def encode_compact(rows, decimals=None):
+    """
+    Column-oriented form of response rows, with the open times as a grid.
+
+    Candles sit on a fixed grid, so the open times are sent as the first one,
+    the grid step and the places where candles are missing:
+
+        {"time": {"start": "2024-01-01T00:00:00", "interval": 60000, "count": 3,
+                  "gaps": [[2, 5]], "close_offset": 59999},
+         "columns": {"Close": [42000.5, 42001.0, 41998.25], ...}}
+
+    `interval` and the offsets are milliseconds. Row `i` opens at `start` plus
+    `(i + missing) * interval`, where `missing` sums the `[index, missing]`
+    gaps with `index <= i`. When the gaps would take more room (e.g. after
+    downsampling thinned the grid), the open times are sent as `offsets` from
+    `start` instead of `interval` and `gaps`. `close_offset` is the constant distance
+    from open to close time, `close_offsets` one per row when it varies. Both
+    forms restore the times exactly; times with sub-millisecond parts, which
+    candles do not have, are kept as ISO-8601 columns and `time` is null.
+
+    Args:
+        rows (list): Response rows sorted by `Open_time`, all with the same columns.
+        decimals (dict): Decimal places per column name; `ALL_COLUMNS` applies to
+            the other float columns. Integer columns are left as they are.
+
+    Returns:
+        dict: {"time": ..., "columns": {column: [value, ...]}}, NaN written as None.
+    """
+    names = list(rows[0]) if rows else []
+    decimals = decimals or {}
+    time, columns = None, {}
+    if OPEN_TIME in names:
+        time = _time_axis(rows)
+        if time is None:
+            columns[OPEN_TIME] = [row[OPEN_TIME] for row in rows]
+            if CLOSE_TIME in names:
+                columns[CLOSE_TIME] = [row[CLOSE_TIME] for row in rows]
+
+    for name in names:
+        if name not in (OPEN_TIME, CLOSE_TIME):
+            columns[name] = _column(rows, name, decimals)
+    return {"time": time, "columns": columns}
+
+
+def round_rows(rows, decimals):
+    """Round the float columns of response rows, see `encode_compact`; NaN written as None."""
+    if not rows:
+        return rows
+    names = list(rows[0])
+    columns = [_column(rows, name, decimals) for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _column(rows, name, decimals):
+    values = [row[name] for row in rows]
+    digits = decimals.get(name, decimals.get(ALL_COLUMNS))
+    if digits is not None and any(isinstance(value, float) for value in values):
+        array = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        values = np.round(array, digits).tolist()
+    # NaN is not valid JSON.
+    return [None if value != value else value for value in values]
+
+
+def _time_axis(rows):
+    opens = _milliseconds([row[OPEN_TIME] for row in rows])
+    closes = _milliseconds([row[CLOSE_TIME] for row in rows]) if CLOSE_TIME in rows[0] else None
+    if opens is None or (CLOSE_TIME in rows[0] and closes is None):
+        return None
+
+    start = naive_utc(rows[0][OPEN_TIME])
+    time = {"start": start.isoformat(), "count": len(opens)}
+    steps = np.diff(opens)
+    interval = int(np.gcd.reduce(steps)) if len(steps) else 0
+    gaps = np.flatnonzero(steps != interval) if interval else []
+    if (steps > 0).all() and len(gaps) <= len(opens) // 2:
+        time["interval"] = interval or None
+        time["gaps"] = [[int(index) + 1, int(steps[index] // interval) - 1] for index in gaps]
+    else:
+        time["offsets"] = (opens - opens[0]).tolist()
+
+    if closes is not None:
+        close_offsets = closes - opens
+        if (close_offsets == close_offsets[0]).all():
+            time["close_offset"] = int(close_offsets[0])
+        else:
+            time["close_offsets"] = close_offsets.tolist()
+    return time
+
+
+def _milliseconds(times):
+    """Epoch milliseconds of naive-UTC or aware datetimes, None if any has finer parts."""
+    nanos = pd.to_datetime(times, utc=True).tz_convert(None).to_numpy("datetime64[ns]").astype(np.int64)
+    if (nanos % 1_000_000).any():
+        return None
+    return nanos // 1_000_000
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from app.utils import Columns
+
+OPEN_TIME = Columns.OPEN_TIME.value
+CLOSE = Columns.CLOSE.value
+
+METRICS = ("corr", "beta", "ratio", "zscore")
+
+
+def align(series):
+    """
+    Align the closes of several symbols on the open times they all have.
+
+    Args:
+        series (dict): Rows (with Open_time and Close, sorted) per symbol.
+
+    Returns:
+        tuple: Shared open times (naive UTC datetime64[ns]) and a
+        (symbols × times) float64 array of closes, in the order of `series`.
+    """
+    times = {
+        symbol: pd.to_datetime([row[OPEN_TIME] for row in rows], utc=True).tz_convert(None).to_numpy()
+        for symbol, rows in series.items()
+    }
+    common = None
+    for values in times.values():
+        common = values if common is None else np.intersect1d(common, values, assume_unique=True)
+    closes = np.empty((len(series), len(common)))
+    for i, (symbol, rows) in enumerate(series.items()):
+        positions = np.searchsorted(times[symbol], common)
+        values = np.fromiter((row[CLOSE] for row in rows), dtype=np.float64, count=len(rows))
+        closes[i] = values[positions]
+    return common, closes
+
+
+def cross_asset(times, closes, symbols, base, windows, metrics=METRICS):
+    """
+    Rolling co-movement of every symbol against a base symbol.
+
+    Computed for all symbols and windows at once from cumulative sums over the
+    (symbols × times) arrays: one pass builds the sums, every window is a
+    difference of two slices of them. Sums are taken over values centered on
+    their mean, so the differences keep their precision over long histories.
+
+    - corr, beta: Pearson correlation and beta (cov / var of the base) of the
+      log returns over the last `window` candles.
+    - ratio: close of the symbol over the close of the base.
+    - zscore: distance of the log spread (log close - log base close) from its
+      `window`-candle mean, in `window`-candle standard deviations.
+
+    Args:
+        times (numpy.ndarray): Open times, see `align`.
+        closes (numpy.ndarray): (symbols × times) closes, see `align`.
+        symbols (list[str]): Symbols of the rows of `closes`.
+        base (str): Symbol the others are measured against.
+        windows (list[int]): Window lengths, in candles (at least 2).
+        metrics (tuple): Subset of `METRICS`.
+
+    Returns:
+        dict: Output column name (e.g. "CORR_ETHUSDT_60", "RATIO_ETHUSDT") to a
+        float64 array over `times`, NaN where the window is not yet full.
+    """
+    if not len(times):
+        return {}
+    b = symbols.index(base)
+    others = [i for i in range(len(symbols)) if i != b]
+    names = [symbols[i].upper() for i in others]
+    columns = {}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(closes)
+        if "corr" in metrics or "beta" in metrics:
+            returns = np.diff(logs, axis=1)
+            returns -= np.nanmean(returns, axis=1, keepdims=True) if returns.shape[1] else 0
+            x, y = returns[others], returns[b]
+            sums = _cumulative(np.vstack([x, x * x, x * y, y[None], (y * y)[None]]))
+            k = len(others)
+            for window in windows:
+                # Returns start at the second candle: shift the window sums by one.
+                s = _shift(_window(sums, window), 1)
+                sx, sxx, sxy, sy, syy = s[:k], s[k:2 * k], s[2 * k:3 * k], s[3 * k], s[3 * k + 1]
+                cov = sxy - sx * sy / window
+                var_x = np.maximum(sxx - sx * sx / window, 0)
+                var_y = np.maximum(syy - sy * sy / window, 0)
+                if "corr" in metrics:
+                    _put(columns, "CORR", names, window, cov / np.sqrt(var_x * var_y))
+                if "beta" in metrics:
+                    _put(columns, "BETA", names, window, cov / var_y)
+
+        if "ratio" in metrics:
+            _put(columns, "RATIO", names, None, closes[others] / closes[b])
+
+        if "zscore" in metrics:
+            spread = logs[others] - logs[b]
+            spread_mean = np.nanmean(spread, axis=1, keepdims=True) if spread.shape[1] else 0
+            centered = spread - spread_mean
+            sums = _cumulative(np.vstack([centered, centered * centered]))
+            k = len(others)
+            for window in windows:
+                s = _window(sums, window)
+                mean = s[:k] / window
+                variance = np.maximum(s[k:] - s[:k] * mean, 0) / (window - 1)
+                _put(columns, "ZSCORE", names, window, (centered - mean) / np.sqrt(variance))
+
+    for name, values in columns.items():
+        values[~np.isfinite(values)] = np.nan
+    return columns
+
+
+def to_rows(times, columns, start):
+    """
+    Build response rows from the open time `start` on.
+
+    Returns:
+        list: {"Open_time": datetime, <column>: float or None, ...} dictionaries.
+    """
+    first = int(np.searchsorted(times, np.datetime64(start, "ns")))
+    names = [OPEN_TIME, *columns]
+    values = [times[first:].astype("datetime64[us]").tolist()]
+    for array in columns.values():
+        # NaN is not valid JSON.
+        values.append([None if value != value else value for value in array[first:].tolist()])
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _cumulative(values):
+    # Leading zero column: window sums are differences of two slices.
+    sums = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=sums[:, 1:])
+    return sums
+
+
+def _window(sums, window):
+    """Sums of the last `window` values at every position, NaN before the first full window."""
+    count = sums.shape[1] - 1
+    result = np.full((sums.shape[0], count), np.nan)
+    if count >= window:
+        result[:, window - 1:] = sums[:, window:] - sums[:, :-window]
+    return result
+
+
+def _shift(values, periods):
+    result = np.full((values.shape[0], values.shape[1] + periods), np.nan)
+    result[:, periods:] = values
+    return result
+
+
+def _put(columns, metric, names, window, values):
+    for name, row in zip(names, values):
+        columns[f"{metric}_{name}" + (f"_{window}" if window else "")] = row
@@ -0,0 +1,97 @@
+import numpy as np
+
+from app.utils import Columns
+
+HIGH, LOW, CLOSE, VOLUME = (col.value for col in (Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME))
+
+
+def apply(key, rows, first, fill_value, state=None):
+    """
+    Add the columns of a running-total indicator to rows, anchored at `first`.
+
+    OBV, the A/D Line and VWAP sum over every candle since their start, so they
+    are counted from the row at position `first` (the start of the range) on,
+    whatever warm-up candles other indicators fetched before it; those rows get
+    NaN. `state` continues the totals of the candles before the anchor, e.g. of
+    a previous page: the result is then the same as over one longer range.
+
+    Totals are summed one candle after the other from the state, so a range
+    split anywhere gives exactly the values of the whole range. Missing values
+    are skipped, like `Series.cumsum`.
+
+    Args:
+        key (str): "obv", "al" or "vwap".
+        rows (list): Rows sorted by `Open_time`, with the indicator's inputs.
+        first (int): Position of the anchor row.
+        fill_value: Value of cells that cannot be computed; None keeps NaN.
+        state (dict, optional): Totals before the anchor, see `state_at`.
+
+    Returns:
+        tuple: The same rows with the indicator columns, and the running totals
+        of the rows from `first` on (for `state_at`).
+    """
+    anchored = rows[first:]
+    inputs = {
+        column: np.fromiter((row[column] for row in anchored), dtype=np.float64, count=len(anchored))
+        for column in (HIGH, LOW, CLOSE, VOLUME) if not anchored or column in anchored[0]
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns, totals = KERNELS[key](inputs, state or {})
+    for column, values in columns.items():
+        values = np.where(np.isfinite(values), values, np.nan)
+        if fill_value is not None:
+            values = np.nan_to_num(values, nan=fill_value)
+        warm_up = np.nan if fill_value is None else fill_value
+        for row in rows[:first]:
+            row[column] = warm_up
+        for row, value in zip(anchored, values.tolist()):
+            row[column] = value
+    return rows, totals
+
+
+def state_at(totals, position):
+    """Running totals after the row at `position` (counted from the anchor), to continue from."""
+    return {name: float(values[position]) for name, values in totals.items()}
+
+
+def _running(values, start):
+    """Running sum from `start`, skipping missing values; returns the cells (NaN where missing) and the totals."""
+    missing = ~np.isfinite(values)
+    totals = np.cumsum(np.concatenate(([start], np.where(missing, 0.0, values))))[1:]
+    return np.where(missing, np.nan, totals), totals
+
+
+def _obv(c, state):
+    close, volume = c[CLOSE], c[VOLUME]
+    # The first candle of a fresh range has no previous close: OBV starts at 0.
+    previous = np.concatenate(([state.get(CLOSE, close[0] if len(close) else np.nan)], close[:-1]))
+    delta = close - previous
+    line, totals = _running(np.where(delta > 0, volume, np.where(delta < 0, -volume, 0.0)), state.get("OBV", 0.0))
+    return {"OBV": line}, {"OBV": totals, CLOSE: close}
+
+
+def _al(c, state):
+    high, low, close = c[HIGH], c[LOW], c[CLOSE]
+    money_flow = ((close - low) - (high - close)) / (high - low) * c[VOLUME]
+    line, totals = _running(money_flow, state.get("AD_Line", 0.0))
+    return {"AD_Line": line}, {"AD_Line": totals}
+
+
+def _vwap(c, state):
+    typical = (c[HIGH] + c[LOW] + c[CLOSE]) / 3
+    tp_volume, tp_volume_totals = _running(typical * c[VOLUME], state.get("Cumulative_TP_Volume", 0.0))
+    volume, volume_totals = _running(c[VOLUME], state.get("Cumulative_Volume", 0.0))
+    columns = {
+        "Typical_Price": typical,
+        "Cumulative_TP_Volume": tp_volume,
+        "Cumulative_Volume": volume,
+        "VWAP": tp_volume / volume,
+    }
+    return columns, {"Cumulative_TP_Volume": tp_volume_totals, "Cumulative_Volume": volume_totals}
+
+
+KERNELS = {
+    "obv": _obv,
+    "al": _al,
+    "vwap": _vwap,
+}
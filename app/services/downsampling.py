@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from app.utils import Columns
+
+OHLC = {Columns.OPEN.value, Columns.HIGH.value, Columns.LOW.value, Columns.CLOSE.value}
+
+# How a bucket of candles is merged into one wider candle; indicator columns take
+# their value at the bucket's last candle, like Close.
+_FIRST = {Columns.OPEN_TIME.value, Columns.OPEN.value}
+_MAX = {Columns.HIGH.value}
+_MIN = {Columns.LOW.value}
+_SUM = {
+    Columns.VOLUME.value,
+    Columns.QUOTE_ASSET_VOLUME.value,
+    Columns.NUMBER_OF_TRADES.value,
+    Columns.TAKER_BUY_BASE_ASSET_VOLUME.value,
+    Columns.TAKER_BUY_QUOTE_ASSET_VOLUME.value,
+}
+
+
+def downsample(rows, max_points):
+    """
+    Reduce a computed series to at most `max_points` rows for charting.
+
+    Rows carrying all of Open/High/Low/Close are merged into `max_points` wider
+    candles (first open, highest high, lowest low, last close, summed volumes), so
+    no wick disappears. Other rows are thinned with Largest-Triangle-Three-Buckets
+    on Close, or on the first indicator column if Close was not requested.
+
+    Args:
+        rows (list): Rows sorted by `Open_time`, all with the same columns.
+        max_points (int): Maximum number of rows returned (at least 3).
+
+    Returns:
+        list: The downsampled rows.
+    """
+    if len(rows) <= max_points:
+        return rows
+    columns = list(rows[0])
+    if OHLC <= set(columns):
+        return _merge_buckets(pd.DataFrame(rows), max_points)
+
+    reference = Columns.CLOSE.value if Columns.CLOSE.value in columns else next(
+        (column for column in columns if isinstance(rows[0][column], (int, float))), None
+    )
+    if reference is None:
+        return rows[::-(-len(rows) // max_points)]
+    values = np.fromiter((row[reference] for row in rows), dtype=np.float64, count=len(rows))
+    return [rows[index] for index in lttb_indices(values, max_points)]
+
+
+def lttb_indices(values, threshold):
+    """
+    Pick the indices of `threshold` points that keep the shape of a line.
+
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013) on evenly spaced points: the
+    first and last points are kept, and every bucket in between contributes the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket. Bucket averages are computed up front from
+    cumulative sums; each bucket then costs one vectorized argmax.
+
+    Args:
+        values (numpy.ndarray): Series to reduce; NaN counts as 0.
+        threshold (int): Number of points to keep (at least 3).
+
+    Returns:
+        numpy.ndarray: Sorted indices into `values`.
+    """
+    count = len(values)
+    if threshold >= count:
+        return np.arange(count)
+    values = np.nan_to_num(values)
+    positions = np.arange(count, dtype=np.float64)
+
+    # threshold - 2 buckets over the inner points, each holding at least one.
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    sizes = np.diff(edges)
+    means = (sums[edges[1:]] - sums[edges[:-1]]) / sizes
+    centres = (edges[:-1] + edges[1:] - 1) / 2
+    # The last bucket looks ahead to the final point.
+    next_x = np.append(centres[1:], count - 1)
+    next_y = np.append(means[1:], values[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        lower, upper = edges[bucket], edges[bucket + 1]
+        ax, ay = positions[previous], values[previous]
+        areas = np.abs(
+            (ax - next_x[bucket]) * (values[lower:upper] - ay)
+            - (ax - positions[lower:upper]) * (next_y[bucket] - ay)
+        )
+        previous = lower + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def _merge_buckets(frame, buckets):
+    count = len(frame)
+    labels = np.arange(count) * buckets // count
+    starts = np.flatnonzero(np.diff(labels, prepend=-1))
+    ends = np.append(starts[1:], count) - 1
+
+    # Positional first/last so NaN cells are kept as they are.
+    merged = frame.iloc[ends].reset_index(drop=True)
+    grouped = frame.groupby(labels, sort=True)
+    for column in frame.columns:
+        if column in _FIRST:
+            merged[column] = frame[column].iloc[starts].to_numpy()
+        elif column in _MAX:
+            merged[column] = grouped[column].max().to_numpy()
+        elif column in _MIN:
+            merged[column] = grouped[column].min().to_numpy()
+        elif column in _SUM:
+            merged[column] = grouped[column].sum().to_numpy()
+    return merged.to_dict(orient="records")
@@ -0,0 +1,164 @@
+from bisect import bisect_left, bisect_right
+
+from app.services import indicator_engines, indicator_registry, metrics
+from app.services.resources import resources
+from app.services.rows_adapter import transform_query_job as rowsAdapter
+from app.utils import Columns, naive_utc
+
+OPEN_TIME = Columns.OPEN_TIME.value
+
+
+def enrich_candles(symbol, start, end, calls, output_columns, timer, fill_value=0, limit=None, engine=None, state=None):
+    """
+    Query the candles of a range and add the requested indicators to them.
+
+    Indicators precomputed in the materialized store for the whole range are read
+    from it; the others are computed, the query reaching back by their longest
+    lookback so their values are valid from `start` on (those warm-up candles are
+    dropped again), from the range index of a CandleCache when the candles come
+    from one. Indicators that read later candles (the Chikou Span) get them
+    fetched past the last row as well. Running totals (OBV, A/D Line, VWAP) count from `start`, or go on
+    from `state` when the range continues an earlier one. With a `limit`, one
+    extra candle is fetched to tell whether more candles follow. Blocking.
+
+    Args:
+        symbol (str): Lower-case pair name.
+        start (datetime): First open time (naive UTC).
+        end (datetime): Last open time (naive UTC).
+        calls (list): (Indicator, args) pairs from `indicator_registry.parse_requested`.
+        output_columns (list[str]): Candle columns to keep next to the indicators.
+        timer (StageTimer): Timer of the request's stages.
+        fill_value: Value of cells that cannot be computed; None keeps NaN.
+        limit (int, optional): Maximum number of candles returned.
+        engine (str, optional): Indicator engine, see `indicator_engines`.
+        state (dict, optional): Running totals at the end of the previous range,
+            as returned for it.
+
+    Returns:
+        tuple: The rows, the open time of the last of them and that of the first
+        candle past `limit` (None when there is none), and the running totals
+        after the last row, keyed by indicator (the given `state` when there are
+        no rows). The open times are given whether or not `Open_time` is among
+        `output_columns`.
+    """
+    store = resources.indicator_store()
+    stored_calls = []
+    if store is not None and calls:
+        with timer.stage("materialized"):
+            stored_columns = store.columns(symbol)
+            # Running totals depend on where the range starts: never read from the store.
+            stored_calls = [
+                (indicator, args) for indicator, args in calls
+                if not indicator.cumulative and set(indicator.outputs(*args)) <= stored_columns
+            ]
+            if stored_calls and not store.covers(symbol, start, end):
+                stored_calls = []
+    computed_calls = [call for call in calls if call not in stored_calls]
+
+    needed = set(output_columns) | {col.value for col in indicator_registry.required_columns(computed_calls)}
+    fetch_columns = [col.value for col in Columns if col == Columns.OPEN_TIME or col.value in needed]
+    lookback = indicator_registry.max_lookback(computed_calls)
+    lookahead = indicator_registry.max_lookahead(computed_calls)
+    fetch_end = end
+    if lookahead:
+        from app.services.candle_clients import candle_interval
+
+        # Twice the nominal span of the look-ahead candles, for gaps in the data.
+        fetch_end = end + 2 * lookahead * candle_interval()
+
+    rows, results = fetch_rows(
+        symbol, start, fetch_end, fetch_columns, lookback, timer, limit + 1 + lookahead if limit else None
+    )
+
+    calculate_indicators = indicator_engines.create_calculator(engine, fill_value)
+
+    # Candles served by a CandleCache come with its range index: window
+    # indicators are read from it instead of being computed with pandas. Calls
+    # run in order either way, so the columns come out in the same order.
+    from app.services import cumulative, range_index
+
+    index_span = getattr(results, "index_span", None)
+    # Running totals start at `start`, whatever warm-up the other calls fetched.
+    first = first_index(rows, start) if lookback else 0
+    state = state or {}
+    totals = {}
+
+    for indicator, args in computed_calls if rows else ():
+        with timer.indicator(indicator.key):
+            if indicator.cumulative:
+                rows, totals[indicator.key] = cumulative.apply(
+                    indicator.key, rows, first, fill_value, state.get(indicator.key)
+                )
+            elif index_span is not None and range_index.supports(index_span[0], indicator.key, args):
+                rows = range_index.apply(index_span[0], indicator.key, args, rows, index_span[1], fill_value)
+            else:
+                rows = indicator.apply(calculate_indicators, args, rows)
+
+    rows = rows[first:]
+    if lookahead:
+        rows = rows[:end_index(rows, end)]
+    next_candle = None
+    if limit and len(rows) > limit:
+        next_candle = rows[limit][OPEN_TIME]
+        rows = rows[:limit]
+    latest_candle = None
+    if rows:
+        latest_candle = rows[-1][OPEN_TIME]
+        state = {key: cumulative.state_at(values, len(rows) - 1) for key, values in totals.items()}
+
+    if stored_calls and rows:
+        with timer.stage("materialized"):
+            columns = [column for indicator, args in stored_calls for column in indicator.outputs(*args)]
+            rows = store.attach(symbol, rows, columns, fill_value)
+            # Stored columns come last: move them to their call's place, so the
+            # columns do not depend on whether the store covers the range.
+            rows = _in_call_order(rows, calls)
+
+    # Filter columns
+    columns_to_drop = [column for column in fetch_columns if column not in output_columns]
+    if rows and columns_to_drop:
+        with timer.stage("columns"):
+            rows = calculate_indicators.drop_column(columns_to_drop, rows)
+
+    return rows, latest_candle, next_candle, state
+
+
+def _in_call_order(rows, calls):
+    """Rows with the candle columns first, then the indicator columns in the order of `calls`."""
+    outputs = list(dict.fromkeys(column for indicator, args in calls for column in indicator.outputs(*args)))
+    names = [name for name in rows[0] if name not in set(outputs)] + outputs
+    return [{name: row[name] for name in names} for row in rows]
+
+
+def fetch_rows(symbol, start, end, columns, lookback, timer, limit=None):
+    """
+    Fetch candles from the process-wide candle client as row dictionaries.
+
+    Args:
+        columns (list[str]): Columns to fetch and keep.
+        lookback (int): Candles before `start` to include for warm-up.
+        timer (StageTimer): Timer of the request's stages.
+        limit (int, optional): Maximum number of candles from `start` on.
+
+    Returns:
+        tuple: The rows, sorted by open time, and the client's result (which may
+        carry an `index_span`).
+    """
+    with timer.stage("bigquery"):
+        results = resources.candle_client().fetch_candles(symbol, start, end, columns, lookback, limit)
+    # Result pages are downloaded lazily, so this stage includes the transfer.
+    with timer.stage("rows_adapter"):
+        rows = rowsAdapter(results, columns)
+    metrics.ROWS_PROCESSED.observe(len(rows))
+    metrics.BIGQUERY_BYTES_SCANNED.inc(getattr(results, "total_bytes_processed", None) or 0)
+    return rows, results
+
+
+def first_index(rows, start):
+    """Return the index of the first row opened at or after `start`."""
+    return bisect_left(rows, start, key=lambda row: naive_utc(row[OPEN_TIME]))
+
+
+def end_index(rows, end):
+    """Return the index past the last row opened at or before `end`."""
+    return bisect_right(rows, end, key=lambda row: naive_utc(row[OPEN_TIME]))
@@ -0,0 +1,369 @@
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from app import debug_logger
+from app.services import metrics
+from app.utils import Columns
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+FORMATS = ("parquet", "csv")
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+OPEN_TIME = Columns.OPEN_TIME.value
+SYMBOL = "Symbol"
+JOB_ID = re.compile(r"[0-9a-f]{16}")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportJob:
+    """
+    One export: its request, its state and its progress.
+
+    Its range is processed in chunks of `chunk` candles' time, one symbol
+    after the other; `progress` is the share of chunks written. Jobs read back
+    from their record (`from_record`) have no `calls` or `chunks`.
+    """
+
+    def __init__(self, symbols, start, end, calls, output_columns, format, chunk):
+        self.id = uuid.uuid4().hex[:16]
+        self.symbols = symbols
+        self.start = start
+        self.end = end
+        self.calls = calls
+        self.indicators = [
+            f"{indicator.key}:{','.join(map(str, args))}" if args else indicator.key for indicator, args in calls
+        ]
+        self.output_columns = output_columns
+        self.format = format
+        self.chunks = _chunks(start, end, chunk)
+        self.chunks_total = len(self.chunks) * len(symbols)
+        self.status = QUEUED
+        self.error = None
+        self.rows = 0
+        self.chunks_done = 0
+        self.path = None
+        self.size = None
+        self.created = datetime.now(timezone.utc)
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "symbols": self.symbols,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "indicators": self.indicators,
+            "format": self.format,
+            "progress": round(self.chunks_done / self.chunks_total, 4) if self.chunks_total else 1.0,
+            "chunks_done": self.chunks_done,
+            "chunks_total": self.chunks_total,
+            "rows": self.rows,
+            "size": self.size,
+            "error": self.error,
+            "created": self.created.isoformat(),
+            "started": self.started.isoformat() if self.started else None,
+            "finished": self.finished.isoformat() if self.finished else None,
+        }
+
+    def record(self):
+        """The summary and the file path, as saved next to the file."""
+        return {**self.summary(), "path": self.path}
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a job, as another process saved it, from its record."""
+        job = cls.__new__(cls)
+        job.id, job.status, job.symbols, job.format = record["id"], record["status"], record["symbols"], record["format"]
+        job.start, job.end = datetime.fromisoformat(record["start"]), datetime.fromisoformat(record["end"])
+        job.calls, job.chunks, job.output_columns = None, None, None
+        job.indicators = record["indicators"]
+        job.chunks_done, job.chunks_total = record["chunks_done"], record["chunks_total"]
+        job.rows, job.size, job.error, job.path = record["rows"], record["size"], record["error"], record["path"]
+        job.created, job.started, job.finished = (
+            datetime.fromisoformat(record[name]) if record[name] else None for name in ("created", "started", "finished")
+        )
+        job.cancel_event = threading.Event()
+        return job
+
+
+class ExportManager:
+    """
+    Background exports of enriched candles to Parquet or CSV files on local disk.
+
+    At most `workers` exports run at once, each in its own thread; at most
+    `max_pending` wait behind them. An export fetches and enriches one chunk at
+    a time, with the warm-up candles of its indicators, and appends it to the
+    file, so its memory stays that of one chunk whatever the range. Files are
+    written under a temporary name and renamed when complete. Finished exports
+    and their files are forgotten after `retention`.
+
+    Every job is saved as `<id>.json` next to its file whenever it changes, so
+    the API workers sharing `directory` all see each other's exports: they read
+    the jobs they do not run from there, and cancel them with an `<id>.cancel`
+    marker that the running worker checks between chunks.
+    """
+
+    def __init__(self, directory, workers=2, max_pending=16, chunk=timedelta(days=30), retention=timedelta(hours=24)):
+        self.directory = directory
+        self.workers = workers
+        self.max_pending = max_pending
+        self.chunk = chunk
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="export")
+
+    def submit(self, symbols, start, end, calls, output_columns, format):
+        """
+        Queue an export.
+
+        Returns:
+            ExportJob: The queued job.
+
+        Raises:
+            OverflowError: If `max_pending` exports are waiting already.
+        """
+        self._expire()
+        job = ExportJob(symbols, start, end, calls, output_columns, format, self.chunk)
+        with self._lock:
+            pending = sum(1 for other in self._jobs.values() if other.status == QUEUED)
+            if pending >= self.max_pending:
+                raise OverflowError(f"{pending} exports are waiting already; retry later.")
+            self._jobs[job.id] = job
+        self._save(job)
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """The job, from its record if another worker runs it; None if unknown."""
+        return self._jobs.get(job_id) or self._load(job_id)
+
+    def list(self):
+        """Summaries of the known exports, newest first."""
+        self._expire()
+        jobs = [self.get(name[:-len(".json")]) for name in _listdir(self.directory) if name.endswith(".json")]
+        return [job.summary() for job in sorted(filter(None, jobs), key=lambda job: job.created, reverse=True)]
+
+    def cancel(self, job_id):
+        """
+        Cancel an export, or delete the file of a finished one.
+
+        Returns:
+            ExportJob: The job, None if unknown.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if job.status in FINISHED:
+            self._forget(job)
+            return job
+        job.cancel_event.set()
+        if job_id not in self._jobs:
+            # Run by another worker: it stops at its next chunk.
+            with open(self._path(job_id, "cancel"), "w"):
+                pass
+        elif job.status == QUEUED:
+            self._finish(job, CANCELLED)
+        return job
+
+    def close(self):
+        for job in list(self._jobs.values()):
+            job.cancel_event.set()
+            if job.status == QUEUED:
+                # Its run is dropped with the pool: record it as cancelled.
+                self._finish(job, CANCELLED)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job):
+        if job.status in FINISHED:
+            return
+        if self._cancelled(job):
+            self._finish(job, CANCELLED)
+            return
+        job.status, job.started = RUNNING, datetime.now(timezone.utc)
+        self._save(job)
+        path = self._path(job.id, job.format)
+        started = time.perf_counter()
+        try:
+            with _Writer(path + ".part", job.format) as writer:
+                for symbol in job.symbols:
+                    # Running totals (OBV, A/D Line, VWAP) go on across chunks.
+                    state = None
+                    for chunk_start, chunk_end in job.chunks:
+                        if self._cancelled(job):
+                            raise ExportCancelled()
+                        rows, state = _enrich(symbol, chunk_start, chunk_end, job, state)
+                        if len(job.symbols) > 1:
+                            for row in rows:
+                                row[SYMBOL] = symbol
+                        writer.write(rows)
+                        job.rows += len(rows)
+                        job.chunks_done += 1
+                        self._save(job)
+            os.replace(path + ".part", path)
+        except ExportCancelled:
+            _remove(path + ".part")
+            self._finish(job, CANCELLED)
+        except Exception as exc:
+            debug_logger.exception(f"Export {job.id} failed.")
+            _remove(path + ".part")
+            job.error = str(exc) or type(exc).__name__
+            self._finish(job, FAILED)
+        else:
+            job.path, job.size = path, os.path.getsize(path)
+            self._finish(job, SUCCEEDED)
+        metrics.EXPORT_SECONDS.labels(job.format).observe(time.perf_counter() - started)
+
+    def _finish(self, job, status):
+        job.status, job.finished = status, datetime.now(timezone.utc)
+        self._save(job)
+        # From now on its record is the job, for this worker as for the others.
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        _remove(self._path(job.id, "cancel"))
+        metrics.EXPORTS.labels(status).inc()
+
+    def _cancelled(self, job):
+        return job.cancel_event.is_set() or os.path.exists(self._path(job.id, "cancel"))
+
+    def _expire(self):
+        limit = datetime.now(timezone.utc) - self.retention
+        for name in _listdir(self.directory):
+            job = self.get(name[:-len(".json")]) if name.endswith(".json") else None
+            if job is not None and job.finished and job.finished < limit:
+                self._forget(job)
+
+    def _forget(self, job):
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        _remove(job.path)
+        _remove(self._path(job.id, "json"))
+
+    def _path(self, job_id, extension):
+        return os.path.join(self.directory, f"{job_id}.{extension}")
+
+    def _save(self, job):
+        # Written whole under another name, then renamed: readers never see half a record.
+        path = self._path(job.id, "json")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", "w") as file:
+                json.dump(job.record(), file)
+            os.replace(path + ".tmp", path)
+
+    def _load(self, job_id):
+        if not JOB_ID.fullmatch(job_id):
+            return None
+        try:
+            with open(self._path(job_id, "json")) as file:
+                return ExportJob.from_record(json.load(file))
+        except FileNotFoundError:
+            return None
+
+
+class _Writer:
+    """Appends row chunks to a Parquet file (one row group each) or a CSV file."""
+
+    def __init__(self, path, format):
+        self.path = path
+        self.format = format
+        self._writer = None
+        self._schema = None
+        self._columns = None
+
+    def __enter__(self):
+        if self.format == "csv":
+            self._writer = open(self.path, "w", newline="")
+        return self
+
+    def write(self, rows):
+        import pandas as pd
+
+        if not rows:
+            return
+        # Chunks may come with their columns in another order (e.g. some read from
+        # the materialized store): every chunk follows the first one's.
+        frame = pd.DataFrame(rows, columns=self._columns)
+        header = self._columns is None
+        self._columns = list(frame.columns)
+        if self.format == "csv":
+            frame.to_csv(self._writer, header=header, index=False)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def __exit__(self, *exc_info):
+        if self._writer is not None:
+            self._writer.close()
+        elif self.format == "parquet" and exc_info[0] is None:
+            # Nothing in the range: an empty file still opens as a table.
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table({}), self.path)
+
+
+def _enrich(symbol, start, end, job, state):
+    from app.services.enrichment import enrich_candles
+
+    # NaN (empty in CSV, null in Parquet) where an indicator has no value yet.
+    rows, _, _, state = enrich_candles(
+        symbol, start, end, job.calls, job.output_columns, metrics.StageTimer(), fill_value=None, state=state
+    )
+    return rows, state
+
+
+def _chunks(start, end, chunk):
+    chunks = []
+    while start <= end:
+        chunks.append((start, min(start + chunk - timedelta(microseconds=1), end)))
+        start += chunk
+    return chunks
+
+
+def _remove(path):
+    # Another worker may remove the same file at the same time.
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _listdir(directory):
+    return os.listdir(directory) if os.path.isdir(directory) else []
+
+
+def create_export_manager():
+    """Build the manager configured under `[EXPORTS]` in api_config.cfg."""
+    return ExportManager(
+        settings.get("EXPORTS", "directory", fallback="exports"),
+        workers=settings.getint("EXPORTS", "workers", fallback=2),
+        max_pending=settings.getint("EXPORTS", "max_pending", fallback=16),
+        chunk=timedelta(days=settings.getfloat("EXPORTS", "chunk_days", fallback=30)),
+        retention=timedelta(hours=settings.getfloat("EXPORTS", "retention_hours", fallback=24)),
+    )
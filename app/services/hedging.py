@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app.services.metrics import BIGQUERY_HEDGE_SAVED_SECONDS, BIGQUERY_HEDGES, BIGQUERY_QUERY_SECONDS
+
+
+class LatencyTracker:
+    """Quantile of the most recent call durations."""
+
+    def __init__(self, window=200):
+        self._durations = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._durations)
+
+    def observe(self, seconds):
+        with self._lock:
+            self._durations.append(seconds)
+
+    def quantile(self, q):
+        """Return the `q` quantile of the recent durations, None before any call."""
+        with self._lock:
+            durations = sorted(self._durations)
+        if not durations:
+            return None
+        return durations[min(int(q * len(durations)), len(durations) - 1)]
+
+
+class Hedger:
+    """
+    Run blocking calls with a hedge: a duplicate started if the first is slow.
+
+    A call taking longer than the `quantile` of the recent durations (at least
+    `min_delay`, and `initial_delay` until `min_samples` calls completed) gets a
+    second identical call; whichever returns first wins and the other is left to
+    finish in the background. At the 0.95 quantile, about one call in twenty is
+    duplicated, and the slow tail is cut to roughly two typical durations.
+    Every call's duration is observed, hedges' included.
+    """
+
+    def __init__(self, name, quantile=0.95, min_delay=0.25, initial_delay=2.0, min_samples=20, max_workers=16):
+        """
+        Args:
+            name (str): Label of the calls in the exported metrics.
+            quantile (float): Quantile of the recent durations after which to hedge.
+            min_delay (float): Shortest delay before hedging, in seconds.
+            initial_delay (float): Delay used until `min_samples` durations are known.
+            min_samples (int): Durations needed before the quantile is trusted.
+            max_workers (int): Threads running the calls and their hedges.
+        """
+        self.name = name
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=f"hedge-{name}")
+
+    def delay(self):
+        """Seconds after which a call is hedged."""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.latencies.quantile(self.quantile), self.min_delay)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run `func(*args, **kwargs)`, hedged.
+
+        Returns:
+            Any: The result of the first call to succeed.
+
+        Raises:
+            Exception: The error of the first call, if both failed.
+        """
+        primary = self._submit(func, args, kwargs)
+        done, _ = wait([primary], timeout=self.delay())
+        if done:
+            return primary.result()
+
+        BIGQUERY_HEDGES.labels(self.name, "fired").inc()
+        hedge = self._submit(func, args, kwargs)
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        winner = hedge if hedge in done else primary
+        if winner.exception() is not None and pending:
+            # The first to return failed: the other one may still succeed.
+            winner = pending.pop()
+            wait([winner])
+        if winner is hedge and winner.exception() is None:
+            BIGQUERY_HEDGES.labels(self.name, "won").inc()
+            won_at = time.perf_counter()
+            primary.add_done_callback(lambda future: self._saved(won_at))
+        else:
+            BIGQUERY_HEDGES.labels(self.name, "lost").inc()
+        return winner.result()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def _submit(self, func, args, kwargs):
+        return self._pool.submit(self._timed, func, args, kwargs)
+
+    def _timed(self, func, args, kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            self.latencies.observe(seconds)
+            BIGQUERY_QUERY_SECONDS.labels(self.name).observe(seconds)
+
+    def _saved(self, won_at):
+        # How much later the primary call returned than the hedge that won.
+        BIGQUERY_HEDGE_SAVED_SECONDS.labels(self.name).observe(max(time.perf_counter() - won_at, 0.0))
@@ -0,0 +1,141 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from fastapi import Response
+
+from app.utils import encode_json
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+IMMUTABLE_AFTER = timedelta(seconds=settings.getint("HTTP_CACHE", "immutable_after_seconds", fallback=3600))
+IMMUTABLE_MAX_AGE = settings.getint("HTTP_CACHE", "immutable_max_age", fallback=31536000)
+LIVE_MAX_AGE = settings.getint("HTTP_CACHE", "live_max_age", fallback=60)
+STATIC_MAX_AGE = settings.getint("HTTP_CACHE", "static_max_age", fallback=86400)
+
+# Bump when the response format changes so cached representations are invalidated.
+ETAG_VERSION = "2"
+ENCODING_SUFFIXES = ("gzip", "br", "zstd")
+
+
+def _as_utc(value):
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_immutable(end, now=None):
+    """
+    Tell whether a range ending at `end` can no longer receive new candles.
+
+    Args:
+        end (datetime): Upper bound of the requested range (naive values are UTC).
+        now (datetime, optional): Reference time, defaults to the current time.
+
+    Returns:
+        bool: True if the range is settled history.
+    """
+    now = now or datetime.now(timezone.utc)
+    return _as_utc(end) + IMMUTABLE_AFTER <= now
+
+
+def make_etag(key, latest_candle):
+    """
+    Build a strong ETag for a /data representation.
+
+    Args:
+        key (tuple): Normalized request identity (symbol, range, indicators, columns).
+        latest_candle: Open time of the newest candle included in the response.
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    digest = hashlib.sha256(repr((ETAG_VERSION, key, str(latest_candle))).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def cache_headers(etag, last_modified, immutable):
+    """
+    Build the validator and freshness headers for a /data response.
+
+    Args:
+        etag (str): Value from `make_etag`.
+        last_modified: Time of the newest data the response may contain.
+        immutable (bool): Whether the range is settled history.
+
+    Returns:
+        dict: Response headers.
+    """
+    if immutable:
+        cache_control = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = f"public, max-age={LIVE_MAX_AGE}"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Evaluate an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match (str | None): Raw header value.
+        etag (str): Current ETag.
+
+    Returns:
+        bool: True if the client's copy is still valid (answer with 304).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    candidates = (_identity_etag(tag.strip().removeprefix("W/")) for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def _identity_etag(etag):
+    # CompressionMiddleware suffixes the ETag of encoded representations.
+    for encoding in ENCODING_SUFFIXES:
+        if etag.endswith(f'-{encoding}"'):
+            return etag[: -len(encoding) - 2] + '"'
+    return etag
+
+
+class PrerenderedJSON:
+    """
+    A static JSON document encoded once and served as bytes.
+
+    Skips FastAPI's per-request validation and serialization, and answers
+    revalidations with 304.
+    """
+
+    def __init__(self, content):
+        """
+        Args:
+            content: JSON-like data, rendered immediately.
+        """
+        self.body = encode_json(content)
+        self.headers = {
+            "ETag": f'"{hashlib.sha256(self.body).hexdigest()[:32]}"',
+            "Cache-Control": f"public, max-age={STATIC_MAX_AGE}",
+        }
+
+    def response(self, request):
+        """
+        Build the response for a request.
+
+        Args:
+            request (Request): Incoming request, checked for If-None-Match.
+
+        Returns:
+            Response: 304 if the client's copy is current, the document otherwise.
+        """
+        if etag_matches(request.headers.get("if-none-match"), self.headers["ETag"]):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
@@ -0,0 +1,60 @@
+import importlib.util
+
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+# "pandas" is CalculateIndicators itself; the others compute on NumPy arrays
+# (array_indicators) behind the same methods.
+ENGINES = ("pandas", "numpy", "numba")
+
+
+def default_engine():
+    """Return the engine set by `[CALCULATIONS] engine` in api_config.cfg."""
+    return settings.get("CALCULATIONS", "engine", fallback="pandas")
+
+
+def available_engines():
+    """Return the engines usable in this environment; numba is optional."""
+    return tuple(
+        engine for engine in ENGINES if engine != "numba" or importlib.util.find_spec("numba") is not None
+    )
+
+
+def check_engine(engine):
+    """
+    Validate an engine name.
+
+    Raises:
+        ValueError: If the engine is unknown or its package is not installed.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid engine {engine!r}. Provide one of: {', '.join(ENGINES)}.")
+    if engine not in available_engines():
+        raise ValueError(f"The {engine} engine is not available: its package is not installed.")
+
+
+def create_calculator(engine=None, fill_value=0):
+    """
+    Build the indicator calculator of an engine.
+
+    Args:
+        engine (str, optional): One of `ENGINES`, the configured default if None.
+        fill_value: Value of cells that cannot be computed; None keeps NaN.
+
+    Returns:
+        CalculateIndicators: An instance with the usual indicator methods.
+
+    Raises:
+        ValueError: If the engine is unknown or unavailable.
+    """
+    engine = engine or default_engine()
+    check_engine(engine)
+    if engine == "pandas":
+        from app.services.calculators import CalculateIndicators
+
+        return CalculateIndicators(fill_value=fill_value)
+
+    from app.services.array_indicators import ArrayIndicators, NumbaIndicators
+
+    return (NumbaIndicators if engine == "numba" else ArrayIndicators)(fill_value=fill_value)
@@ -0,0 +1,635 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+from app.utils import Columns
+
+# EWM-based indicators never fully forget old candles; after this many spans the
+# ignored history weighs less than e^-8 (~0.03%) of the value.
+EWM_WARM_UP_SPANS = 4
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    Catalogue entry of a technical indicator.
+
+    `key` is the name of the indicator's query parameter on /data, of its
+    CalculateIndicators method and of its /indicators/{key} page; `aliases` are
+    extra page names kept for compatibility.
+
+    `outputs`, `lookback` and `lookahead` take the indicator's parameters, in the
+    order of `parameters`: `outputs` lists the columns the method adds, `lookback`
+    is the number of candles before a row needed for that row's value to be valid,
+    `lookahead` the number after it (e.g. the Chikou Span, a later close).
+    `cost` is the time per candle of the method relative to a plain DataFrame
+    pass, used to estimate the cost of a request before running it.
+    `cumulative` indicators are running totals since the start of the range
+    rather than functions of a window; they are computed by `cumulative.apply`.
+    """
+
+    key: str
+    inputs: tuple
+    outputs: Callable
+    lookback: Callable
+    name: str
+    summary: str
+    description: str
+    formula: str
+    parameters: list
+    usage: list
+    aliases: tuple = field(default=())
+    cost: float = 1.0
+    cumulative: bool = False
+    lookahead: Callable = field(default=lambda *args: 0)
+
+    @property
+    def abbreviation(self):
+        """Short label, e.g. "SMA" or "A/D Line"."""
+        return self.name.rsplit("(", 1)[1].rstrip(")")
+
+    @property
+    def full_name(self):
+        """Name without the abbreviation, e.g. "Simple Moving Average"."""
+        return self.name.rsplit(" (", 1)[0]
+
+    def parse(self, value):
+        """
+        Turn the raw /data query value into the argument tuples of each call.
+
+        Flags (no parameters) take a boolean; single-parameter indicators a list of
+        integers; multi-parameter ones a list of comma separated integers.
+
+        Args:
+            value: Raw query value (None when the indicator was not requested).
+
+        Returns:
+            list: One tuple of integer arguments per requested call.
+
+        Raises:
+            ValueError: If an argument is malformed or not a positive integer.
+        """
+        if not value:
+            return []
+        if not self.parameters:
+            return [()]
+
+        names = [parameter["name"] for parameter in self.parameters]
+        calls = []
+        for item in value:
+            try:
+                args = tuple(int(part) for part in str(item).split(","))
+            except ValueError:
+                args = ()
+            if len(args) != len(names):
+                raise ValueError(f"Invalid format for {self.abbreviation}. Provide '{','.join(names)}'.")
+            if min(args) < 1:
+                raise ValueError(f"Invalid {self.abbreviation} parameters {item}: must be positive integers.")
+            calls.append(args)
+        return calls
+
+    def apply(self, calculate_indicators, args, data):
+        """Run the CalculateIndicators method of this indicator."""
+        return getattr(calculate_indicators, self.key)(*args, data)
+
+    def info(self):
+        """Entry of the /indicators listing."""
+        return {
+            "name": self.name,
+            "description": self.summary,
+            "parameters": [parameter["name"] for parameter in self.parameters],
+        }
+
+    def details(self):
+        """Body of the /indicators/{key} page."""
+        parameters = self.parameters or [{
+            "name": "None",
+            "type": "N/A",
+            "description": f"No additional parameters are required for {self.abbreviation}.",
+        }]
+        return {
+            "name": self.name,
+            "description": self.description,
+            "formula": self.formula,
+            "parameters": parameters,
+            "usage": self.usage,
+        }
+
+
+INDICATORS = [
+    Indicator(
+        key="sma",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"SMA_{period}"],
+        lookback=lambda period: period - 1,
+        name="Simple Moving Average (SMA)",
+        summary="Calculates the average of a selected range of prices over a specified number of periods.",
+        description="Calculates the average of a selected range of prices over a specified number of periods.",
+        formula="SMA = (Sum of closing prices over N periods) / N",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the SMA."},
+        ],
+        usage=[
+            "Identify trends: A rising SMA indicates an uptrend, while a falling SMA indicates a downtrend.",
+            "Support and resistance levels.",
+        ],
+    ),
+    Indicator(
+        key="ema",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"EMA_{period}"],
+        lookback=lambda period: EWM_WARM_UP_SPANS * period,
+        name="Exponential Moving Average (EMA)",
+        summary="Gives more weight to recent prices to make it more responsive to new information.",
+        description="Places greater weight on recent prices to respond to changes more quickly than SMA.",
+        formula="EMA = Price_t * (2 / (1 + N)) + EMA_y * (1 - (2 / (1 + N)))",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the EMA."},
+        ],
+        usage=[
+            "React more sensitively to price changes.",
+            "Identify short-term trends.",
+        ],
+    ),
+    Indicator(
+        key="roc",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"ROC_{period}"],
+        lookback=lambda period: period,
+        name="Rate of Change (ROC)",
+        summary="Measures the percentage change in price between the current price and the price a certain number of periods ago.",
+        description="Measures the percentage change in price over a specified number of periods.",
+        formula="ROC = ((Close_t - Close_(t-N)) / Close_(t-N)) * 100",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate the ROC."},
+        ],
+        usage=[
+            "Identify overbought and oversold conditions.",
+            "Spot momentum changes.",
+        ],
+    ),
+    Indicator(
+        key="rsi",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"RSI_{period}"],
+        lookback=lambda period: period,
+        name="Relative Strength Index (RSI)",
+        summary="Measures the speed and change of price movements to identify overbought or oversold conditions.",
+        description="Measures the speed and magnitude of price movements to identify overbought or oversold conditions.",
+        formula="RSI = 100 - (100 / (1 + (Average Gain / Average Loss)))",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the RSI calculation."},
+        ],
+        usage=[
+            "Identify overbought (>70) and oversold (<30) levels.",
+            "Spot divergences to predict reversals.",
+        ],
+    ),
+    Indicator(
+        key="wil",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: [f"WIL_{period}"],
+        lookback=lambda period: period - 1,
+        name="Williams %R (WIL)",
+        summary="Identifies overbought and oversold levels by comparing the closing price to the high-low range over a specific period.",
+        description="Compares the closing price to the high-low range over a specified period.",
+        formula="WIL = (Highest High - Close) / (Highest High - Lowest Low) * -100",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate Williams %R."},
+        ],
+        usage=[
+            "Identify overbought (<-20) and oversold (<-80) levels.",
+            "Spot reversals in momentum.",
+        ],
+    ),
+    Indicator(
+        key="atr",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: ["TR", f"ATR_{period}"],
+        lookback=lambda period: period - 1,
+        name="Average True Range (ATR)",
+        summary="Measures market volatility by calculating the average range between high and low prices over a specified period.",
+        description="Measures market volatility by taking the average of true ranges over a specified period.",
+        formula="ATR = (Previous ATR * (n-1) + Current TR) / n",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate ATR."},
+        ],
+        usage=[
+            "Gauge market volatility.",
+            "Set stop-loss levels.",
+        ],
+        cost=3,
+    ),
+    Indicator(
+        key="mom",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"MOM_{period}"],
+        lookback=lambda period: period,
+        name="Momentum (MOM)",
+        summary="Measures the rate of change in closing prices over a specified period.",
+        description="Measures the rate of price change over a specified period.",
+        formula="MOM = Close_t - Close_(t-N)",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate Momentum."},
+        ],
+        usage=[
+            "Identify the speed of price movement.",
+            "Spot bullish or bearish momentum trends.",
+        ],
+    ),
+    Indicator(
+        key="so",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: [f"SO_%K_{period}"],
+        lookback=lambda period: period - 1,
+        name="Stochastic Oscillator (%K) (SO)",
+        summary="Determines momentum by comparing the closing price to a range of prices over a certain period.",
+        description="Compares the closing price to the high-low range over a specified number of periods.",
+        formula="SO_%K = ((Close - Lowest Low) / (Highest High - Lowest Low)) * 100",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate %K."},
+        ],
+        usage=[
+            "Identify overbought (>80) and oversold (<20) levels.",
+            "Spot potential trend reversals.",
+        ],
+    ),
+    Indicator(
+        key="tr",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda: ["TR"],
+        lookback=lambda: 1,
+        name="True Range (TR)",
+        summary="Calculates the maximum of the current high-low range or the range from the previous close.",
+        description="Measures market volatility using the range between the high, low, and previous close prices.",
+        formula="TR = max(High - Low, abs(High - Previous Close), abs(Low - Previous Close))",
+        parameters=[],
+        usage=[
+            "Gauge daily market volatility.",
+            "Set stop-loss levels based on volatility.",
+        ],
+        cost=3,
+    ),
+    Indicator(
+        key="macd",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda short_period, long_period, signal_period: [
+            f"MACD_Line_{short_period}_{long_period}",
+            f"Signal_Line_{signal_period}",
+        ],
+        lookback=lambda short_period, long_period, signal_period: (
+            EWM_WARM_UP_SPANS * (max(short_period, long_period) + signal_period)
+        ),
+        name="Moving Average Convergence Divergence (MACD)",
+        summary="Shows the relationship between two EMAs and a signal line to identify trends and reversals.",
+        description="A trend-following momentum indicator that shows the relationship between two moving averages.",
+        formula="MACD Line = EMA(short) - EMA(long), Signal Line = EMA(MACD Line, signal_period)",
+        parameters=[
+            {"name": "short_period", "type": "integer", "description": "Short-term EMA period (e.g., 12)."},
+            {"name": "long_period", "type": "integer", "description": "Long-term EMA period (e.g., 26)."},
+            {"name": "signal_period", "type": "integer", "description": "Signal line EMA period (e.g., 9)."},
+        ],
+        usage=[
+            "Identify bullish or bearish crossovers.",
+            "Gauge momentum strength and reversals.",
+        ],
+    ),
+    Indicator(
+        key="bb",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"Middle_Band_{period}", f"Upper_Band_{period}", f"Lower_Band_{period}"],
+        lookback=lambda period: period - 1,
+        name="Bollinger Bands (BB)",
+        summary="Plots upper and lower bands around a moving average based on standard deviation to indicate volatility.",
+        description="A volatility indicator that creates a band of three lines: an SMA in the middle and two standard deviations above and below it.",
+        formula="Upper Band = SMA + (2 * Std Dev), Lower Band = SMA - (2 * Std Dev)",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the SMA (e.g., 20)."},
+        ],
+        usage=[
+            "Identify periods of high or low volatility.",
+            "Spot overbought or oversold conditions when prices touch or cross the bands.",
+        ],
+    ),
+    Indicator(
+        key="cmo",
+        inputs=(Columns.CLOSE,),
+        outputs=lambda period: [f"CMO_{period}"],
+        lookback=lambda period: period,
+        name="Chande Momentum Oscillator (CMO)",
+        summary="Measures momentum by comparing the sum of recent gains to the sum of recent losses.",
+        description="Measures momentum by calculating the difference between sum gains and sum losses over a period.",
+        formula="CMO = ((Sum of Gains - Sum of Losses) / (Sum of Gains + Sum of Losses)) * 100",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the CMO calculation."},
+        ],
+        usage=[
+            "Identify overbought (>50) and oversold (<-50) conditions.",
+            "Gauge the strength of momentum in the market.",
+        ],
+    ),
+    Indicator(
+        key="obv",
+        inputs=(Columns.CLOSE, Columns.VOLUME),
+        outputs=lambda: ["OBV"],
+        lookback=lambda: 0,
+        name="On-Balance Volume (OBV)",
+        summary="Measures buying and selling pressure as a cumulative volume indicator.",
+        description="A volume-based indicator that predicts price changes by measuring cumulative buying and selling pressure.",
+        formula=(
+            "OBV = Previous OBV + Volume (if Close > Previous Close)\n"
+            "OBV = Previous OBV - Volume (if Close < Previous Close)\n"
+            "OBV = Previous OBV (if Close = Previous Close)"
+        ),
+        parameters=[],
+        usage=[
+            "Identify potential trend reversals.",
+            "Confirm price trends with volume trends.",
+        ],
+        cost=20,
+        cumulative=True,
+    ),
+    Indicator(
+        key="dc",
+        inputs=(Columns.HIGH, Columns.LOW),
+        outputs=lambda period: [
+            f"Donchian_Upper_{period}",
+            f"Donchian_Lower_{period}",
+            f"Donchian_Mid_{period}",
+        ],
+        lookback=lambda period: period - 1,
+        name="Donchian Channels (DC)",
+        summary="Plots the highest high and lowest low over a specific period to indicate trends.",
+        description="A volatility indicator that plots the highest high and lowest low over a specific period.",
+        formula="Upper Band = Highest High over N periods, Lower Band = Lowest Low over N periods",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for calculating high and low bands."},
+        ],
+        usage=[
+            "Identify breakout levels.",
+            "Spot trends and reversals.",
+        ],
+    ),
+    Indicator(
+        key="al",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME),
+        outputs=lambda: ["AD_Line"],
+        lookback=lambda: 0,
+        aliases=("adl",),
+        name="Accumulation/Distribution Line (A/D Line)",
+        summary="Uses price and volume to assess supply and demand for a stock.",
+        description="Measures the cumulative money flow into and out of a security.",
+        formula=(
+            "Money Flow Multiplier = ((Close - Low) - (High - Close)) / (High - Low)\n"
+            "Money Flow Volume = Money Flow Multiplier * Volume\n"
+            "A/D Line = Previous A/D Line + Money Flow Volume"
+        ),
+        parameters=[],
+        usage=[
+            "Identify divergence between price and volume.",
+            "Gauge the strength of trends.",
+        ],
+        cumulative=True,
+    ),
+    Indicator(
+        key="cmf",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME),
+        outputs=lambda period: [f"CMF_{period}"],
+        lookback=lambda period: period - 1,
+        name="Chaikin Money Flow (CMF)",
+        summary="Combines price and volume to measure the flow of money into or out of an asset over a specific period.",
+        description="Measures the amount of money flow volume over a specific period to gauge buying and selling pressure.",
+        formula="CMF = (Sum of Money Flow Volume over N periods) / (Sum of Volume over N periods)",
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate CMF."},
+        ],
+        usage=[
+            "Identify bullish (>0) or bearish (<0) trends.",
+            "Spot potential trend reversals.",
+        ],
+    ),
+    Indicator(
+        key="ic",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda: ["Tenkan_sen", "Kijun_sen", "Senkou_Span_A", "Senkou_Span_B", "Chikou_Span"],
+        lookback=lambda: 26 + 52 - 1,
+        lookahead=lambda: 26,
+        name="Ichimoku Cloud (IC)",
+        summary="Combines multiple averages and plots them to indicate support, resistance, and trend direction.",
+        description=(
+            "A versatile indicator that defines support, resistance, trend direction, and momentum. It consists of five lines: Tenkan-sen, Kijun-sen, Senkou Span A, "
+            "Senkou Span B, and Chikou Span."
+        ),
+        formula=(
+            "Tenkan-sen = (Highest High + Lowest Low) / 2 (for the last 9 periods)\n"
+            "Kijun-sen = (Highest High + Lowest Low) / 2 (for the last 26 periods)\n"
+            "Senkou Span A = (Tenkan-sen + Kijun-sen) / 2 (plotted 26 periods ahead)\n"
+            "Senkou Span B = (Highest High + Lowest Low) / 2 (for the last 52 periods, plotted 26 periods ahead)\n"
+            "Chikou Span = Closing Price (plotted 26 periods behind)"
+        ),
+        parameters=[],
+        usage=[
+            "Identify trend direction and strength.",
+            "Spot dynamic support and resistance levels.",
+        ],
+    ),
+    Indicator(
+        key="pp",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda: ["Pivot", "Support_1", "Resistance_1", "Support_2", "Resistance_2"],
+        lookback=lambda: 0,
+        name="Pivot Points (PP)",
+        summary="Identifies support and resistance levels based on the previous period's prices.",
+        description="A price-based indicator that identifies potential support and resistance levels for intraday trading.",
+        formula=(
+            "Pivot Point (PP) = (High + Low + Close) / 3\n"
+            "Resistance 1 (R1) = (2 * PP) - Low\n"
+            "Support 1 (S1) = (2 * PP) - High\n"
+            "Resistance 2 (R2) = PP + (High - Low)\n"
+            "Support 2 (S2) = PP - (High - Low)"
+        ),
+        parameters=[],
+        usage=[
+            "Identify support and resistance levels.",
+            "Plan potential entry and exit points.",
+        ],
+    ),
+    Indicator(
+        key="cci",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: ["Typical_Price", "SMA_TP", "Mean_Deviation", f"CCI_{period}"],
+        lookback=lambda period: period - 1,
+        name="Commodity Channel Index (CCI)",
+        summary="Identifies overbought and oversold levels based on the deviation from the average price.",
+        description="A momentum-based indicator that measures the deviation of price from its average price over a specified period.",
+        formula=(
+            "CCI = (Typical Price - SMA of Typical Price) / (0.015 * Mean Deviation)\n"
+            "Typical Price = (High + Low + Close) / 3"
+        ),
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate CCI."},
+        ],
+        usage=[
+            "Identify overbought (>100) and oversold (<-100) conditions.",
+            "Spot potential trend reversals.",
+        ],
+        cost=2.5,
+    ),
+    Indicator(
+        key="adx",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: [f"ADX_{period}"],
+        lookback=lambda period: 2 * period - 1,
+        name="Average Directional Index (ADX)",
+        summary="Measures the strength of a trend, regardless of direction.",
+        description="A trend strength indicator that measures the strength of a trend regardless of its direction.",
+        formula=(
+            "ADX = 100 * EMA(DX, period)\n"
+            "DX = (|+DI - -DI| / |+DI + -DI|) * 100\n"
+            "+DI = (Smoothed +DM / ATR) * 100\n"
+            "-DI = (Smoothed -DM / ATR) * 100"
+        ),
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods to calculate ADX and related components."},
+        ],
+        usage=[
+            "Gauge the strength of a trend.",
+            "Determine whether the market is trending (>25) or ranging (<25).",
+        ],
+        cost=3,
+    ),
+    Indicator(
+        key="kc",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE),
+        outputs=lambda period: ["Middle_Band", "ATR", "Upper_Band", "Lower_Band"],
+        lookback=lambda period: period - 1,
+        name="Keltner Channels (KC)",
+        summary="Plots bands around a moving average using ATR to indicate volatility.",
+        description="A volatility-based envelope indicator that uses an EMA as the central line and bands based on ATR.",
+        formula=(
+            "Middle Line = EMA(period)\n"
+            "Upper Band = EMA(period) + (Multiplier * ATR)\n"
+            "Lower Band = EMA(period) - (Multiplier * ATR)"
+        ),
+        parameters=[
+            {"name": "period", "type": "integer", "description": "Number of periods for the EMA and ATR calculation."},
+        ],
+        usage=[
+            "Identify potential breakouts or reversals.",
+            "Gauge market volatility and trends.",
+        ],
+        cost=3,
+    ),
+    Indicator(
+        key="vwap",
+        inputs=(Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME),
+        outputs=lambda: ["Typical_Price", "Cumulative_TP_Volume", "Cumulative_Volume", "VWAP"],
+        lookback=lambda: 0,
+        name="Volume-Weighted Average Price (VWAP)",
+        summary="Calculates the average price of an asset weighted by volume, commonly used intraday.",
+        description="A trading benchmark that represents the average price weighted by total trading volume.",
+        formula="VWAP = Cumulative (Price * Volume) / Cumulative Volume",
+        parameters=[],
+        usage=[
+            "Determine intraday support and resistance levels.",
+            "Evaluate trade executions relative to the market average.",
+        ],
+        cumulative=True,
+    ),
+]
+
+registry = {indicator.key: indicator for indicator in INDICATORS}
+
+
+def parse_requested(requested):
+    """
+    Validate the indicators of a /data request and put them in computation order.
+
+    Single-parameter indicators run first, then multi-parameter ones, then flags,
+    so that columns shared between indicators (e.g. "TR") end up as before.
+
+    Args:
+        requested (dict): Raw query value per indicator key.
+
+    Returns:
+        list: (Indicator, args) pairs.
+
+    Raises:
+        ValueError: If any value is invalid; nothing has been fetched yet.
+    """
+    calls = [
+        (indicator, args)
+        for indicator in INDICATORS
+        for args in indicator.parse(requested.get(indicator.key))
+    ]
+    return sorted(calls, key=lambda call: (not call[0].parameters, len(call[0].parameters)))
+
+
+def required_columns(calls):
+    """Return the candle columns the given calls read."""
+    return {column for indicator, _ in calls for column in indicator.inputs}
+
+
+def max_lookback(calls):
+    """Return the number of warm-up candles the given calls need."""
+    return max((indicator.lookback(*args) for indicator, args in calls), default=0)
+
+
+def max_lookahead(calls):
+    """Return the number of candles past a row the given calls read."""
+    return max((indicator.lookahead(*args) for indicator, args in calls), default=0)
+
+
+def _output_patterns():
+    # Render every output with placeholder arguments and turn the placeholders into
+    # capture groups; outputs that do not name all parameters (e.g. Keltner's
+    # "Upper_Band") cannot identify a call and are left out.
+    patterns = []
+    for indicator in INDICATORS:
+        placeholders = [str(900_000_001 + index) for index in range(len(indicator.parameters))]
+        for output in indicator.outputs(*placeholders):
+            if not all(placeholder in output for placeholder in placeholders):
+                continue
+            pattern = re.escape(output)
+            for index, placeholder in enumerate(placeholders):
+                pattern = pattern.replace(placeholder, f"(?P<p{index}>[0-9]+)")
+            patterns.append((indicator, re.compile(pattern)))
+    return patterns
+
+
+_OUTPUT_PATTERNS = _output_patterns()
+
+
+def resolve_columns(names):
+    """
+    Find the calls whose outputs are the given indicator columns.
+
+    For example "RSI_14" resolves to rsi(14) and "MACD_Line_12_26" to nothing, since
+    the signal period is not part of the name.
+
+    Args:
+        names (Iterable[str]): Column names.
+
+    Returns:
+        tuple: The (Indicator, args) pairs in computation order, and the sorted
+        names no indicator produces.
+
+    Raises:
+        ValueError: If a resolved parameter is invalid (e.g. "SMA_0").
+    """
+    requested = {}
+    unknown = set()
+    for name in names:
+        for indicator, pattern in _OUTPUT_PATTERNS:
+            match = pattern.fullmatch(name)
+            if match:
+                if indicator.parameters:
+                    args = ",".join(match.group(f"p{index}") for index in range(len(indicator.parameters)))
+                    requested.setdefault(indicator.key, set()).add(args)
+                else:
+                    requested[indicator.key] = True
+                break
+        else:
+            unknown.add(name)
+    requested = {key: value if value is True else sorted(value) for key, value in requested.items()}
+    return parse_requested(requested), sorted(unknown)
@@ -0,0 +1,276 @@
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicator_registry
+from app.utils import Columns, naive_utc
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+OPEN_TIME = Columns.OPEN_TIME.value
+
+
+def materialized_calls():
+    """
+    Parse `[MATERIALIZATION] indicators` into registry calls.
+
+    Entries are whitespace separated `key:arguments`, e.g. `sma:20 macd:12,26,9`.
+
+    Returns:
+        list: (Indicator, args) pairs in computation order.
+
+    Raises:
+        ValueError: If an entry is malformed, names a running total (which depends
+            on where a request's range starts) or an indicator reading later candles
+            (not there yet for the newest stored rows), or two calls write the
+            same column.
+    """
+    value = settings.get(
+        "MATERIALIZATION", "indicators", fallback="sma:20 sma:50 sma:200 ema:12 ema:26 rsi:14 macd:12,26,9"
+    )
+    requested = {}
+    for entry in value.split():
+        key, _, args = entry.partition(":")
+        if key not in indicator_registry.registry:
+            raise ValueError(f"Unknown indicator {key!r} in [MATERIALIZATION] indicators.")
+        if indicator_registry.registry[key].cumulative:
+            raise ValueError(f"{key!r} is a running total from the start of each request and cannot be materialized.")
+        requested.setdefault(key, []).append(args or True)
+    calls = indicator_registry.parse_requested(
+        {key: values[0] if values == [True] else values for key, values in requested.items()}
+    )
+
+    for indicator, args in calls:
+        if indicator.lookahead(*args):
+            raise ValueError(f"{indicator.key!r} reads candles after each row and cannot be materialized.")
+
+    outputs = [column for indicator, args in calls for column in indicator.outputs(*args)]
+    if len(outputs) != len(set(outputs)):
+        raise ValueError("Materialized indicators must write distinct columns.")
+    return calls
+
+
+class IndicatorStore(ABC):
+    """
+    Precomputed indicator columns per symbol, keyed by candle open time.
+
+    Filled by `python -m app.jobs.materialize`; /data reads from it the calls whose
+    output columns are all stored, as long as the store covers the whole range.
+    """
+
+    @abstractmethod
+    def columns(self, symbol):
+        """Return the names of the stored indicator columns of a symbol."""
+
+    @abstractmethod
+    def bounds(self, symbol):
+        """Return the first and last stored open times, or (None, None) when empty."""
+
+    @abstractmethod
+    def read(self, symbol, start, end, columns):
+        """
+        Read stored columns for the candles opened between `start` and `end`.
+
+        Returns:
+            pandas.DataFrame: `Open_time` (naive UTC) and the requested columns.
+        """
+
+    @abstractmethod
+    def append(self, symbol, frame):
+        """
+        Add rows newer than the last stored one.
+
+        Args:
+            symbol (str): Lower-case pair name.
+            frame (pandas.DataFrame): `Open_time` and the indicator columns, sorted.
+        """
+
+    @abstractmethod
+    def clear(self, symbol):
+        """Delete everything stored for a symbol."""
+
+    def attach(self, symbol, rows, columns, fill_value):
+        """
+        Add stored indicator columns to candle rows by open time.
+
+        Args:
+            symbol (str): Lower-case pair name.
+            rows (list): Candle rows, sorted by `Open_time`.
+            columns (list[str]): Stored columns to add.
+            fill_value: Value of missing cells; None keeps them as NaN.
+
+        Returns:
+            list: Rows with the stored columns.
+        """
+        frame = pd.DataFrame(rows)
+        times = _naive_times(frame[OPEN_TIME])
+        stored = self.read(symbol, times.iloc[0].to_pydatetime(), times.iloc[-1].to_pydatetime(), columns)
+        values = stored.set_index(OPEN_TIME).reindex(times.to_numpy())
+        for column in columns:
+            frame[column] = values[column].to_numpy()
+        if fill_value is not None:
+            frame[columns] = frame[columns].fillna(fill_value)
+        return frame.to_dict(orient="records")
+
+    def covers(self, symbol, start, end):
+        """Whether every candle opened between `start` and `end` has stored values."""
+        first, last = self.bounds(symbol)
+        return first is not None and first <= start and last >= end
+
+
+class LocalIndicatorStore(IndicatorStore):
+    """
+    Columnar store on the local disk: one `.npy` array per column and symbol.
+
+    Arrays are memory-mapped on read, so a request only pages in the slice of the
+    range it asks for.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, symbol, column):
+        return os.path.join(self.directory, symbol, f"{column}.npy")
+
+    def _load(self, symbol, column):
+        return np.load(self._path(symbol, column), mmap_mode="r")
+
+    def columns(self, symbol):
+        directory = os.path.join(self.directory, symbol)
+        if not os.path.isdir(directory):
+            return set()
+        return {name[:-4] for name in os.listdir(directory) if name.endswith(".npy")} - {OPEN_TIME}
+
+    def bounds(self, symbol):
+        if not os.path.exists(self._path(symbol, OPEN_TIME)):
+            return None, None
+        times = self._load(symbol, OPEN_TIME)
+        if not len(times):
+            return None, None
+        return pd.Timestamp(times[0]).to_pydatetime(), pd.Timestamp(times[-1]).to_pydatetime()
+
+    def read(self, symbol, start, end, columns):
+        times = self._load(symbol, OPEN_TIME)
+        lower = times.searchsorted(np.datetime64(start, "ns"), side="left")
+        upper = times.searchsorted(np.datetime64(end, "ns"), side="right")
+        frame = {OPEN_TIME: np.asarray(times[lower:upper])}
+        for column in columns:
+            frame[column] = np.asarray(self._load(symbol, column)[lower:upper])
+        return pd.DataFrame(frame)
+
+    def append(self, symbol, frame):
+        stored = self.columns(symbol)
+        incoming = set(frame.columns) - {OPEN_TIME}
+        if stored and stored != incoming:
+            raise ValueError(f"Stored columns of {symbol} differ from the new ones; rebuild the store.")
+
+        _, last = self.bounds(symbol)
+        if last is not None:
+            frame = frame[frame[OPEN_TIME] > last]
+        if frame.empty:
+            return
+
+        os.makedirs(os.path.join(self.directory, symbol), exist_ok=True)
+        # Indicator columns first, Open_time last: a crash in between leaves rows
+        # that are simply recomputed, never open times without values.
+        for column in sorted(incoming) + [OPEN_TIME]:
+            values = frame[column].to_numpy(dtype="datetime64[ns]" if column == OPEN_TIME else "float64")
+            path = self._path(symbol, column)
+            if os.path.exists(path):
+                existing = self._load(symbol, OPEN_TIME)
+                values = np.concatenate([np.load(path)[:len(existing)], values])
+            temporary = f"{path}.tmp.npy"
+            np.save(temporary, values)
+            os.replace(temporary, path)
+
+    def clear(self, symbol):
+        for column in self.columns(symbol) | {OPEN_TIME}:
+            if os.path.exists(self._path(symbol, column)):
+                os.remove(self._path(symbol, column))
+
+
+class BigQueryIndicatorStore(IndicatorStore):
+    """
+    Store in BigQuery, next to the candles: `indicators_table_<symbol>` from
+    `database_config.cfg`, or `<candle table>_indicators` by default.
+    """
+
+    def __init__(self):
+        from google.cloud import bigquery
+
+        self.bigquery = bigquery
+        self.config = load_config("database_config.cfg")
+        self.client = bigquery.Client()
+
+    def table(self, symbol):
+        database = self.config["DATABASE"]
+        candles = database.get(f"table_{symbol}", database["table"])
+        table = database.get(f"indicators_table_{symbol}", f"{candles}_indicators")
+        return f"{database['project_id']}.{database['dataset']}.{table}"
+
+    def columns(self, symbol):
+        from google.api_core.exceptions import NotFound
+
+        try:
+            schema = self.client.get_table(self.table(symbol)).schema
+        except NotFound:
+            return set()
+        return {field.name for field in schema} - {OPEN_TIME}
+
+    def bounds(self, symbol):
+        if not self.columns(symbol):
+            return None, None
+        row = next(iter(self.client.query_and_wait(
+            f"SELECT MIN(Open_time) AS first, MAX(Open_time) AS last FROM `{self.table(symbol)}`"
+        )))
+        return naive_utc(row["first"]), naive_utc(row["last"])
+
+    def read(self, symbol, start, end, columns):
+        query = f"""
+          SELECT {", ".join([OPEN_TIME, *columns])}
+          FROM `{self.table(symbol)}`
+          WHERE TIMESTAMP(Open_time) BETWEEN TIMESTAMP('{start}') AND TIMESTAMP('{end}')
+          ORDER BY TIMESTAMP(Open_time) ASC
+          """
+        frame = self.client.query_and_wait(query).to_dataframe()
+        frame[OPEN_TIME] = _naive_times(frame[OPEN_TIME])
+        return frame
+
+    def append(self, symbol, frame):
+        _, last = self.bounds(symbol)
+        if last is not None:
+            frame = frame[frame[OPEN_TIME] > last]
+        if frame.empty:
+            return
+        job_config = self.bigquery.LoadJobConfig(write_disposition="WRITE_APPEND")
+        self.client.load_table_from_dataframe(frame, self.table(symbol), job_config=job_config).result()
+
+    def clear(self, symbol):
+        self.client.delete_table(self.table(symbol), not_found_ok=True)
+
+    def close(self):
+        self.client.close()
+
+
+def _naive_times(times):
+    return pd.to_datetime(times, utc=True).dt.tz_convert(None)
+
+
+def create_indicator_store():
+    """
+    Build the store selected by `[MATERIALIZATION] store` in api_config.cfg.
+
+    Returns:
+        IndicatorStore: None when materialization is disabled (the default).
+    """
+    store = settings.get("MATERIALIZATION", "store", fallback="none")
+    if store == "none":
+        return None
+    if store == "local":
+        return LocalIndicatorStore(settings.get("MATERIALIZATION", "directory", fallback="materialized"))
+    if store == "bigquery":
+        return BigQueryIndicatorStore()
+    raise ValueError(f"Unknown indicator store {store!r}, expected 'none', 'local' or 'bigquery'.")
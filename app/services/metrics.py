@@ -0,0 +1,155 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+SERVER_TIMING = settings.getboolean("METRICS", "server_timing", fallback=False)
+
+# Single-flight outcomes: "executed" when a call ran the computation itself,
+# "coalesced" when it waited for an identical call that was already in flight.
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Calls handled by a single-flight group, by outcome.",
+    ["flight", "outcome"],
+)
+
+STAGE_SECONDS = Histogram(
+    "data_stage_seconds",
+    "Time spent in each stage of a /data computation.",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+INDICATOR_SECONDS = Histogram(
+    "indicator_seconds",
+    "Time spent in a single CalculateIndicators invocation.",
+    ["indicator"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+ROWS_PROCESSED = Histogram(
+    "data_rows_processed",
+    "Candles fetched per /data computation.",
+    buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+BIGQUERY_BYTES_SCANNED = Counter(
+    "bigquery_bytes_scanned_total",
+    "Bytes processed by BigQuery on behalf of /data.",
+)
+
+BIGQUERY_QUERY_SECONDS = Histogram(
+    "bigquery_query_seconds",
+    "Duration of single candle queries, hedges included, retries within them.",
+    ["client"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 7.5, 10, 15, 30, 60),
+)
+
+# Hedged queries: "fired" when a duplicate was started, then "won" when the
+# duplicate returned first, "lost" when the original one did.
+BIGQUERY_HEDGES = Counter(
+    "bigquery_hedges_total",
+    "Hedged candle queries, by outcome.",
+    ["client", "outcome"],
+)
+
+BIGQUERY_HEDGE_SAVED_SECONDS = Histogram(
+    "bigquery_hedge_saved_seconds",
+    "How much later the original query returned than the hedge that won.",
+    ["client"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+
+EXPORTS = Counter(
+    "exports_total",
+    "Finished export jobs, by final status.",
+    ["status"],
+)
+
+EXPORT_SECONDS = Histogram(
+    "export_seconds",
+    "Time spent running an export job.",
+    ["format"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+
+# Admission outcomes: "admitted", or the reason of a rejection ("client_limit",
+# "queue_full", "timeout", "too_expensive").
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total",
+    "Admission decisions for /data, by priority class and outcome.",
+    ["priority", "outcome"],
+)
+
+ADMITTED_COST = Gauge(
+    "admission_in_flight_cost",
+    "Estimated cost of the /data computations running.",
+)
+
+QUEUE_SECONDS = Histogram(
+    "admission_queue_seconds",
+    "Time admitted /data requests waited in the queue.",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+class StageTimer:
+    """
+    Time the stages of one computation.
+
+    Every stage is observed into its Prometheus histogram as it completes and kept
+    locally so the same timings can be reported in a `Server-Timing` header.
+    """
+
+    def __init__(self):
+        self.durations = {}
+
+    def stage(self, name, histogram=STAGE_SECONDS):
+        """
+        Time a block of code.
+
+        Args:
+            name (str): Stage name, also the histogram label.
+            histogram (Histogram): Histogram observed with the duration.
+
+        Returns:
+            ContextManager: Timing context for the block.
+        """
+        return _Stage(self, name, histogram)
+
+    def indicator(self, name):
+        """Time one indicator invocation."""
+        return self.stage(name, INDICATOR_SECONDS)
+
+    def server_timing(self):
+        """
+        Render the collected durations as a `Server-Timing` header value.
+
+        Returns:
+            str: Comma separated `name;dur=milliseconds` entries.
+        """
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.durations.items()
+        )
+
+
+class _Stage:
+    def __init__(self, timer, name, histogram):
+        self.timer = timer
+        self.name = name
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.histogram.labels(self.name).observe(elapsed)
+        # Repeated stages (e.g. sma for several periods) add up in the header.
+        self.timer.durations[self.name] = self.timer.durations.get(self.name, 0.0) + elapsed
+        return False
@@ -0,0 +1,178 @@
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from config import load_config
+
+settings = load_config("api_config.cfg", required=False)
+
+MAX_PROFILES = settings.getint("PROFILING", "max_profiles", fallback=16)
+SAMPLING_INTERVAL = settings.getfloat("PROFILING", "sampling_interval_ms", fallback=1.0) / 1000
+
+MODES = ("cprofile", "sampling")
+
+
+class CapturedProfile:
+    """
+    One captured request profile.
+
+    `data` holds the pstats dictionary for cProfile captures and the speedscope
+    document for sampling captures.
+    """
+
+    def __init__(self, mode, label, duration, data):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.label = label
+        self.duration = duration
+        self.data = data
+        self.created = datetime.now(timezone.utc)
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "label": self.label,
+            "duration_ms": round(self.duration * 1000, 1),
+            "created": self.created.isoformat(),
+            "format": "pstats" if self.mode == "cprofile" else "speedscope",
+        }
+
+    def pstats_bytes(self):
+        """Serialize like `pstats.Stats.dump_stats`, loadable with `pstats.Stats(path)`."""
+        return marshal.dumps(self.data)
+
+    def text_report(self, limit=40):
+        stats = pstats.Stats(_StatsHolder(self.data), stream=io.StringIO())
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stats.stream.getvalue()
+
+
+class _StatsHolder:
+    # pstats.Stats accepts any object exposing create_stats() and a `stats` dict.
+    def __init__(self, data):
+        self.stats = data
+
+    def create_stats(self):
+        pass
+
+
+class ProfileStore:
+    """Bounded ring buffer of the most recent captured profiles."""
+
+    def __init__(self, size):
+        self._profiles = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, profile_id):
+        with self._lock:
+            return next((profile for profile in self._profiles if profile.id == profile_id), None)
+
+    def list(self):
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles)]
+
+
+store = ProfileStore(MAX_PROFILES)
+
+
+def capture(mode, label, func, *args):
+    """
+    Run `func(*args)` under a profiler and keep the profile in the ring buffer.
+
+    Must be called from the thread doing the work: cProfile only sees the thread
+    it was enabled in, and the sampler watches the calling thread.
+
+    Args:
+        mode (str): "cprofile" (deterministic, pstats output) or "sampling"
+            (low overhead stack sampling, speedscope output).
+        label (str): Description of the profiled request.
+        func (Callable): Work to profile.
+
+    Returns:
+        tuple: The result of `func` and the id of the stored profile.
+    """
+    started = time.perf_counter()
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *args)
+        profiler.create_stats()
+        data = profiler.stats
+    else:
+        sampler = _StackSampler(threading.get_ident(), SAMPLING_INTERVAL)
+        sampler.start()
+        try:
+            result = func(*args)
+        finally:
+            sampler.stop()
+        data = sampler.speedscope(label)
+    profile = CapturedProfile(mode, label, time.perf_counter() - started, data)
+    store.add(profile)
+    return result, profile.id
+
+
+class _StackSampler(threading.Thread):
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []
+        self.frame_index = {}
+        self.samples = []
+        self.weights = []
+        self._stopped = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                self.samples.append(self._stack(frame))
+                self.weights.append(now - last)
+            last = now
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            if key not in self.frame_index:
+                self.frame_index[key] = len(self.frames)
+                self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+            stack.append(self.frame_index[key])
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def speedscope(self, label):
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": label,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+            "name": label,
+            "exporter": "btc-data-api",
+        }
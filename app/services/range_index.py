@@ -0,0 +1,272 @@
+import numpy as np
+
+
+class Growable:
+    """
+    Append-only float64 array with amortized O(1) appends.
+
+    Appends write past the current size in place, so views taken earlier (which
+    stop at their own size) are never affected; growing or trimming allocates a
+    new buffer.
+    """
+
+    def __init__(self, values=(), dtype=np.float64):
+        self.data = np.asarray(values, dtype=dtype).copy()
+        self.size = len(self.data)
+
+    def append(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        end = self.size + len(values)
+        if end > len(self.data):
+            grown = np.empty(max(end, 2 * len(self.data), 1024), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:end] = values
+        self.size = end
+
+    def drop_front(self, count):
+        self.data = self.data[count:self.size].copy()
+        self.size = len(self.data)
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class RangeIndex:
+    """
+    Range-query index over a contiguous run of candles.
+
+    Prefix sums (of Close, Close², Volume and money flow volume) turn any window
+    sum into one subtraction, and sparse tables of High and Low answer any window
+    max/min with two overlapping power-of-two blocks.
+    Both grow incrementally as candles are appended: only the entries whose window
+    reaches the new candles are computed.
+
+    Sparse tables take one array per power of two, so they stop at `max_window`;
+    longer windows are left to the pandas kernels.
+    """
+
+    PREFIXES = ("close", "close_squared", "volume", "mf_volume", "mf_invalid")
+
+    def __init__(self, max_window=512, column=None):
+        """
+        Args:
+            max_window (int): Longest window the sparse tables answer.
+            column (callable, optional): `column(name, initial)` returning the
+                Growable-like array stored under `name`; in-memory Growables by
+                default. Arrays that already hold candles resume the index.
+        """
+        column = column or (lambda name, initial=(): Growable(initial))
+        self.levels = max(int(max_window).bit_length(), 1)
+        self.max_window = (1 << self.levels) - 1
+        self.close = column("close")
+        self.prefix = {name: column(f"prefix_{name}", [0.0]) for name in self.PREFIXES}
+        self.highs = [column(f"high_{level}") for level in range(self.levels)]
+        self.lows = [column(f"low_{level}") for level in range(self.levels)]
+        self.count = self.close.size
+        # Sums of Close are taken relative to the first close: squares of raw prices
+        # would lose the variance of a window to rounding.
+        self.base = float(self.close.data[0]) if self.count else None
+
+    def extend(self, high, low, close, volume):
+        """Index the next candles, given as equally long float arrays."""
+        high, low, close, volume = (np.asarray(values, dtype=np.float64) for values in (high, low, close, volume))
+        if not len(close):
+            return
+        if self.base is None:
+            self.base = float(close[0])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            money_flow = ((close - low) - (high - close)) / (high - low) * volume
+        invalid = ~np.isfinite(money_flow)
+        shifted = close - self.base
+        terms = {
+            "close": shifted,
+            "close_squared": shifted * shifted,
+            "volume": volume,
+            "mf_volume": np.where(invalid, 0.0, money_flow),
+            "mf_invalid": invalid.astype(np.float64),
+        }
+        for name, values in terms.items():
+            prefix = self.prefix[name]
+            prefix.append(prefix.data[prefix.size - 1] + np.cumsum(values))
+
+        self.close.append(close)
+        self.count += len(close)
+        self.highs[0].append(high)
+        self.lows[0].append(low)
+        for level in range(1, self.levels):
+            half = 1 << (level - 1)
+            for tables, combine in ((self.highs, np.maximum), (self.lows, np.minimum)):
+                table, previous = tables[level], tables[level - 1].view()
+                end = self.count - (1 << level) + 1
+                if end > table.size:
+                    table.append(combine(previous[table.size:end], previous[table.size + half:end + half]))
+
+    def drop_front(self, count):
+        """Forget the oldest candles; positions shift down by `count`."""
+        self.count -= count
+        self.close.drop_front(count)
+        for prefix in self.prefix.values():
+            prefix.drop_front(count)
+        for table in self.highs + self.lows:
+            table.drop_front(min(count, table.size))
+
+    def view(self):
+        """Consistent read-only snapshot, safe to use while candles are appended."""
+        return RangeIndexView(self)
+
+
+class RangeIndexView:
+    """Snapshot of a RangeIndex; positions are 0-based over its candles."""
+
+    def __init__(self, index):
+        self.count = index.count
+        self.base = index.base
+        self.max_window = index.max_window
+        self.close = index.close.view()
+        self.prefix = {name: prefix.view() for name, prefix in index.prefix.items()}
+        self.highs = [table.view() for table in index.highs]
+        self.lows = [table.view() for table in index.lows]
+
+    def window_sum(self, name, positions, window):
+        """Sum of `window` values ending at each position; NaN without enough history."""
+        prefix = self.prefix[name]
+        starts = positions - window + 1
+        valid = starts >= 0
+        sums = prefix[positions + 1] - prefix[np.where(valid, starts, 0)]
+        return np.where(valid, sums, np.nan)
+
+    def window_max(self, positions, window):
+        return self._window(self.highs, np.maximum, positions, window)
+
+    def window_min(self, positions, window):
+        return self._window(self.lows, np.minimum, positions, window)
+
+    def _window(self, tables, combine, positions, window):
+        level = window.bit_length() - 1
+        table = tables[level]
+        if not len(table):
+            # Fewer candles than the block size: no window is full yet.
+            return np.full(len(positions), np.nan)
+        starts = positions - window + 1
+        valid = starts >= 0
+        # Both blocks lie inside the table wherever the window is full.
+        result = combine(table[np.where(valid, starts, 0)], table[np.where(valid, positions - (1 << level) + 1, 0)])
+        return np.where(valid, result, np.nan)
+
+
+# Index-backed versions of CalculateIndicators methods: (view, positions, first,
+# last, *args) -> {column: values}. `positions` are those of the rows passed to the
+# method, `first`/`last` the first and last of them (for shifts).
+
+def _sma(view, positions, first, last, period):
+    return {f"SMA_{period}": view.base + view.window_sum("close", positions, period) / period}
+
+
+def _bb(view, positions, first, last, period):
+    sums = view.window_sum("close", positions, period)
+    squares = view.window_sum("close_squared", positions, period)
+    middle = view.base + sums / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = np.sqrt(np.maximum(squares - sums * sums / period, 0.0) / (period - 1))
+    return {
+        f"Middle_Band_{period}": middle,
+        f"Upper_Band_{period}": middle + 2 * deviation,
+        f"Lower_Band_{period}": middle - 2 * deviation,
+    }
+
+
+def _dc(view, positions, first, last, period):
+    upper = view.window_max(positions, period)
+    lower = view.window_min(positions, period)
+    return {
+        f"Donchian_Upper_{period}": upper,
+        f"Donchian_Lower_{period}": lower,
+        f"Donchian_Mid_{period}": (upper + lower) / 2,
+    }
+
+
+def _wil(view, positions, first, last, period):
+    high, low = view.window_max(positions, period), view.window_min(positions, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {f"WIL_{period}": (high - view.close[positions]) / (high - low) * -100}
+
+
+def _so(view, positions, first, last, period):
+    high, low = view.window_max(positions, period), view.window_min(positions, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {f"SO_%K_{period}": (view.close[positions] - low) / (high - low) * 100}
+
+
+def _cmf(view, positions, first, last, period):
+    money_flow = view.window_sum("mf_volume", positions, period)
+    invalid = view.window_sum("mf_invalid", positions, period)
+    volume = view.window_sum("volume", positions, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {f"CMF_{period}": np.where(invalid > 0, np.nan, money_flow / volume)}
+
+
+def _ic(view, positions, first, last):
+    def midpoint(window):
+        return (view.window_max(positions, window) + view.window_min(positions, window)) / 2
+
+    tenkan, kijun = midpoint(9), midpoint(26)
+    # Shifts stay within the rows passed, like the pandas version.
+    span_a = np.full(len(positions), np.nan)
+    span_a[26:] = ((tenkan + kijun) / 2)[:-26]
+    chikou = np.full(len(positions), np.nan)
+    chikou[:-26] = view.close[positions[26:]]
+    return {
+        "Tenkan_sen": tenkan,
+        "Kijun_sen": kijun,
+        "Senkou_Span_A": span_a,
+        "Senkou_Span_B": midpoint(52),
+        "Chikou_Span": chikou,
+    }
+
+
+KERNELS = {
+    "sma": _sma,
+    "bb": _bb,
+    "dc": _dc,
+    "wil": _wil,
+    "so": _so,
+    "cmf": _cmf,
+    "ic": _ic,
+}
+# Kernels reading the sparse tables, and the longest window each call needs.
+_TABLE_WINDOWS = {"dc": lambda period: period, "wil": lambda period: period, "so": lambda period: period, "ic": lambda: 52}
+
+
+def supports(view, key, args):
+    """Whether the call `key(*args)` can be answered from the index."""
+    if key not in KERNELS:
+        return False
+    return key not in _TABLE_WINDOWS or _TABLE_WINDOWS[key](*args) <= view.max_window
+
+
+def apply(view, key, args, rows, first, fill_value):
+    """
+    Add the columns of an index-backed call to rows at consecutive positions.
+
+    Args:
+        view (RangeIndexView): Index snapshot the rows were read from.
+        key (str): Indicator key, see `KERNELS`.
+        args (tuple): Indicator arguments.
+        rows (list): Rows at positions `first`, `first + 1`, ...
+        first (int): Position of the first row.
+        fill_value: Value of cells that cannot be computed; None keeps NaN.
+
+    Returns:
+        list: The same rows, with the indicator columns.
+    """
+    last = first + len(rows) - 1
+    positions = np.arange(first, last + 1)
+    for column, values in KERNELS[key](view, positions, first, last, *args).items():
+        values = np.where(np.isfinite(values), values, np.nan)
+        if fill_value is not None:
+            values = np.nan_to_num(values, nan=fill_value)
+        for row, value in zip(rows, values.tolist()):
+            row[column] = value
+    return rows
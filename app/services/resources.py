@@ -0,0 +1,107 @@
+import importlib
+import threading
+import time
+
+from app import debug_logger
+
+
+class Resources:
+    """
+    Heavy, process-wide resources created after startup instead of at import.
+
+    The candle client (GCP auth, BigQuery transport), the materialized indicator
+    store and the numeric stack (pandas, numpy) are built by `warm_up`, which the
+    app lifespan runs in the background so the server accepts connections
+    immediately. Anything that needs a resource before warm-up finished simply
+    builds it on first use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._store = None
+        self._store_built = False
+        # Overridable for load tests and benchmarks; default to create_candle_client
+        # and create_indicator_store.
+        self.client_factory = None
+        self.store_factory = None
+        self.ready = False
+        self.error = None
+        self.warm_up_seconds = None
+
+    def candle_client(self):
+        """
+        Return the candle client, creating it on first use.
+
+        Returns:
+            CandleClient: The process-wide client.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    factory = self.client_factory
+                    if factory is None:
+                        from app.services.candle_clients import create_candle_client as factory
+                    self._client = factory()
+        return self._client
+
+    def indicator_store(self):
+        """
+        Return the materialized indicator store, creating it on first use.
+
+        Returns:
+            IndicatorStore: The process-wide store, None if materialization is off.
+        """
+        if not self._store_built:
+            with self._lock:
+                if not self._store_built:
+                    factory = self.store_factory
+                    if factory is None:
+                        from app.services.indicator_store import create_indicator_store as factory
+                    self._store = factory()
+                    self._store_built = True
+        return self._store
+
+    def warm_up(self):
+        """Import the numeric stack and build the candle client and store. Blocking."""
+        started = time.perf_counter()
+        try:
+            importlib.import_module("app.services.calculators")
+            # Loads the configured engine (numba compiles its loops here).
+            importlib.import_module("app.services.indicator_engines").create_calculator()
+            self.candle_client()
+            self.indicator_store()
+        except Exception as exc:
+            self.error = repr(exc)
+            debug_logger.exception("Warm-up failed; resources will be retried on first use.")
+            return
+        self.error = None
+        self.warm_up_seconds = time.perf_counter() - started
+        self.ready = True
+
+    def close(self):
+        """Release the candle client and store, if they were ever created."""
+        with self._lock:
+            client, self._client = self._client, None
+            store, self._store, self._store_built = self._store, None, False
+            self.ready = False
+        for resource in (client, store):
+            close = getattr(resource, "close", None)
+            if close is not None:
+                close()
+
+    def status(self):
+        """
+        Describe the warm-up state for the readiness endpoint.
+
+        Returns:
+            dict: Readiness flag, warm-up duration and the last warm-up error.
+        """
+        return {
+            "ready": self.ready,
+            "warm_up_seconds": self.warm_up_seconds,
+            "error": self.error,
+        }
+
+
+resources = Resources()
@@ -1,30 +1,20 @@
-from datetime import datetime
+from app.utils import Columns
 
-def transform_query_job(query_job):
+def transform_query_job(query_job, columns=None):
     """
     Transform BigQuery query results into JSON format.
 
     Args:
         query_job: QueryJob object containing the results from BigQuery.
+        columns (list[str], optional): Columns to keep, all `Columns` by default.
 
     Returns:
-        str: JSON string representation of the transformed data.
+        list: JSON-like data (list of dictionaries) sorted by 'Open_time'.
     """
+    columns = columns or [col.value for col in Columns]
 
     transformed_data = [
-        {
-            "Open_time": row['Open_time'],
-            "Open": row['Open'],
-            "High": row['High'],
-            "Low": row['Low'],
-            "Close": row['Close'],
-            "Volume": row['Volume'],
-            "Close_time": row['Close_time'],
-            "Quote_Asset_Volume": row['Quote_Asset_Volume'],
-            "Number_of_Trades": row['Number_of_Trades'],
-            "Taker_Buy_Base_Asset_Volume": row['Taker_Buy_Base_Asset_Volume'],
-            "Taker_Buy_Quote_Asset_Volume": row['Taker_Buy_Quote_Asset_Volume'],
-        }
+        {column: row[column] for column in columns}
         for row in query_job
     ]
 
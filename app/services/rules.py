@@ -0,0 +1,141 @@
+import ast
+import operator
+
+MAX_LENGTH = 1000
+
+_COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+class Rule:
+    """
+    Boolean expression over candle and indicator columns, evaluated vectorized.
+
+    The grammar is a small subset of Python expressions: column names, numbers,
+    `+ - * /`, comparisons (chains included), `and`, `or`, `not` and parentheses,
+    plus two functions: `prev(expression, n=1)`, the value `n` candles earlier, and
+    `col("name")` for columns that are not identifiers (e.g. `col("SO_%K_14")`).
+
+    Example: `RSI_14 < 30 and Close > SMA_200`, or a golden cross with
+    `SMA_50 > SMA_200 and prev(SMA_50) <= prev(SMA_200)`.
+    """
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): Rule source.
+
+        Raises:
+            ValueError: If the expression is too long, not valid Python or uses
+                anything outside the grammar.
+        """
+        if len(expression) > MAX_LENGTH:
+            raise ValueError(f"Rules are limited to {MAX_LENGTH} characters.")
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid rule {expression!r}: {exc.msg}.")
+        self.expression = expression
+        self.names = set()
+        self._check(tree.body)
+        self._tree = tree.body
+
+    def evaluate(self, frame):
+        """
+        Evaluate the rule on every row.
+
+        Args:
+            frame (pandas.DataFrame): Holds every column in `names`; NaN compares false.
+
+        Returns:
+            pandas.Series: Boolean mask of the rows where the rule holds.
+        """
+        try:
+            result = self._evaluate(self._tree, frame)
+        except TypeError:
+            raise ValueError(f"Rule {self.expression!r} mixes conditions and numbers, e.g. `not Close`.")
+        if not hasattr(result, "astype"):
+            raise ValueError(f"Rule {self.expression!r} does not depend on any column.")
+        return result.astype(bool)
+
+    def _check(self, node):
+        if isinstance(node, ast.BoolOp):
+            children = node.values
+        elif isinstance(node, ast.Compare):
+            if not all(type(op) in _COMPARISONS for op in node.ops):
+                raise self._unsupported(node)
+            children = [node.left, *node.comparators]
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+            children = [node.operand]
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            children = [node.left, node.right]
+        elif isinstance(node, ast.Name):
+            self.names.add(node.id)
+            children = []
+        elif isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            children = []
+        elif self._is_call(node, "col"):
+            name = node.args[0] if len(node.args) == 1 else None
+            if node.keywords or not (isinstance(name, ast.Constant) and isinstance(name.value, str)):
+                raise ValueError('col() takes one quoted column name, e.g. col("SO_%K_14").')
+            self.names.add(name.value)
+            children = []
+        elif self._is_call(node, "prev"):
+            periods = node.args[1] if len(node.args) == 2 else ast.Constant(1)
+            valid_periods = isinstance(periods, ast.Constant) and type(periods.value) is int and periods.value > 0
+            if not 1 <= len(node.args) <= 2 or node.keywords or not valid_periods:
+                raise ValueError("prev() takes an expression and an optional positive number of candles.")
+            children = [node.args[0]]
+        else:
+            raise self._unsupported(node)
+        for child in children:
+            self._check(child)
+
+    def _evaluate(self, node, frame):
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = self._evaluate(node.values[0], frame)
+            for value in node.values[1:]:
+                result = combine(result, self._evaluate(value, frame))
+            return result
+        if isinstance(node, ast.Compare):
+            operands = [self._evaluate(operand, frame) for operand in [node.left, *node.comparators]]
+            result = None
+            for op, left, right in zip(node.ops, operands, operands[1:]):
+                step = _COMPARISONS[type(op)](left, right)
+                result = step if result is None else result & step
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, frame)
+            return ~operand if isinstance(node.op, ast.Not) else -operand
+        if isinstance(node, ast.BinOp):
+            return _ARITHMETIC[type(node.op)](self._evaluate(node.left, frame), self._evaluate(node.right, frame))
+        if isinstance(node, ast.Name):
+            return frame[node.id]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if self._is_call(node, "col"):
+            return frame[node.args[0].value]
+        periods = node.args[1].value if len(node.args) == 2 else 1
+        series = self._evaluate(node.args[0], frame)
+        # Conditions stay boolean: there is no earlier candle to satisfy them.
+        return series.shift(periods, fill_value=False) if series.dtype == bool else series.shift(periods)
+
+    @staticmethod
+    def _is_call(node, name):
+        return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+    def _unsupported(self, node):
+        return ValueError(f"Unsupported syntax in rule {self.expression!r}: {ast.unparse(node)!r}.")
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.services.candle_clients import CandleClient, CandleResult
+from app.utils import Columns, naive_utc
+
+OPEN_TIME = Columns.OPEN_TIME.value
+
+
+def month_shards(start, end):
+    """
+    Split a range into calendar-month shards.
+
+    Args:
+        start (datetime): First open time.
+        end (datetime): Last open time, inclusive.
+
+    Returns:
+        list: (start, end) pairs covering the range in order, without overlap: each
+        shard ends one microsecond before the next month begins.
+    """
+    shards = []
+    while start <= end:
+        following = datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=start.tzinfo)
+        shard_end = min(end, following - timedelta(microseconds=1))
+        shards.append((start, shard_end))
+        start = following
+    return shards
+
+
+class ShardedCandleClient(CandleClient):
+    """
+    Candle client fetching long ranges as concurrent per-month queries.
+
+    One query over years of candles is a long serial scan followed by a
+    single-threaded download. Ranges longer than `threshold` are split into
+    calendar months instead, fetched from the wrapped client by at most
+    `parallelism` threads and concatenated in order. Only the first shard
+    carries the warm-up candles. With a limit, shards are fetched a wave of
+    `parallelism` at a time until enough candles are in.
+
+    Sits below the candle cache, so only the ranges the cache misses are split.
+    """
+
+    def __init__(self, client, threshold=timedelta(days=62), parallelism=8):
+        """
+        Args:
+            client (CandleClient): Source of every shard; must be thread-safe.
+            threshold (timedelta): Ranges up to this long are fetched in one query.
+            parallelism (int): Shards fetched at once.
+        """
+        self.client = client
+        self.threshold = threshold
+        self.parallelism = parallelism
+        self._pool = ThreadPoolExecutor(parallelism, thread_name_prefix="candle-shard")
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        shards = month_shards(start, end)
+        if end - start <= self.threshold or len(shards) < 2:
+            return self.client.fetch_candles(symbol, start, end, columns, lookback, limit)
+
+        result = CandleResult()
+        scanned = warmup = 0
+        wave = self.parallelism if limit else len(shards)
+        for offset in range(0, len(shards), wave):
+            futures = [
+                self._pool.submit(
+                    self.client.fetch_candles, symbol, first, last, columns, lookback if first == start else 0, limit
+                )
+                for first, last in shards[offset:offset + wave]
+            ]
+            for future in futures:
+                part = future.result()
+                scanned += getattr(part, "total_bytes_processed", None) or 0
+                result.extend(part)
+            if offset == 0 and lookback:
+                warmup = sum(1 for row in result if naive_utc(row[OPEN_TIME]) < start)
+            if limit and len(result) - warmup >= limit:
+                del result[warmup + limit:]
+                break
+        result.total_bytes_processed = scanned
+        return result
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,325 @@
+import fcntl
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.services.candle_cache import DTYPES, CandleSnapshot, candle_arrays, settled_until
+from app.services.candle_clients import CandleClient, CandleResult
+from app.services.range_index import RangeIndex
+from app.utils import Columns
+
+OPEN_TIME = Columns.OPEN_TIME.value
+
+# Slots of the int64 header of a symbol. The writer fills the column files first
+# and publishes them by bumping COUNT, then COMPLETE_UNTIL: a reader that sees a
+# count also sees every value below it.
+MAGIC, GENERATION, COUNT, COMPLETE_UNTIL, LEVELS, HISTORY_START = range(6)
+HEADER_SLOTS = 8
+MAGIC_VALUE = 0x43414E444C4553  # "CANDLES"
+
+
+def _sizes(levels, count):
+    """Length of every stored array once `count` candles are indexed."""
+    sizes = {col.value: count for col in Columns}
+    sizes["close"] = count
+    sizes.update({f"prefix_{name}": count + 1 for name in RangeIndex.PREFIXES})
+    for level in range(levels):
+        sizes[f"high_{level}"] = sizes[f"low_{level}"] = max(count - (1 << level) + 1, 0)
+    return sizes
+
+
+def _dtype(name):
+    return np.dtype(DTYPES.get(name, "float64"))
+
+
+class MappedColumn:
+    """Growable-like array in a file of fixed capacity, shared through mmap."""
+
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+
+    def append(self, values):
+        end = self.size + len(values)
+        self.data[self.size:end] = values
+        self.size = end
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class SharedCandleWriter:
+    """
+    Single writer of a symbol's shared candle files.
+
+    Layout of `<directory>/<symbol>/`: an int64 `header`, and one raw array file
+    per candle column and RangeIndex array under `<generation>/`, preallocated to
+    a capacity. Candles are appended in place; when the capacity runs out, the
+    arrays are copied into a twice larger generation and the header switched to
+    it. An exclusive lock keeps a second writer out.
+    """
+
+    def __init__(self, directory, symbol, max_window=512, capacity=1 << 20, settle_margin=timedelta(minutes=2)):
+        """
+        Args:
+            directory (str): Root of the shared files, ideally on tmpfs (/dev/shm).
+            symbol (str): Lower-case pair name.
+            max_window (int): Longest sparse-table window, fixed when the files are created.
+            capacity (int): Initial number of candles the files hold.
+            settle_margin (timedelta): Time before the newest candle fetched from
+                which candles may still be missing in the source, see `settled_until`.
+
+        Raises:
+            RuntimeError: If another writer holds the symbol.
+        """
+        self.settle_margin = settle_margin
+        self.path = os.path.join(directory, symbol)
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = open(os.path.join(self.path, "lock"), "w")
+        try:
+            fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock.close()
+            raise RuntimeError(f"Another refresher is writing the shared candles of {symbol}.")
+
+        header = os.path.join(self.path, "header")
+        created = not os.path.exists(header)
+        self.header = np.memmap(header, np.int64, "w+" if created else "r+", shape=(HEADER_SLOTS,))
+        if created:
+            self.header[LEVELS] = max(int(max_window).bit_length(), 1)
+            self.header[MAGIC] = MAGIC_VALUE
+        self.levels = int(self.header[LEVELS])
+        self._open(int(self.header[GENERATION]), capacity)
+
+    @property
+    def count(self):
+        return int(self.header[COUNT])
+
+    def last(self):
+        """Open time of the newest candle, None when empty."""
+        return _datetime(self.columns[OPEN_TIME].data[self.count - 1]) if self.count else None
+
+    def complete_until(self):
+        return _datetime(self.header[COMPLETE_UNTIL]) if self.count else None
+
+    def append(self, results, end, history_start=False):
+        """
+        Append the settled candles of a client result opened after the newest one.
+
+        Args:
+            results: Client rows, sorted by open time.
+            end (datetime): Last open time the rows were fetched up to. Candles up
+                to `settled_until` of it are held, newer ones are left for the next
+                refresh.
+            history_start (bool): Whether these are the first candles of the symbol's
+                history (only used for the first append).
+
+        Returns:
+            int: Number of candles appended.
+        """
+        times, columns = candle_arrays(results)
+        complete_until = settled_until(times, end, self.settle_margin)
+        if complete_until is None:
+            return 0
+        keep = times <= np.datetime64(complete_until, "ns")
+        if self.count:
+            keep &= times > self.columns[OPEN_TIME].data[self.count - 1]
+        times, columns = times[keep], {name: values[keep] for name, values in columns.items()}
+        if len(times):
+            self._reserve(self.count + len(times))
+            self.columns[OPEN_TIME].append(times)
+            for name, values in columns.items():
+                self.columns[name].append(values)
+            self.index.extend(
+                columns[Columns.HIGH.value], columns[Columns.LOW.value],
+                columns[Columns.CLOSE.value], columns[Columns.VOLUME.value],
+            )
+            if not self.count:
+                self.header[HISTORY_START] = int(history_start)
+            self.header[COUNT] = self.index.count
+        if self.count:
+            self.header[COMPLETE_UNTIL] = max(int(self.header[COMPLETE_UNTIL]), _nanoseconds(complete_until))
+        return len(times)
+
+    def close(self):
+        self.header.flush()
+        self._lock.close()
+
+    def _open(self, generation, capacity):
+        directory = os.path.join(self.path, str(generation))
+        os.makedirs(directory, exist_ok=True)
+        sizes = _sizes(self.levels, self.count)
+        self.columns = {}
+        for name, size in sizes.items():
+            path = os.path.join(directory, f"{name}.bin")
+            if os.path.exists(path):
+                data = np.memmap(path, _dtype(name), "r+")
+            else:
+                # New files are zero-filled: the leading 0 of every prefix sum included.
+                data = np.memmap(path, _dtype(name), "w+", shape=(max(capacity, size + 1),))
+            self.columns[name] = MappedColumn(data, size)
+        self.capacity = min(len(column.data) for column in self.columns.values())
+        self.index = RangeIndex((1 << self.levels) - 1, column=lambda name, initial=(): self.columns[name])
+
+    def _reserve(self, count):
+        # Prefix sums hold one value more than there are candles.
+        if count + 1 <= self.capacity:
+            return
+        old = int(self.header[GENERATION])
+        capacity = max(2 * self.capacity, count + 1)
+        directory = os.path.join(self.path, str(old + 1))
+        os.makedirs(directory, exist_ok=True)
+        for name, column in self.columns.items():
+            data = np.memmap(os.path.join(directory, f"{name}.bin"), _dtype(name), "w+", shape=(capacity,))
+            data[:column.size] = column.view()
+            data.flush()
+        self.header[GENERATION] = old + 1
+        self._open(old + 1, capacity)
+        # Readers still mapping the old files keep them until they switch.
+        shutil.rmtree(os.path.join(self.path, str(old)), ignore_errors=True)
+
+
+class SharedCandleReader:
+    """Zero-copy reader of the files of SharedCandleWriter, one per worker."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._maps = {}
+
+    def snapshot(self, symbol):
+        """
+        Return the candles currently published for a symbol.
+
+        Returns:
+            SharedSnapshot: Views into the shared files, None if there are none.
+        """
+        header = self._header(symbol)
+        if header is None:
+            return None
+        for _ in range(3):
+            generation = int(header[GENERATION])
+            try:
+                maps = self._mapped(symbol, generation)
+            except FileNotFoundError:
+                continue  # the writer just moved to a new generation
+            complete_until, count = int(header[COMPLETE_UNTIL]), int(header[COUNT])
+            if int(header[GENERATION]) != generation:
+                continue
+            if not count:
+                return None
+            levels = int(header[LEVELS])
+            sizes = _sizes(levels, count)
+            index = RangeIndex(
+                (1 << levels) - 1, column=lambda name, initial=(): MappedColumn(maps[name], sizes[name])
+            )
+            columns = {name: maps[name][:count] for name in _sizes(0, 0) if name != OPEN_TIME}
+            return SharedSnapshot(
+                maps[OPEN_TIME][:count], columns, index.view(), _datetime(complete_until), bool(header[HISTORY_START])
+            )
+        return None
+
+    def _header(self, symbol):
+        cached = self._maps.get(symbol)
+        if cached is None:
+            path = os.path.join(self.directory, symbol, "header")
+            if not os.path.exists(path):
+                return None
+            header = np.memmap(path, np.int64, "r", shape=(HEADER_SLOTS,))
+            if header[MAGIC] != MAGIC_VALUE:
+                return None
+            cached = self._maps[symbol] = (header, None, None)
+        return cached[0]
+
+    def _mapped(self, symbol, generation):
+        header, mapped_generation, maps = self._maps[symbol]
+        if mapped_generation != generation:
+            directory = os.path.join(self.directory, symbol, str(generation))
+            names = _sizes(int(header[LEVELS]), 0)
+            maps = {name: np.memmap(os.path.join(directory, f"{name}.bin"), _dtype(name), "r") for name in names}
+            self._maps[symbol] = (header, generation, maps)
+        return maps
+
+
+class SharedSnapshot(CandleSnapshot):
+    def __init__(self, times, columns, index, complete_until, history_start):
+        super().__init__(times, columns, index)
+        self.complete_until = complete_until
+        self.history_start = history_start
+
+    def serves(self, start, lookback):
+        """Whether `start` and `lookback` candles before it are all held."""
+        if start > self.complete_until:
+            return False
+        if self.history_start:
+            return True
+        return self.times[0] <= np.datetime64(start, "ns") and self.position(start) >= lookback
+
+
+class SharedCandleCache(CandleClient):
+    """
+    Candle client reading the shared files a refresher process keeps up to date.
+
+    Every worker maps the same files, so the history is held once in memory
+    whatever the number of workers, and requests slice it without copying.
+    Ranges the files do not hold are fetched from the wrapped client; candles
+    newer than the last refresh are too, unless it is at most `max_staleness` old.
+    """
+
+    def __init__(self, client, directory, max_staleness=timedelta(seconds=60), settle_margin=timedelta(minutes=2)):
+        """
+        Args:
+            client (CandleClient): Source of the candles the files do not hold.
+            directory (str): Root of the shared files, see SharedCandleWriter.
+            max_staleness (timedelta): Age of the last refresh up to which newer
+                candles are not fetched.
+            settle_margin (timedelta): Distance the writer keeps between the
+                newest candle it fetched and `complete_until`.
+        """
+        self.client = client
+        self.reader = SharedCandleReader(directory)
+        self.max_staleness = max_staleness
+        self.settle_margin = settle_margin
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        snapshot = self.reader.snapshot(symbol)
+        if snapshot is None or not snapshot.serves(start, lookback):
+            return self.client.fetch_candles(symbol, start, end, columns, lookback, limit)
+
+        result = snapshot.read(start, min(end, snapshot.complete_until), columns, lookback, limit)
+        held = len(result) - min(lookback, snapshot.position(start))
+        if end <= snapshot.complete_until or (limit and held >= limit):
+            return result
+        # The last refresh fetched up to `settle_margin` past `complete_until`.
+        if datetime.utcnow() - snapshot.complete_until - self.settle_margin <= self.max_staleness:
+            return result
+
+        # Candles opened since the last refresh; one extra for the candle at
+        # `complete_until`, which is held already.
+        tail = self.client.fetch_candles(
+            symbol, snapshot.complete_until, end, limit=limit - held + 1 if limit else None
+        )
+        times, arrays = candle_arrays(tail)
+        keep = times > snapshot.complete_until
+        rows = CandleSnapshot(times[keep], {name: values[keep] for name, values in arrays.items()}).read(
+            snapshot.complete_until, end, columns, 0, limit - held if limit else None
+        )
+        if not rows:
+            return result
+        combined = CandleResult([*result, *rows])
+        combined.total_bytes_processed = getattr(tail, "total_bytes_processed", None) or 0
+        return combined
+
+    def close(self):
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def _nanoseconds(value):
+    return int(np.datetime64(value, "ns").astype(np.int64))
+
+
+def _datetime(value):
+    return np.datetime64(int(value), "ns").astype("datetime64[us]").item()
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.services.metrics import SINGLE_FLIGHT_CALLS
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share the same key.
+
+    The first caller for a key runs the computation; callers arriving while it is
+    still in flight wait for the same result instead of starting their own.
+    Nothing is cached: once the computation finishes, the next call runs again.
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Label used for this group in the exported metrics.
+        """
+        self.name = name
+        self._in_flight = {}
+
+    async def do(self, key, func):
+        """
+        Run `func` once for all concurrent callers using `key`.
+
+        Args:
+            key (Hashable): Normalized identity of the call.
+            func (Callable[[], Awaitable]): Coroutine factory doing the actual work.
+
+        Returns:
+            Any: The result of the shared computation.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            SINGLE_FLIGHT_CALLS.labels(self.name, "coalesced").inc()
+        else:
+            SINGLE_FLIGHT_CALLS.labels(self.name, "executed").inc()
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so a disconnecting client does not cancel the work for the others.
+        return await asyncio.shield(task)
+
+    def running(self, key):
+        """Return whether a computation for `key` is in flight."""
+        return key in self._in_flight
+
+    def in_flight(self):
+        """Return the number of computations currently running."""
+        return len(self._in_flight)
+
+    def _forget(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away.
+            task.exception()
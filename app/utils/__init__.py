@@ -1,3 +1,6 @@
-__all__ = ["Columns"]
+__all__ = ["Columns", "SYMBOLS", "encode_json", "naive_utc", "parse_time"]
 
 from app.utils.enums import Columns
+from app.utils.json_encoding import encode_json
+from app.utils.symbols import SYMBOLS
+from app.utils.time_bounds import naive_utc, parse_time
@@ -0,0 +1,21 @@
+import json
+from datetime import date, datetime
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content):
+    """
+    Encode a response body the way FastAPI's JSONResponse does.
+
+    Args:
+        content: JSON-like data; datetimes are written in ISO 8601.
+
+    Returns:
+        bytes: Compact UTF-8 JSON.
+    """
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
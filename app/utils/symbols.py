@@ -0,0 +1,2 @@
+# Pairs with candle tables; the default of the jobs and the symbols the routes accept.
+SYMBOLS = ("btcusdt", "ethusdt", "bnbusdt")
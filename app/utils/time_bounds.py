@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+
+def parse_time(value):
+    """
+    Parse a range bound: 'YY-MM-DD' (midnight) or an ISO-8601 date or timestamp.
+
+    Returns:
+        datetime: Naive UTC time.
+
+    Raises:
+        ValueError: If the value is in neither format.
+    """
+    try:
+        return datetime.strptime(value, "%y-%m-%d")
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+    return naive_utc(parsed)
+
+
+def naive_utc(value):
+    """
+    Return a time as naive UTC, the way the API and the candle clients work.
+
+    BigQuery TIMESTAMP columns come back timezone-aware; naive times (and None)
+    are returned as they are. Works for datetimes and pandas Timestamps.
+    """
+    if getattr(value, "tzinfo", None):
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,112 @@
+"""
+Payload size of /data responses as rows and in the compact encoding.
+
+Encodes synthetic minute candles with a typical charting indicator set, with a
+few candles missing, as the default rows, as columns with the open times on a
+grid, and as columns rounded to chart precision; checks that the compact time
+axis restores every Open_time and Close_time.
+
+Usage:
+    python -m benchmarks.compact_encoding [--rows 100000] [--output results.json]
+"""
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.services import CalculateIndicators
+from app.services.compact_encoding import encode_compact, round_rows
+from app.utils import Columns, encode_json
+from benchmarks.suite import environment
+from benchmarks.synthetic import synthetic_candles
+
+OPEN_TIME = Columns.OPEN_TIME.value
+CLOSE_TIME = Columns.CLOSE_TIME.value
+
+# Prices to the cent, volumes to the satoshi, quote volumes to the dollar.
+CHART_DECIMALS = {
+    "*": 2,
+    Columns.VOLUME.value: 8,
+    Columns.TAKER_BUY_BASE_ASSET_VOLUME.value: 8,
+    Columns.QUOTE_ASSET_VOLUME.value: 0,
+    Columns.TAKER_BUY_QUOTE_ASSET_VOLUME.value: 0,
+}
+
+
+def typical_rows(rows):
+    """Candles with a typical charting indicator set and an exchange outage every ~10k candles."""
+    data = synthetic_candles(rows)
+    data = [row for index, row in enumerate(data) if index % 10_000 not in range(5_000, 5_030)]
+    calculate_indicators = CalculateIndicators()
+    for period in (20, 50, 200):
+        data = calculate_indicators.sma(period, data)
+    data = calculate_indicators.rsi(14, data)
+    data = calculate_indicators.bb(20, data)
+    return data
+
+
+def restore_times(time_axis):
+    """Open and close times from a compact time axis."""
+    start = datetime.fromisoformat(time_axis["start"])
+    if "offsets" in time_axis:
+        offsets = time_axis["offsets"]
+    else:
+        gaps, missing, offsets = dict(time_axis["gaps"]), 0, []
+        for index in range(time_axis["count"]):
+            missing += gaps.get(index, 0)
+            offsets.append((index + missing) * time_axis["interval"])
+    opens = [start + timedelta(milliseconds=offset) for offset in offsets]
+    close_offsets = time_axis.get("close_offsets") or [time_axis["close_offset"]] * len(opens)
+    return opens, [open_time + timedelta(milliseconds=offset) for open_time, offset in zip(opens, close_offsets)]
+
+
+def measure(encode):
+    started = time.perf_counter()
+    body = encode()
+    seconds = time.perf_counter() - started
+    return body, {"bytes": len(body), "gzip_bytes": len(gzip.compress(body, 5)), "encode_ms": seconds * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    rows = typical_rows(args.rows)
+    variants = {
+        "rows": lambda: encode_json({"data": rows}),
+        "rows, rounded": lambda: encode_json({"data": round_rows(rows, CHART_DECIMALS)}),
+        "compact": lambda: encode_json(encode_compact(rows)),
+        "compact, rounded": lambda: encode_json(encode_compact(rows, CHART_DECIMALS)),
+    }
+    print(f"payload: {len(rows)} candles, {len(rows[0])} columns")
+    print(f"{'encoding':<18}{'MB':>8}{'ratio':>8}{'gzip MB':>9}{'ratio':>8}{'encode ms':>11}")
+
+    results = []
+    for name, encode in variants.items():
+        body, result = measure(encode)
+        if name.startswith("compact"):
+            opens, closes = restore_times(json.loads(body)["time"])
+            assert opens == [row[OPEN_TIME] for row in rows], "open times differ"
+            assert closes == [row[CLOSE_TIME] for row in rows], "close times differ"
+        baseline = results[0] if results else result
+        result.update(
+            encoding=name,
+            ratio=baseline["bytes"] / result["bytes"],
+            gzip_ratio=baseline["gzip_bytes"] / result["gzip_bytes"],
+        )
+        results.append(result)
+        print(
+            f"{name:<18}{result['bytes'] / 1e6:>8.2f}{result['ratio']:>8.1f}"
+            f"{result['gzip_bytes'] / 1e6:>9.2f}{result['gzip_ratio']:>8.1f}{result['encode_ms']:>11.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Exits with status 1 if any case got slower than the threshold allows.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as file:
+        results = json.load(file)["results"]
+    return {(result["name"], result["rows"]): result for result in results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown of the median.")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+
+    regressions = 0
+    print(f"{'case':<28}{'rows':>10}{'baseline ms':>14}{'candidate ms':>14}{'change':>9}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        if "error" in before or "error" in after:
+            status = "error" if "error" in after else "fixed"
+            print(f"{key[0]:<28}{key[1]:>10}{'':>37}  {status}")
+            regressions += status == "error" and "error" not in before
+            continue
+        change = after["median"] / before["median"] - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{key[0]:<28}{key[1]:>10}{before['median'] * 1000:>14.1f}"
+            f"{after['median'] * 1000:>14.1f}{change:>+9.1%}{flag}"
+        )
+
+    for key in sorted(baseline.keys() - candidate.keys()):
+        print(f"{key[0]:<28}{key[1]:>10}  missing from candidate")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
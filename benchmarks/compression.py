@@ -0,0 +1,85 @@
+"""
+Bytes on the wire and CPU cost of response compression for /data payloads.
+
+Usage:
+    python -m benchmarks.compression [--rows 100000] [--output results.json]
+"""
+import argparse
+import json
+import time
+
+from app.api.middleware.compression import _Brotli, _Gzip, _Zstd, brotli, zstandard
+from app.services import CalculateIndicators
+from benchmarks.synthetic import synthetic_candles
+
+LEVELS = {
+    "gzip": (_Gzip, [1, 5, 9]),
+    "br": (_Brotli, [1, 4, 7]),
+    "zstd": (_Zstd, [1, 3, 9]),
+}
+
+
+def typical_payload(rows):
+    """Encode a /data response with a typical charting indicator set."""
+    data = synthetic_candles(rows)
+    calculate_indicators = CalculateIndicators()
+    for period in (20, 50, 200):
+        data = calculate_indicators.sma(period, data)
+    data = calculate_indicators.ema(21, data)
+    data = calculate_indicators.rsi(14, data)
+    data = calculate_indicators.bb(20, data)
+    data = calculate_indicators.macd(12, 26, 9, data)
+    return json.dumps({"data": data}, default=str).encode()
+
+
+def measure(encoder, body, chunk_size=None):
+    started = time.process_time()
+    if chunk_size is None:
+        compressed = encoder.compress(body) + encoder.finish()
+    else:
+        compressed = b"".join(
+            encoder.compress(body[i:i + chunk_size]) for i in range(0, len(body), chunk_size)
+        ) + encoder.finish()
+    return len(compressed), time.process_time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=None, help="Compress in chunks, as for streamed responses.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    body = typical_payload(args.rows)
+    megabytes = len(body) / 1e6
+    print(f"payload: {args.rows} rows, {megabytes:.1f} MB of JSON")
+    print(f"{'encoding':<10}{'level':>6}{'wire MB':>10}{'ratio':>8}{'CPU ms/MB':>12}")
+
+    results = []
+    for name, (encoder_class, levels) in LEVELS.items():
+        if (name == "br" and brotli is None) or (name == "zstd" and zstandard is None):
+            print(f"{name:<10}{'-':>6}  not installed")
+            continue
+        for level in levels:
+            wire_bytes, cpu_seconds = measure(encoder_class(level), body, args.chunk_size)
+            result = {
+                "encoding": name,
+                "level": level,
+                "input_bytes": len(body),
+                "wire_bytes": wire_bytes,
+                "ratio": len(body) / wire_bytes,
+                "cpu_ms_per_mb": cpu_seconds * 1000 / megabytes,
+            }
+            results.append(result)
+            print(
+                f"{name:<10}{level:>6}{wire_bytes / 1e6:>10.2f}"
+                f"{result['ratio']:>8.1f}{result['cpu_ms_per_mb']:>12.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"rows": args.rows, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Check that every indicator engine matches the pandas engine on every indicator.
+
+Each indicator runs with a few parameter sets on synthetic candles, on flat
+candles (equal prices, zero ranges) and on fewer candles than its window; the
+outputs must have the same columns, in the same order, and values equal within
+the tolerances. Exits non-zero on any mismatch.
+
+The default relative tolerance allows for pandas' running variance, which
+leaves a residue of about 1e-8 of the price on windows of equal closes where
+the array engines give exactly zero.
+
+Usage:
+    python -m benchmarks.engine_conformance [--rows 2000] [--engines numpy numba]
+"""
+import argparse
+import copy
+import sys
+
+import numpy as np
+
+from app.services import indicator_registry
+from app.services.indicator_engines import available_engines, create_calculator
+from benchmarks.synthetic import synthetic_candles
+
+# Parameter sets per indicator, beyond the registry defaults.
+ARGUMENTS = {
+    "macd": [(12, 26, 9), (5, 35, 5)],
+}
+PERIODS = [(1,), (2,), (14,), (200,)]
+
+
+def datasets(rows):
+    candles = synthetic_candles(rows)
+    flat = copy.deepcopy(candles[:300])
+    for row in flat[100:200]:
+        row["Open"] = row["High"] = row["Low"] = row["Close"] = 40_000.0
+    return {"synthetic": candles, "flat": flat, "short": candles[:10]}
+
+
+def calls():
+    for indicator in indicator_registry.INDICATORS:
+        if not indicator.parameters:
+            yield indicator, ()
+        else:
+            for args in ARGUMENTS.get(indicator.key, PERIODS):
+                yield indicator, args
+
+
+def compare(expected, actual, rtol, atol):
+    """Return a description of the first difference, or None."""
+    if len(expected) != len(actual):
+        return f"{len(actual)} rows instead of {len(expected)}"
+    for position, (want, got) in enumerate(zip(expected, actual)):
+        if list(want) != list(got):
+            return f"row {position}: columns {list(got)} instead of {list(want)}"
+        for column, value in want.items():
+            if isinstance(value, float) or isinstance(got[column], float):
+                if not np.isclose(value, got[column], rtol=rtol, atol=atol, equal_nan=True):
+                    return f"row {position}, {column}: {got[column]!r} instead of {value!r}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--engines", nargs="+", default=[engine for engine in available_engines() if engine != "pandas"])
+    parser.add_argument("--rtol", type=float, default=1e-7)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    args = parser.parse_args()
+
+    failures = 0
+    for dataset, candles in datasets(args.rows).items():
+        for fill_value in (0, None):
+            reference = create_calculator("pandas", fill_value)
+            for engine in args.engines:
+                calculator = create_calculator(engine, fill_value)
+                for indicator, call_args in calls():
+                    expected = indicator.apply(reference, call_args, copy.deepcopy(candles))
+                    actual = indicator.apply(calculator, call_args, copy.deepcopy(candles))
+                    difference = compare(expected, actual, args.rtol, args.atol)
+                    if difference:
+                        failures += 1
+                        name = f"{indicator.key}:{','.join(map(str, call_args))}"
+                        print(f"FAIL {engine} {name} on {dataset} (fill {fill_value!r}): {difference}")
+    print(f"{failures} mismatches across engines {', '.join(args.engines)}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
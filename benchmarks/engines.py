@@ -0,0 +1,63 @@
+"""
+Benchmark matrix of the indicator engines: every indicator, engine and size.
+
+Uses the calls of `benchmarks.suite`; the candles are copied outside the timed
+region, since the array engines update their rows in place.
+
+Usage:
+    python -m benchmarks.engines [--sizes 1000 100000] [--engines pandas numpy numba] [--filter sma rsi] [--output engines.json]
+"""
+import argparse
+import copy
+import json
+import time
+
+from app.services.indicator_engines import available_engines, create_calculator
+from benchmarks.suite import INDICATORS, environment
+from benchmarks.synthetic import synthetic_candles
+
+
+def best_of(repeat, candles, call, calculator):
+    timings = []
+    for _ in range(repeat):
+        data = copy.deepcopy(candles)
+        started = time.perf_counter()
+        call(calculator, data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--engines", nargs="+", default=list(available_engines()))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--filter", nargs="+", help="Run only the named indicators.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    calculators = {engine: create_calculator(engine) for engine in args.engines}
+    names = [name for name in INDICATORS if not args.filter or name in args.filter]
+    results = []
+    for rows in args.sizes:
+        candles = synthetic_candles(rows)
+        print(f"\n{rows} candles, best of {args.repeat} (ms)")
+        print(f"{'indicator':<12}" + "".join(f"{engine:>10}" for engine in args.engines))
+        for name in names:
+            timings = {
+                engine: best_of(args.repeat, candles, INDICATORS[name], calculator)
+                for engine, calculator in calculators.items()
+            }
+            print(f"{name:<12}" + "".join(f"{seconds * 1000:>10.1f}" for seconds in timings.values()))
+            results.extend(
+                {"indicator": name, "rows": rows, "engine": engine, "seconds": seconds}
+                for engine, seconds in timings.items()
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput of the kline ingestion job, in candles per second.
+
+Writes --months monthly Binance-style ZIP archives of synthetic minute candles
+(no header, millisecond times, like data.binance.vision), then ingests them into
+Parquet under a temporary directory with each number of worker processes, and
+extrapolates the time of a five-year backfill.
+
+Usage:
+    python -m benchmarks.ingest_klines [--months 24] [--workers 1 2 4] [--output results.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.jobs.ingest_klines import ingest
+from app.services.candle_clients import BINANCE_KLINE_COLUMNS, synthesize_candles
+from app.utils import Columns
+from benchmarks.suite import environment
+
+START = datetime(2020, 1, 1)
+FIVE_YEARS = 5 * 365 * 24 * 60
+
+
+def write_archives(directory, months):
+    paths = []
+    for month in pd.date_range(START, periods=months, freq="MS"):
+        following = month + pd.offsets.MonthBegin()
+        count = int((following - month) / pd.Timedelta(minutes=1))
+        first = int((month - datetime.min) / pd.Timedelta(minutes=1))
+        frame = pd.DataFrame(synthesize_candles("btcusdt", first, count))
+        for column in (Columns.OPEN_TIME.value, Columns.CLOSE_TIME.value):
+            frame[column] = frame[column].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        frame["Ignore"] = 0
+        name = f"BTCUSDT-1m-{month:%Y-%m}"
+        path = os.path.join(directory, f"{name}.zip")
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(f"{name}.csv", frame[BINANCE_KLINE_COLUMNS].to_csv(header=False, index=False))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_archives(directory, args.months)
+        size = sum(os.path.getsize(path) for path in paths) / 2 ** 20
+        print(f"{len(paths)} archives, {size:.0f} MB")
+        print(f"{'workers':>8}{'candles':>10}{'parse s':>9}{'check s':>9}{'write s':>9}{'candles/s':>12}{'5 years':>9}")
+        for workers in args.workers:
+            output = os.path.join(directory, f"parquet-{workers}")
+            started = time.perf_counter()
+            report = ingest(paths, "parquet", output, workers=workers)["btcusdt"]
+            seconds = time.perf_counter() - started
+            rate = report["rows"] / seconds
+            print(
+                f"{workers:>8}{report['rows']:>10}{report['parse_seconds']:>9.2f}{report['check_seconds']:>9.2f}"
+                f"{report['write_seconds']:>9.2f}{rate:>12,.0f}{FIVE_YEARS / rate:>8.0f}s"
+            )
+            results.append({"workers": workers, "rows": report["rows"], "seconds": seconds, **report})
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
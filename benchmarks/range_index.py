@@ -0,0 +1,79 @@
+"""
+Window indicators from the CandleCache range index versus the pandas kernels.
+
+Every call is timed on the same candles twice: with `range_index.apply` on a
+RangeIndex built over them, and with the CalculateIndicators method. The
+appended row measures the incremental cost of indexing new candles.
+
+Usage:
+    python -m benchmarks.range_index [--rows 100000] [--repeat 5] [--output results.json]
+"""
+import argparse
+import copy
+import json
+import time
+
+import numpy as np
+
+from app.services import CalculateIndicators, range_index
+from app.utils import Columns
+from benchmarks.synthetic import synthetic_candles
+
+CALLS = [("sma", (20,)), ("sma", (200,)), ("bb", (20,)), ("dc", (20,)), ("wil", (14,)),
+         ("so", (14,)), ("cmf", (20,)), ("ic", ())]
+
+
+def build_index(rows):
+    index = range_index.RangeIndex()
+    index.extend(*(np.array([row[col.value] for row in rows]) for col in (Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME)))
+    return index
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    candles = synthetic_candles(args.rows)
+    index = build_index(candles)
+    view = index.view()
+    calculate_indicators = CalculateIndicators()
+    print(f"{args.rows} candles")
+    print(f"{'call':<12}{'index ms':>10}{'pandas ms':>11}{'speed-up':>10}")
+
+    results = []
+    for key, call_args in CALLS:
+        rows = copy.deepcopy(candles)
+        indexed = best_of(args.repeat, lambda: range_index.apply(view, key, call_args, rows, 0, 0))
+        computed = best_of(args.repeat, lambda: getattr(calculate_indicators, key)(*call_args, copy.copy(candles)))
+        name = f"{key}:{','.join(map(str, call_args))}" if call_args else key
+        print(f"{name:<12}{indexed * 1000:>10.1f}{computed * 1000:>11.1f}{computed / indexed:>9.1f}x")
+        results.append({"call": name, "index_ms": indexed * 1000, "pandas_ms": computed * 1000})
+
+    # Appending one candle at a time, as a refresh of a live range does.
+    new = synthetic_candles(1000, start=candles[-1][Columns.OPEN_TIME.value])
+    columns = [np.array([row[col.value] for row in new]) for col in (Columns.HIGH, Columns.LOW, Columns.CLOSE, Columns.VOLUME)]
+    started = time.perf_counter()
+    for position in range(len(new)):
+        index.extend(*(values[position:position + 1] for values in columns))
+    append_us = (time.perf_counter() - started) / len(new) * 1e6
+    print(f"append: {append_us:.1f} us per candle")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"rows": args.rows, "calls": results, "append_us": append_us}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
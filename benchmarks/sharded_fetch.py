@@ -0,0 +1,65 @@
+"""
+Wall-clock time of one long candle query versus concurrent monthly shards.
+
+Runs against the local stand-in client with a fixed latency per query (job
+start-up) and a latency per candle (scan and download), and checks that every
+sharded result matches the single query.
+
+Usage:
+    python -m benchmarks.sharded_fetch [--days 730] [--parallelism 1 4 8 16]
+                                       [--latency-ms 1500] [--row-latency-us 10] [--output results.json]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.services.candle_clients import LocalCandleClient
+from app.services.sharded_fetch import ShardedCandleClient
+from benchmarks.suite import environment
+
+START = datetime(2022, 1, 1)
+
+
+def timed(client, end, lookback):
+    started = time.perf_counter()
+    result = client.fetch_candles("btcusdt", START, end, lookback=lookback)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--parallelism", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--latency-ms", type=float, default=1500)
+    parser.add_argument("--row-latency-us", type=float, default=10)
+    parser.add_argument("--lookback", type=int, default=200)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    source = LocalCandleClient(latency=args.latency_ms / 1000, row_latency=args.row_latency_us / 1_000_000)
+    end = START + timedelta(days=args.days) - timedelta(minutes=1)
+    baseline, expected = timed(source, end, args.lookback)
+    print(f"{len(expected)} candles over {args.days} days")
+    print(f"{'parallelism':>12}{'shards':>8}{'seconds':>10}{'speed-up':>10}")
+    print(f"{'one query':>12}{1:>8}{baseline:>10.2f}{1:>10.1f}")
+
+    results = [{"parallelism": 0, "seconds": baseline}]
+    for parallelism in args.parallelism:
+        client = ShardedCandleClient(source, threshold=timedelta(days=1), parallelism=parallelism)
+        queries = source.queries
+        seconds, result = timed(client, end, args.lookback)
+        if result != expected:
+            raise SystemExit(f"Sharded result with parallelism {parallelism} differs from the single query.")
+        shards = source.queries - queries
+        print(f"{parallelism:>12}{shards:>8}{seconds:>10.2f}{baseline / seconds:>10.1f}")
+        results.append({"parallelism": parallelism, "shards": shards, "seconds": seconds})
+        client.close()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
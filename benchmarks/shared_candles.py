@@ -0,0 +1,93 @@
+"""
+Memory of the candle cache as the number of workers grows: shared files vs per process.
+
+Writes the shared files for --rows synthetic candles, then starts N worker
+processes that each read the whole history (touching every page) through
+SharedCandleCache, or load it into their own CandleCache. Reports the total
+proportional set size (PSS, shared pages split between the processes that map
+them) the workers added after start-up.
+
+Usage:
+    python -m benchmarks.shared_candles [--rows 1000000] [--workers 1 2 4 8]
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.services.candle_cache import CandleCache
+from app.services.shared_candles import SharedCandleCache, SharedCandleWriter
+from app.services.candle_clients import LocalCandleClient
+from benchmarks.synthetic import synthetic_candles
+
+START = datetime(2020, 1, 1)
+
+
+def pss_kilobytes(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker(kind, directory, rows, baselines, done):
+    baselines.put(pss_kilobytes(os.getpid()))
+    if kind == "shared":
+        snapshot = SharedCandleCache(None, directory).reader.snapshot("btcusdt")
+    else:
+        cache = CandleCache(LocalCandleClient(), max_rows=rows)
+        cache.fetch_candles("btcusdt", START, START + timedelta(minutes=rows - 1), limit=1)
+        cache.fetch_candles("btcusdt", START, START + timedelta(minutes=rows - 1))
+        snapshot = cache._runs["btcusdt"].snapshot()
+        gc.collect()
+    # Page in every array, as requests over the whole history would; the rows a
+    # request builds are the same either way and not counted.
+    arrays = [snapshot.times, *snapshot.columns.values(), *snapshot.index.prefix.values(), *snapshot.index.highs, *snapshot.index.lows]
+    sum(float(np.sum(array.view(np.int64) if array.dtype.kind == "M" else array)) for array in arrays)
+    baselines.put(None)
+    done.wait()
+
+
+def measure(kind, directory, rows, workers):
+    done = multiprocessing.Event()
+    baselines = multiprocessing.Queue()
+    processes, baseline = [], 0
+    for _ in range(workers):
+        process = multiprocessing.Process(target=worker, args=(kind, directory, rows, baselines, done))
+        process.start()
+        baseline += baselines.get()
+        baselines.get()  # loaded
+        processes.append(process)
+    total = sum(pss_kilobytes(process.pid) for process in processes) - baseline
+    done.set()
+    for process in processes:
+        process.join()
+    return total / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        # Every synthetic candle is final: none is held back as unsettled.
+        writer = SharedCandleWriter(directory, "btcusdt", settle_margin=timedelta(0))
+        writer.append(synthetic_candles(args.rows), START + timedelta(minutes=args.rows - 1))
+        print(f"{args.rows} candles; total PSS of the workers (MB)")
+        print(f"{'workers':>8}{'shared':>10}{'per process':>14}")
+        for workers in args.workers:
+            shared = measure("shared", directory, args.rows, workers)
+            separate = measure("process", directory, args.rows, workers)
+            print(f"{workers:>8}{shared:>10.0f}{separate:>14.0f}")
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold-start benchmark: import-to-first-response timings in fresh interpreters.
+
+Each run starts a new Python process which imports `app.main`, runs the lifespan
+startup, and records when it first answers /indicators (no heavy resources
+needed), when /ready turns 200, and when it first answers /data. Candles come
+from the local synthetic client, so no GCP access is needed.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+STEPS = ["import", "startup", "first_indicators", "ready", "first_data"]
+
+
+def child():
+    started = time.perf_counter()
+    timings = {}
+
+    from app.main import app
+    from app.services import resources
+    timings["import"] = time.perf_counter() - started
+
+    def local_client():
+        from app.services import LocalCandleClient
+        return LocalCandleClient(rows=1_000)
+
+    resources.client_factory = local_client
+
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        timings["startup"] = time.perf_counter() - started
+        client.get("/indicators/").raise_for_status()
+        timings["first_indicators"] = time.perf_counter() - started
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        timings["ready"] = time.perf_counter() - started
+        client.get("/data/btcusdt", params={"start": "24-01-01", "end": "68-01-01", "sma": [20]}).raise_for_status()
+        timings["first_data"] = time.perf_counter() - started
+
+    print(json.dumps(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        launched = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        timings = json.loads(output.strip().splitlines()[-1])
+        timings["process"] = time.perf_counter() - launched
+        runs.append(timings)
+
+    print(f"{'step':<20}{'median ms':>12}{'min ms':>10}")
+    summary = {}
+    for step in STEPS + ["process"]:
+        values = [run[step] for run in runs]
+        summary[step] = {"median": statistics.median(values), "min": min(values)}
+        print(f"{step:<20}{summary[step]['median'] * 1000:>12.1f}{summary[step]['min'] * 1000:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"runs": runs, "summary": summary}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
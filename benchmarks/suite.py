@@ -0,0 +1,154 @@
+"""
+Benchmark suite for CalculateIndicators and the /data pipeline.
+
+Runs every indicator method on its own and a set of realistic multi-indicator
+requests end to end through the FastAPI app, over synthetic candles served by a
+stub candle client.
+
+Usage:
+    python -m benchmarks.suite --output benchmarks/results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.suite --sizes 1000 100000 --only indicators --filter sma ema
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import CalculateIndicators
+from benchmarks import stubs
+from benchmarks.synthetic import synthetic_candles
+
+# One call per CalculateIndicators method, with the parameters clients use most.
+INDICATORS = {
+    "sma": lambda ci, data: ci.sma(20, data),
+    "ema": lambda ci, data: ci.ema(20, data),
+    "roc": lambda ci, data: ci.roc(14, data),
+    "rsi": lambda ci, data: ci.rsi(14, data),
+    "wil": lambda ci, data: ci.wil(14, data),
+    "atr": lambda ci, data: ci.atr(14, data),
+    "mom": lambda ci, data: ci.mom(10, data),
+    "so": lambda ci, data: ci.so(14, data),
+    "tr": lambda ci, data: ci.tr(data),
+    "macd": lambda ci, data: ci.macd(12, 26, 9, data),
+    "bb": lambda ci, data: ci.bb(20, data),
+    "cmo": lambda ci, data: ci.cmo(14, data),
+    "obv": lambda ci, data: ci.obv(data),
+    "dc": lambda ci, data: ci.dc(20, data),
+    "al": lambda ci, data: ci.al(data),
+    "cmf": lambda ci, data: ci.cmf(20, data),
+    "ic": lambda ci, data: ci.ic(data),
+    "pp": lambda ci, data: ci.pp(data),
+    "cci": lambda ci, data: ci.cci(20, data),
+    "adx": lambda ci, data: ci.adx(14, data),
+    "kc": lambda ci, data: ci.kc(20, data),
+    "vwap": lambda ci, data: ci.vwap(data),
+}
+
+# Query strings of realistic /data requests.
+REQUESTS = {
+    "raw": {},
+    "chart": {"sma": [20, 50, 200], "ema": [21], "bb": [20]},
+    "chart_downsampled": {"sma": [20, 50, 200], "ema": [21], "bb": [20], "max_points": 800},
+    "momentum": {"rsi": [14], "macd": ["12,26,9"], "so": [14], "wil": [14]},
+    "backtest": {
+        "sma": [50, 200], "ema": [12, 26], "rsi": [14], "atr": [14],
+        "macd": ["12,26,9"], "only_columns": ["Open_time", "Close"],
+    },
+    "volume": {"vwap": True, "cmf": [20], "al": True, "pp": True},
+}
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "repeat": repeat,
+    }
+
+
+def run_case(name, rows, func, repeat):
+    print(f"{name:<28}{rows:>10}", end="", flush=True)
+    try:
+        result = measure(func, repeat)
+    except Exception as exc:  # a broken kernel should not abort the whole run
+        print(f"  error: {exc!r}")
+        return {"name": name, "rows": rows, "error": repr(exc)}
+    print(f"{result['median'] * 1000:>12.1f} ms")
+    return {"name": name, "rows": rows, **result}
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", choices=["indicators", "requests"])
+    parser.add_argument("--filter", nargs="+", help="Run only the named cases.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    selected = lambda name: not args.filter or name in args.filter  # noqa: E731
+    stub_client = stubs.install()
+    client = TestClient(app)
+    results = []
+    print(f"{'case':<28}{'rows':>10}{'median':>15}")
+    for rows in args.sizes:
+        data = synthetic_candles(rows)
+        if args.only != "requests":
+            calculate_indicators = CalculateIndicators()
+            for name, func in INDICATORS.items():
+                if selected(name):
+                    results.append(run_case(
+                        f"indicator/{name}", rows, lambda: func(calculate_indicators, data), args.repeat
+                    ))
+        if args.only != "indicators":
+            stub_client.rows = data
+            for name, params in REQUESTS.items():
+                if selected(name):
+                    # Bounds in the future keep the response out of the immutable-range path.
+                    query = {"start": "20-01-01", "end": "68-01-01", **params}
+                    results.append(run_case(
+                        f"request/{name}", rows,
+                        lambda: client.get("/data/btcusdt", params=query).raise_for_status(), args.repeat,
+                    ))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
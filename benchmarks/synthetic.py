@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+
+from app.services.candle_clients import synthesize_candles
+
+
+def synthetic_candles(rows, seed=0, start=datetime(2020, 1, 1), interval=timedelta(minutes=1)):
+    """
+    Generate deterministic BTC-like candles.
+
+    Args:
+        rows (int): Number of candles.
+        seed (int): Random seed, the same seed always yields the same candles.
+        start (datetime): Open time of the first candle, on the `interval` grid.
+        interval (timedelta): Candle width.
+
+    Returns:
+        list: JSON-like data shaped like the `rowsAdapter` output.
+    """
+    return synthesize_candles("btcusdt", (start - datetime.min) // interval, rows, interval, seed)
@@ -1,12 +1,14 @@
 import configparser
 import os
 
-def load_config(filename):
+def load_config(filename, required=True):
     """
     Load a .cfg configuration file from the config directory.
 
     Args:
         filename (str): Name of the .cfg file (e.g., 'database.cfg').
+        required (bool): Raise if the file is missing. Optional files yield an empty
+            configuration so callers can rely on their `fallback` values.
 
     Returns:
         configparser.ConfigParser: Loaded configuration object.
@@ -14,6 +16,8 @@ def load_config(filename):
     config = configparser.ConfigParser()
     config_path = os.path.join(os.path.dirname(__file__), filename)
     if not os.path.exists(config_path):
+        if not required:
+            return config
         raise FileNotFoundError(f"Config file {filename} not found in the config directory.")
     config.read(config_path)
     return config
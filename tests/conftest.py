@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import pytest
+
+from app.jobs.materialize import materialize
+from app.services import CandleCache, LocalCandleClient, indicator_registry, resources
+from app.services.indicator_store import LocalIndicatorStore
+
+
+@pytest.fixture(params=["local", "cache"])
+def candle_client(request):
+    """Serve candles from the synthetic local client, directly or through a CandleCache (and its range index)."""
+    client = LocalCandleClient() if request.param == "local" else CandleCache(LocalCandleClient())
+    resources.client_factory, resources.store_factory = (lambda: client), (lambda: None)
+    resources._client, resources._store_built = None, False
+    yield client
+    resources.client_factory = resources.store_factory = None
+    resources._client, resources._store_built = None, False
+
+
+@pytest.fixture
+def materialized_store(candle_client, tmp_path):
+    """A local store holding SMA_20 of btcusdt from 2024-01-01 00:00 to 02:00, served to /data and exports."""
+    calls = indicator_registry.parse_requested({"sma": [20]})
+    store = LocalIndicatorStore(str(tmp_path / "materialized"))
+    materialize("btcusdt", candle_client, store, calls, since=datetime(2024, 1, 1), until=datetime(2024, 1, 1, 2))
+    resources.store_factory = lambda: store
+    resources._store_built = False
+    yield store
@@ -0,0 +1,21 @@
+"""/backtest answers ranges without candles like any other."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.parametrize("result", ["timestamps", "stats"])
+@pytest.mark.parametrize("exit_rule", [None, "RSI_14 > 70"])
+def test_empty_range(candle_client, result, exit_rule):
+    query = {"start": "2024-01-02", "end": "2024-01-01", "rule": "RSI_14 < 30 and Close > SMA_20", "result": result}
+    if exit_rule:
+        query["exit"] = exit_rule
+    with TestClient(app) as client:
+        response = client.get("/backtest/btcusdt", params=query)
+    assert response.status_code == 200
+    body = response.json()
+    if result == "stats":
+        assert body["stats"]["candles"] == 0 and body["stats"]["trades"] == 0 and body["stats"]["total_return"] == 0.0
+    else:
+        assert body["candles"] == 0 and body["matches"] == []
@@ -0,0 +1,74 @@
+"""Candle caches and the indicator store only hold candles the source has settled, whatever the clock says."""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.jobs.materialize import materialize
+from app.jobs.refresh_candles import refresh
+from app.services import CandleCache, LocalCandleClient, indicator_registry
+from app.services.candle_clients import CandleResult
+from app.services.indicator_store import LocalIndicatorStore
+from app.services.shared_candles import SharedCandleWriter
+
+START = datetime(2024, 1, 1, 9)
+END = datetime(2024, 1, 1, 10, 30)
+
+
+class LaggingClient(LocalCandleClient):
+    """Synthetic candles, of which the source has received those up to `head` only."""
+
+    head = datetime.max
+
+    def fetch_candles(self, symbol, start, end, columns=None, lookback=0, limit=None):
+        rows = super().fetch_candles(symbol, start, min(end, self.head), columns, lookback, limit)
+        return CandleResult(row for row in rows if row["Open_time"] <= self.head)
+
+
+def open_times(rows):
+    return [row["Open_time"] for row in rows]
+
+
+def test_candles_the_source_receives_late_are_fetched():
+    client = LaggingClient()
+    cache = CandleCache(client)
+    client.head = datetime(2024, 1, 1, 10)
+    assert open_times(cache.fetch_candles("btcusdt", START, END))[-1] == client.head
+
+    client.head = datetime.max
+    assert open_times(cache.fetch_candles("btcusdt", START, END)) == open_times(client.fetch_candles("btcusdt", START, END))
+
+
+def test_settled_ranges_are_served_from_the_cache():
+    client = LocalCandleClient()
+    cache = CandleCache(client)
+    first = cache.fetch_candles("btcusdt", START, END, lookback=30)
+    queries = client.queries
+    assert cache.fetch_candles("btcusdt", START, END, lookback=30) == first
+    assert client.queries == queries
+
+
+def test_refresh_leaves_no_gap_behind_a_lagging_source(tmp_path):
+    client = LaggingClient()
+    writer = SharedCandleWriter(str(tmp_path), "btcusdt", max_window=64, capacity=1024)
+    try:
+        for head in (START + timedelta(minutes=30), START + timedelta(hours=1)):
+            client.head = head
+            refresh("btcusdt", client, writer, since=START, chunk=timedelta(days=365))
+            assert writer.complete_until() == head - writer.settle_margin
+        times = writer.columns["Open_time"].view()
+        assert times[0] == np.datetime64(START) and (np.diff(times) == np.timedelta64(1, "m")).all()
+    finally:
+        writer.close()
+
+
+def test_materialize_leaves_no_gap_behind_a_lagging_source(tmp_path):
+    client = LaggingClient()
+    store = LocalIndicatorStore(str(tmp_path))
+    calls = indicator_registry.parse_requested({"sma": [20]})
+    margin = timedelta(minutes=2)
+    for head in (START + timedelta(minutes=30), START + timedelta(hours=1), datetime.max):
+        client.head = head
+        materialize("btcusdt", client, store, calls, since=START, until=END, settle_margin=margin)
+        assert store.bounds("btcusdt") == (START, min(head - margin, END))
+    times = store.read("btcusdt", START, END, [])["Open_time"].to_numpy()
+    assert (np.diff(times) == np.timedelta64(1, "m")).all()
@@ -0,0 +1,75 @@
+"""CompressionMiddleware: validators of revalidations and streamed chunks."""
+import asyncio
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.api.middleware import CompressionMiddleware
+from app.api.middleware.compression import MINIMUM_SIZE, _CompressedResponder, available_encoders
+from app.services import http_cache
+
+ETAG = '"abc"'
+SMALL, LARGE = b"[1]", b"[" + b"1," * MINIMUM_SIZE + b"1]"
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware)
+
+
+@app.get("/{size}")
+def document(request: Request, size: str):
+    if http_cache.etag_matches(request.headers.get("if-none-match"), ETAG):
+        return Response(status_code=304, headers={"ETag": ETAG})
+    return Response(SMALL if size == "small" else LARGE, media_type="application/json", headers={"ETag": ETAG})
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("size", ["small", "large"])
+def test_revalidation_keeps_the_etag_of_the_200(client, size):
+    ok = client.get(f"/{size}", headers={"Accept-Encoding": "gzip"})
+    not_modified = client.get(f"/{size}", headers={"Accept-Encoding": "gzip", "If-None-Match": ok.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == ok.headers["etag"]
+    assert ok.headers["etag"] == (ETAG if size == "small" else '"abc-gzip"')
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "identity"])
+def test_revalidation_varies_on_accept_encoding(client, accept_encoding):
+    response = client.get("/small", headers={"Accept-Encoding": accept_encoding, "If-None-Match": ETAG})
+    assert response.status_code == 304
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+@pytest.mark.parametrize("encoding", list(available_encoders()))
+def test_streamed_chunks_are_flushed(encoding):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def respond():
+        responder = _CompressedResponder(send, encoding, available_encoders()[encoding])
+        await responder.send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await responder.send({"type": "http.response.body", "body": b'{"a":', "more_body": True})
+
+    asyncio.run(respond())
+    # The first chunk alone decodes to the first part of the body.
+    assert _decoder(encoding)(sent[1]["body"]) == b'{"a":'
+
+
+def _decoder(encoding):
+    if encoding == "gzip":
+        return zlib.decompressobj(31).decompress
+    if encoding == "br":
+        import brotli
+
+        return brotli.Decompressor().process
+    import zstandard
+
+    return zstandard.ZstdDecompressor().decompressobj().decompress
@@ -0,0 +1,82 @@
+"""Running-total indicators (OBV, A/D Line, VWAP) count from the start of the range."""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import indicator_engines, indicator_registry, metrics
+from app.services.exports import FINISHED, ExportManager
+from app.services.indicator_store import materialized_calls, settings
+from app.services.enrichment import enrich_candles
+from app.utils import Columns
+
+START = datetime(2024, 1, 1, 5)
+END = datetime(2024, 1, 1, 8)
+CUMULATIVE = {"obv": True, "al": True, "vwap": True}
+COLUMNS = ["OBV", "AD_Line", "Typical_Price", "Cumulative_TP_Volume", "Cumulative_Volume", "VWAP"]
+
+
+def enrich(requested, engine, start=START, end=END):
+    calls = indicator_registry.parse_requested(requested)
+    rows, _, _, _ = enrich_candles("btcusdt", start, end, calls, [Columns.OPEN_TIME.value], metrics.StageTimer(), engine=engine)
+    return rows
+
+
+@pytest.mark.parametrize("engine", indicator_engines.available_engines())
+@pytest.mark.parametrize("others", [{"sma": [200]}, {"rsi": [14], "dc": [50]}, {"ic": True, "macd": ["12,26,9"]}])
+def test_other_indicators_do_not_change_running_totals(candle_client, engine, others):
+    alone = enrich(CUMULATIVE, engine)
+    together = enrich({**CUMULATIVE, **others}, engine)
+    assert [[row[column] for column in COLUMNS] for row in together] == [
+        [row[column] for column in COLUMNS] for row in alone
+    ]
+
+
+def test_running_totals_start_at_the_first_candle(candle_client):
+    first = enrich({**CUMULATIVE, "sma": [200]}, "pandas")[0]
+    assert first["OBV"] == 0.0
+    # The volume-weighted average of one candle is its typical price.
+    assert first["VWAP"] == pytest.approx(first["Typical_Price"])
+
+
+def test_pages_join_up_to_the_full_response(candle_client):
+    query = {"start": "2024-01-01T00:00:00", "end": "2024-01-01T03:00:00", **CUMULATIVE, "sma": 50, "ic": True}
+    with TestClient(app) as client:
+        full = client.get("/data/btcusdt", params=query).json()["data"]
+        pages, cursor = [], None
+        while True:
+            page = client.get("/data/btcusdt", params={**query, "limit": 60, "cursor": cursor}).json()
+            pages += page["data"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+    assert [row["Open_time"] for row in pages] == [row["Open_time"] for row in full]
+    # Running totals carry over exactly; rolling sums may differ in the last bit.
+    assert [[row[column] for column in COLUMNS] for row in pages] == [[row[column] for column in COLUMNS] for row in full]
+    assert [row["SMA_50"] for row in pages] == pytest.approx([row["SMA_50"] for row in full])
+    # The Chikou Span reads the closes past the end of each page.
+    assert [row["Chikou_Span"] for row in pages] == [row["Chikou_Span"] for row in full]
+
+
+def test_export_chunks_join_up_to_one_chunk(candle_client, tmp_path):
+    calls = indicator_registry.parse_requested({**CUMULATIVE, "ic": True})
+    files = []
+    for chunk in (timedelta(days=1), timedelta(minutes=45)):
+        manager = ExportManager(str(tmp_path / str(chunk.seconds)), chunk=chunk)
+        job = manager.submit(["btcusdt", "ethusdt"], START, END, calls, [Columns.OPEN_TIME.value], "csv")
+        while job.status not in FINISHED:
+            time.sleep(0.01)
+        manager.close()
+        assert job.status == "succeeded", job.error
+        files.append((tmp_path / str(chunk.seconds) / f"{job.id}.csv").read_text())
+    assert files[1] == files[0]
+
+
+@pytest.mark.parametrize("key, message", [("obv", "running total"), ("al", "running total"), ("vwap", "running total"), ("ic", "after each row")])
+def test_range_dependent_indicators_are_not_materialized(monkeypatch, key, message):
+    monkeypatch.setattr(settings, "get", lambda section, option, fallback=None: f"sma:20 {key}")
+    with pytest.raises(ValueError, match=message):
+        materialized_calls()
@@ -0,0 +1,28 @@
+"""/data responses for the column selections and encodings clients use."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+QUERY = {"start": "2024-01-01T00:00:00", "end": "2024-01-01T03:00:00", "sma": 20}
+
+
+@pytest.mark.parametrize("columns", [{"only_columns": "Close"}, {"drop_columns": "Open_time"}])
+@pytest.mark.parametrize("extra", [{}, {"limit": 60}, {"encoding": "compact"}])
+def test_responses_without_open_time(candle_client, columns, extra):
+    with TestClient(app) as client:
+        response = client.get("/data/btcusdt", params={**QUERY, **columns, **extra})
+    assert response.status_code == 200
+    body = response.json()
+    names = body["columns"] if "columns" in body else body["data"][0]
+    assert "Open_time" not in names and "Close" in names and "SMA_20" in names
+    assert "ETag" in response.headers
+
+
+def test_stored_columns_keep_their_call_position(materialized_store):
+    query = {"start": "2024-01-01T01:00:00", "end": "2024-01-01T02:00:00", "rsi": 7, "sma": 20}
+    with TestClient(app) as client:
+        stored = client.get("/data/btcusdt", params=query).json()["data"]
+        materialized_store.clear("btcusdt")
+        computed = client.get("/data/btcusdt", params=query).json()["data"]
+    assert list(stored[0]) == list(computed[0])
@@ -0,0 +1,33 @@
+"""
+Every indicator engine matches the pandas engine on every indicator.
+
+Runs the checks of `benchmarks.engine_conformance` (same datasets, parameter
+sets and tolerances) for each engine installed here.
+"""
+import copy
+
+import pytest
+
+from app.services.indicator_engines import available_engines, create_calculator
+from benchmarks import engine_conformance
+
+ENGINES = [engine for engine in available_engines() if engine != "pandas"]
+# Long enough for the 200-candle windows to fill.
+DATASETS = engine_conformance.datasets(600)
+
+
+@pytest.mark.parametrize("fill_value", [0, None])
+@pytest.mark.parametrize("dataset", list(DATASETS))
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_matches_pandas(engine, dataset, fill_value):
+    reference = create_calculator("pandas", fill_value)
+    calculator = create_calculator(engine, fill_value)
+    candles = DATASETS[dataset]
+    failures = []
+    for indicator, args in engine_conformance.calls():
+        expected = indicator.apply(reference, args, copy.deepcopy(candles))
+        actual = indicator.apply(calculator, args, copy.deepcopy(candles))
+        difference = engine_conformance.compare(expected, actual, rtol=1e-7, atol=1e-9)
+        if difference:
+            failures.append(f"{indicator.key}:{','.join(map(str, args))}: {difference}")
+    assert not failures, "\n".join(failures)
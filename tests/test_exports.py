@@ -0,0 +1,70 @@
+"""Export files come out the same whatever the chunks they are written in, and
+every worker sharing the export directory sees every export."""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from app.services import LocalCandleClient, indicator_registry, resources
+from app.services.exports import FINISHED, ExportManager
+
+CALLS = indicator_registry.parse_requested({"sma": [20]})
+
+
+def export(directory, calls, start, end, format, chunk):
+    manager = ExportManager(str(directory), chunk=chunk)
+    job = manager.submit(["btcusdt"], start, end, calls, ["Open_time", "Close"], format)
+    while job.status not in FINISHED:
+        time.sleep(0.01)
+    manager.close()
+    assert job.status == "succeeded", job.error
+    return job.path
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_columns_keep_their_place_across_the_store_coverage(materialized_store, tmp_path, format):
+    # The store covers the first chunk only: SMA_20 is read for it and computed after.
+    calls = indicator_registry.parse_requested({"rsi": [7], "sma": [20]})
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 1, 3, 59)
+    read = pd.read_csv if format == "csv" else pd.read_parquet
+    chunked = read(export(tmp_path / "chunked", calls, start, end, format, timedelta(hours=2)))
+
+    materialized_store.clear("btcusdt")
+    whole = read(export(tmp_path / "whole", calls, start, end, format, timedelta(days=1)))
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def wait(job, manager):
+    while manager.get(job.id).status not in FINISHED:
+        time.sleep(0.01)
+    return manager.get(job.id)
+
+
+def test_other_workers_read_and_delete_an_export(candle_client, tmp_path):
+    owner, other = ExportManager(str(tmp_path), chunk=timedelta(hours=1)), ExportManager(str(tmp_path))
+    job = owner.submit(["btcusdt"], datetime(2024, 1, 1), datetime(2024, 1, 1, 3, 59), CALLS, ["Open_time"], "csv")
+    assert wait(job, other).summary() == job.summary()
+    assert [export["id"] for export in other.list()] == [job.id]
+
+    other.cancel(job.id)
+    assert owner.get(job.id) is None and os.listdir(tmp_path) == []
+    owner.close(), other.close()
+
+
+def test_other_workers_cancel_a_running_export(monkeypatch, tmp_path):
+    monkeypatch.setattr(resources, "client_factory", lambda: LocalCandleClient(latency=0.05))
+    monkeypatch.setattr(resources, "store_factory", lambda: None)
+    monkeypatch.setattr(resources, "_client", None)
+    monkeypatch.setattr(resources, "_store_built", False)
+    owner, other = ExportManager(str(tmp_path), chunk=timedelta(hours=1)), ExportManager(str(tmp_path))
+    job = owner.submit(["btcusdt"], datetime(2024, 1, 1), datetime(2024, 1, 31), CALLS, ["Open_time"], "csv")
+    while job.chunks_done == 0:
+        time.sleep(0.01)
+
+    other.cancel(job.id)
+    assert wait(job, other).status == "cancelled"
+    assert job.chunks_done < job.chunks_total
+    assert sorted(os.listdir(tmp_path)) == [f"{job.id}.json"]
+    owner.close(), other.close()